@@ -0,0 +1,777 @@
+"""
+Offline benchmark for the bot's command paths.
+
+Starts local stub servers imitating Odesli, Genius, YouTube, ZenQuotes,
+api-ninjas, dictionaryapi.dev, Datamuse and Wiktionary, points the bot at
+them, and drives the real command code with fake interactions.
+
+Usage:
+    python benchmark.py [--scenarios slash_songlink,word] [--requests 200]
+                        [--concurrency 20] [--latency 50] [--jitter 20]
+                        [--error-rate 0.01] [--rate-limit-rate 0.01]
+                        [--processes 4]
+                        [--save-baseline bench.json | --baseline bench.json]
+
+Scenarios:
+    slash_songlink   /sl with a song URL
+    prefix_songlink  !sl with a song URL
+    word             WordView.generate() and finish()
+    time_board       build_timezone_embed() for a populated guild
+    playlist         /sl with a YouTube playlist, then picking a track;
+                     the YouTube stubs honour If-None-Match, and
+                     --playlist-churn is the fraction of pages that change
+                     between loads
+    quote            ZenQuoteView.fetch_new_quote()
+    startup          time-to-ready of a fresh process: import bot.py, run
+                     setup_hook against the stubs and finish loading the
+                     datasets (--startup-runs processes, run one at a time)
+
+Each scenario reports p50/p99 latency, throughput and how many calls each
+stub received (and how many of those were answered 304).
+
+The bot's admission limits are raised to --concurrency so that every
+request runs; set ADMIT_* in the environment to benchmark other limits.
+Requests admission control turns away are counted as "shed", apart from
+errors and left out of the latency percentiles.
+
+With --processes N the scenarios run in N processes at once, splitting
+the requests and sharing one set of SQLite files the way launcher.py's
+workers do; throughput is summed, p50 is the median of the processes'
+p50s and p99 the worst p99. With --baseline, results are compared against
+a file written by --save-baseline and the exit status is 1 on a
+regression.
+"""
+
+import argparse
+import asyncio
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from aiohttp import web
+
+SCENARIOS = ("slash_songlink", "prefix_songlink", "word", "time_board", "playlist", "quote", "startup")
+
+# Forwarded unchanged to each process of a --processes run
+CHILD_OPTIONS = (
+    "concurrency", "latency", "jitter", "error_rate", "rate_limit_rate", "discord_latency",
+    "songs", "vocabulary", "playlist_size", "playlist_churn", "guild_members"
+)
+
+# Run in a child process per startup sample; tree.sync is the only Discord
+# call setup_hook makes, so it is replaced rather than sent anywhere
+STARTUP_PROBE = """
+import asyncio, json, logging
+import bot
+
+async def probe():
+    async def skip_sync():
+        return []
+    bot.tree.sync = skip_sync
+    await bot.bot.setup_hook()
+    await bot.dataset_task
+    bot.startup_timer.mark("ready")
+    print("STARTUP " + json.dumps(bot.startup_timer.phases), flush=True)
+    if bot.http_session:
+        await bot.http_session.close()
+    bot.log_listener.stop()
+
+logging.getLogger().setLevel(logging.ERROR)
+asyncio.run(probe())
+"""
+
+
+# ---------------------------
+# Provider Stubs
+# ---------------------------
+
+class StubUpstreams:
+    """One aiohttp app serving every provider under its own path prefix"""
+
+    PLATFORMS = (
+        "spotify", "appleMusic", "youtube", "youtubeMusic", "tidal", "deezer",
+        "amazonMusic", "soundcloud", "pandora", "napster", "audiomack", "anghami"
+    )
+
+    def __init__(self, latency, jitter, error_rate, rate_limit_rate, playlist_size, playlist_churn, vocabulary):
+        self.latency = latency / 1000
+        self.jitter = jitter / 1000
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.playlist_size = playlist_size
+        self.playlist_churn = playlist_churn
+        self.words = [f"word{i}" for i in range(vocabulary)]
+        self.calls = Counter()
+        self.failures = Counter()
+        self.not_modified = Counter()
+
+    def conditional(self, request, data):
+        """JSON response with an ETag, or a bodiless 304 if the client has it"""
+        body = json.dumps(data)
+        etag = f'"{hashlib.md5(body.encode()).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            self.not_modified[request.path.split("/")[1]] += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(text=body, content_type="application/json", headers={"ETag": etag})
+
+    def app(self):
+        app = web.Application(middlewares=[self.middleware])
+        app.router.add_get("/odesli/links", self.odesli)
+        app.router.add_get("/genius/search", self.genius)
+        app.router.add_get("/youtube/playlists", self.youtube_playlists)
+        app.router.add_get("/youtube/playlistItems", self.youtube_items)
+        app.router.add_get("/zenquotes/quotes", self.zenquotes)
+        app.router.add_get("/api-ninjas/randomword", self.random_word)
+        app.router.add_get("/dictionary/entries/en/{word}", self.dictionary)
+        app.router.add_get("/datamuse/words", self.datamuse)
+        app.router.add_get("/wiktionary/api.php", self.wiktionary)
+        return app
+
+    @web.middleware
+    async def middleware(self, request, handler):
+        provider = request.path.split("/")[1]
+        self.calls[provider] += 1
+
+        delay = max(0.0, self.latency + random.uniform(-self.jitter, self.jitter))
+        await asyncio.sleep(delay)
+
+        roll = random.random()
+        if roll < self.rate_limit_rate:
+            self.failures[f"{provider}:429"] += 1
+            return web.json_response({"error": "rate limited"}, status=429, headers={"Retry-After": "1"})
+        if roll < self.rate_limit_rate + self.error_rate:
+            self.failures[f"{provider}:500"] += 1
+            return web.json_response({"error": "stub failure"}, status=500)
+
+        return await handler(request)
+
+    async def odesli(self, request):
+        url = request.query["url"]
+        song_id = url.rsplit("/", 1)[-1]
+        return web.json_response({
+            "entityUniqueId": f"SONG::{song_id}",
+            "entitiesByUniqueId": {
+                f"SONG::{song_id}": {
+                    "type": "song",
+                    "title": f"Song {song_id} (feat. Someone)",
+                    "artistName": f"Artist {song_id}",
+                    "thumbnailUrl": f"https://img.example/{song_id}.jpg"
+                }
+            },
+            "linksByPlatform": {
+                platform: {"url": f"https://{platform.lower()}.example/track/{song_id}"}
+                for platform in self.PLATFORMS
+            }
+        })
+
+    async def genius(self, request):
+        query = request.query.get("q", "")
+        return web.json_response({"response": {"hits": [{
+            "result": {
+                "title": query,
+                "url": f"https://genius.example/{query.replace(' ', '-')}-lyrics",
+                "primary_artist": {"name": query.split(" ")[-1]}
+            }
+        }]}})
+
+    async def youtube_playlists(self, request):
+        playlist_id = request.query["id"]
+        return self.conditional(request, {"items": [{"snippet": {
+            "title": f"Playlist {playlist_id}",
+            "thumbnails": {"high": {"url": f"https://img.example/{playlist_id}.jpg"}}
+        }}]})
+
+    async def youtube_items(self, request):
+        start = int(request.query.get("pageToken") or 0)
+        end = min(start + int(request.query.get("maxResults", 50)), self.playlist_size)
+        data = {"items": [
+            {"snippet": {
+                "title": f"Video {i}",
+                "videoOwnerChannelTitle": f"Channel {i % 17}",
+                "resourceId": {"videoId": f"vid{i}"},
+                "thumbnails": {"high": {"url": f"https://img.example/vid{i}.jpg"}}
+            }}
+            for i in range(start, end)
+        ]}
+        if end < self.playlist_size:
+            data["nextPageToken"] = str(end)
+        if random.random() < self.playlist_churn:
+            data["items"][0]["snippet"]["title"] += f" (edited {random.randrange(10 ** 6)})"
+        return self.conditional(request, data)
+
+    async def zenquotes(self, request):
+        return web.json_response([
+            {"q": f"Quote number {random.randrange(10 ** 6)}", "a": "Stub Author"}
+            for _ in range(50)
+        ])
+
+    async def random_word(self, request):
+        return web.json_response({"word": [random.choice(self.words)]})
+
+    async def dictionary(self, request):
+        word = request.match_info["word"]
+        return web.json_response([{
+            "phonetics": [{"text": f"/{word}/"}],
+            "meanings": [{"definitions": [
+                {"definition": f"Definition {i} of {word}.", "example": f"An example using {word}."}
+                for i in range(4)
+            ]}]
+        }])
+
+    async def datamuse(self, request):
+        return web.json_response([{"word": f"related{i}", "defs": [f"n\tRelated word {i}"]} for i in range(20)])
+
+    async def wiktionary(self, request):
+        word = request.query.get("page", "")
+        if request.query.get("prop") == "sections":
+            return web.json_response({"parse": {"sections": [
+                {"toclevel": 1, "level": "2", "line": "English", "number": "1", "index": "1"},
+                {"toclevel": 2, "level": "3", "line": "Etymology", "number": "1.1", "index": "2"}
+            ]}})
+        return web.json_response({"parse": {"text": {"*": (
+            f"<h3>Etymology</h3><p>From Middle English <i>{word}</i>, "
+            f"from Old English <i>{word}an</i>.</p>" * 3
+        )}}})
+
+
+class StubServer:
+    """Serves the stubs from their own thread and event loop.
+
+    Keeping them off the bot's loop means a blocking call in the bot
+    shows up as latency instead of deadlocking against its own upstream.
+    """
+
+    def __init__(self, stubs, port):
+        self.stubs = stubs
+        self.port = port
+        self.loop = asyncio.new_event_loop()
+        self.runner = None
+        self.thread = threading.Thread(target=self.loop.run_forever, name="stub-upstreams", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self.serve(), self.loop).result()
+
+    async def serve(self):
+        self.runner = web.AppRunner(self.stubs.app(), access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, "127.0.0.1", self.port).start()
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def configure_environment(base, workdir, concurrency):
+    """Point the bot at the stubs and at throwaway local state"""
+    for command_class in ("PLAYLIST", "SONGLINK", "WORD"):
+        os.environ.setdefault(f"ADMIT_{command_class}_CONCURRENCY", str(concurrency))
+        os.environ.setdefault(f"ADMIT_{command_class}_QUEUE", str(concurrency))
+    # time_board measures the batched member queries, not guild.get_member()
+    os.environ.setdefault("MEMBER_CACHE", "lazy")
+    os.environ.update({
+        "DISCORD_TOKEN": "benchmark",
+        "GENIUS_API_KEY": "benchmark",
+        "API_NINJA_RANDOM_WORD_KEY": "benchmark",
+        "YOUTUBE_API_KEY": "benchmark",
+        "ODESLI_API": f"{base}/odesli",
+        "GENIUS_API": f"{base}/genius",
+        "YOUTUBE_API": f"{base}/youtube",
+        "ZENQUOTES_API": f"{base}/zenquotes",
+        "API_NINJAS_API": f"{base}/api-ninjas",
+        "DICTIONARY_API": f"{base}/dictionary",
+        "DATAMUSE_API": f"{base}/datamuse",
+        "WIKTIONARY_API": f"{base}/wiktionary/api.php",
+        "CACHE_DB": os.path.join(workdir, "cache.db"),
+        "SESSION_DB": os.path.join(workdir, "sessions.db"),
+        "TIMEZONE_BACKEND": "sqlite",
+        "TIMEZONE_DB": os.path.join(workdir, "timezones.db"),
+        "TIMEZONE_JOURNAL": os.path.join(workdir, "timezone_journal.jsonl"),
+        "COMMAND_HASH_FILE": os.path.join(workdir, "command_tree.hash"),
+        "WORD_POOL_SIZE": "0",
+        "TRACE_SAMPLE_RATE": "0",
+    })
+
+
+# ---------------------------
+# Fake Discord Objects
+# ---------------------------
+
+class FakeMessage:
+
+    def __init__(self, rest):
+        self.rest = rest
+        self.id = random.getrandbits(62)
+
+    async def edit(self, **kwargs):
+        await self.rest()
+        return self
+
+
+class FakeResponse:
+
+    def __init__(self, rest):
+        self.rest = rest
+        self.done = False
+
+    def is_done(self):
+        return self.done
+
+    async def defer(self, **kwargs):
+        await self.rest()
+        self.done = True
+
+    async def send_message(self, *args, **kwargs):
+        await self.rest()
+        self.done = True
+
+    async def edit_message(self, **kwargs):
+        await self.rest()
+        self.done = True
+
+
+class FakeFollowup:
+
+    def __init__(self, rest):
+        self.rest = rest
+        self.sent = 0
+
+    async def send(self, *args, **kwargs):
+        await self.rest()
+        self.sent += 1
+        return FakeMessage(self.rest)
+
+
+class FakeMember:
+
+    def __init__(self, user_id):
+        self.id = user_id
+        self.display_name = f"Member {user_id}"
+        self.name = self.display_name
+
+
+class FakeGuild:
+
+    def __init__(self, guild_id, rest):
+        self.id = guild_id
+        self.rest = rest
+
+    def get_member(self, user_id):
+        return FakeMember(user_id)
+
+    async def query_members(self, user_ids, **kwargs):
+        await self.rest()
+        return [FakeMember(user_id) for user_id in user_ids]
+
+
+class FakeChannel:
+
+    def __init__(self, channel_id):
+        self.id = channel_id
+
+
+class FakeInteraction:
+    """Just enough of discord.Interaction for the command callbacks"""
+
+    def __init__(self, rest, guild):
+        self.user = FakeMember(random.getrandbits(40))
+        self.guild = guild
+        self.guild_id = guild.id
+        self.channel = FakeChannel(random.getrandbits(40))
+        self.response = FakeResponse(rest)
+        self.followup = FakeFollowup(rest)
+        self.extras = {}
+
+    async def edit_original_response(self, **kwargs):
+        await self.followup.rest()
+
+
+class FakeContext:
+    """Just enough of commands.Context for the prefix command callbacks"""
+
+    def __init__(self, rest, guild):
+        self.rest = rest
+        self.author = FakeMember(random.getrandbits(40))
+        self.guild = guild
+        self.channel = FakeChannel(random.getrandbits(40))
+        self.sent = 0
+
+    async def send(self, *args, **kwargs):
+        await self.rest()
+        self.sent += 1
+        return FakeMessage(self.rest)
+
+
+# ---------------------------
+# Scenarios
+# ---------------------------
+
+# Set by admission control when it turns the current request away
+request_shed = contextvars.ContextVar("request_shed", default=False)
+
+
+class Scenarios:
+
+    def __init__(self, bot, args):
+        self.bot = bot
+        self.args = args
+        self.guild = FakeGuild(424242, self.rest)
+
+        acquire = bot.admission.acquire
+
+        async def acquire_or_shed(*args, **kwargs):
+            rejection = await acquire(*args, **kwargs)
+            if rejection:
+                request_shed.set(True)
+            return rejection
+
+        bot.admission.acquire = acquire_or_shed
+
+        self.bot.timezones[str(self.guild.id)] = {
+            str(uid): random.choice(("Europe/London", "America/New_York", "Asia/Tokyo", "Australia/Sydney", "UTC"))
+            for uid in range(args.guild_members)
+        }
+        self.bot.index_timezones()
+
+    async def rest(self):
+        """Stand-in for one Discord REST round trip"""
+        await asyncio.sleep(self.args.discord_latency / 1000)
+
+    def song_url(self):
+        return f"https://music.example/track/{random.randrange(self.args.songs)}"
+
+    async def slash_songlink(self):
+        interaction = FakeInteraction(self.rest, self.guild)
+        await self.bot.slash_songlink.callback(interaction, self.song_url())
+        return interaction.followup.sent > 0
+
+    async def prefix_songlink(self):
+        ctx = FakeContext(self.rest, self.guild)
+        await self.bot.prefix_songlink.callback(ctx, query=self.song_url())
+        return ctx.sent > 0
+
+    async def word(self):
+        view = self.bot.WordView()
+        await view.generate()
+        await view.finish()
+        return bool(view.pages)
+
+    async def time_board(self):
+        embed = await self.bot.build_timezone_embed(FakeMember(1), self.guild)
+        return bool(embed.description)
+
+    async def playlist(self):
+        interaction = FakeInteraction(self.rest, self.guild)
+        playlist_id = f"PL{random.randrange(self.args.songs)}"
+        before = set(self.bot.playlist_sessions)
+        await self.bot.slash_songlink.callback(interaction, f"https://www.youtube.com/playlist?list={playlist_id}")
+
+        created = set(self.bot.playlist_sessions) - before
+        if not created or not interaction.followup.sent:
+            return False
+        session_id = created.pop()
+        session = self.bot.get_playlist_session(session_id)
+
+        tracks = session["tracks"][:25]
+        select = self.bot.PlaylistTrackSelect(session_id, 0, tracks, session["title"], session["platform"])
+        select._values = [f"{session_id}|0|{random.randrange(len(tracks))}"]
+        pick = FakeInteraction(self.rest, self.guild)
+        await select.callback(pick)
+        return pick.followup.sent > 0
+
+    async def quote(self):
+        view = self.bot.ZenQuoteView()
+        await view.fetch_new_quote()
+        return bool(view.quote_text)
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)] if ordered else 0.0
+
+
+async def run_scenario(name, func, requests, concurrency, stubs):
+    stubs.calls.clear()
+    stubs.failures.clear()
+    stubs.not_modified.clear()
+
+    latencies = []
+    errors = 0
+    shed = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors, shed
+        for _ in remaining:
+            request_shed.set(False)
+            started = time.perf_counter()
+            try:
+                ok = await func()
+            except Exception:
+                ok = False
+            if request_shed.get():
+                shed += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "errors": errors,
+        "shed": shed,
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "throughput_rps": round(requests / elapsed, 2),
+        "upstream_calls": dict(stubs.calls),
+        "upstream_failures": dict(stubs.failures),
+        "upstream_not_modified": dict(stubs.not_modified)
+    }
+
+
+async def run_startup(runs, stubs):
+    """Spawn fresh interpreters and time each one until it is ready"""
+    stubs.calls.clear()
+    stubs.failures.clear()
+    stubs.not_modified.clear()
+
+    totals = []
+    phases = {}
+    errors = 0
+
+    for _ in range(runs):
+        started = time.perf_counter()
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", STARTUP_PROBE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        report = None
+        async for line in process.stdout:
+            if line.startswith(b"STARTUP "):
+                totals.append(time.perf_counter() - started)
+                report = json.loads(line[len(b"STARTUP "):])
+        await process.wait()
+
+        if report is None:
+            errors += 1
+            continue
+        for phase, offset in report.items():
+            phases.setdefault(phase, []).append(offset)
+
+    return {
+        "requests": runs,
+        "errors": errors,
+        "p50_ms": round(percentile(totals, 0.5) * 1000, 2),
+        "p99_ms": round(percentile(totals, 0.99) * 1000, 2),
+        "throughput_rps": 0.0,
+        "upstream_calls": dict(stubs.calls),
+        "upstream_failures": dict(stubs.failures),
+        "upstream_not_modified": dict(stubs.not_modified),
+        "phases_ms": {
+            phase: round(statistics.median(offsets) * 1000, 1)
+            for phase, offsets in sorted(phases.items(), key=lambda item: statistics.median(item[1]))
+        }
+    }
+
+
+# ---------------------------
+# Reporting
+# ---------------------------
+
+def print_results(results):
+    print(f"{'scenario':<16} {'reqs':>6} {'errs':>5} {'shed':>5} {'p50 ms':>9} {'p99 ms':>9} {'req/s':>9}  upstream calls")
+    for name, r in results.items():
+        not_modified = r.get("upstream_not_modified", {})
+        calls = ", ".join(
+            f"{k}={v}" + (f" (304: {not_modified[k]})" if not_modified.get(k) else "")
+            for k, v in sorted(r["upstream_calls"].items())
+        )
+        print(f"{name:<16} {r['requests']:>6} {r['errors']:>5} {r.get('shed', 0):>5} {r['p50_ms']:>9.1f} {r['p99_ms']:>9.1f} {r['throughput_rps']:>9.1f}  {calls}")
+        if "phases_ms" in r:
+            phases = ", ".join(f"{phase}={offset:.0f}" for phase, offset in r["phases_ms"].items())
+            print(f"{'':<16} startup phases (median ms from first line of bot.py): {phases}")
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of regressions against a saved baseline"""
+    regressions = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if r["p99_ms"] > base["p99_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p99 {base['p99_ms']:.1f} -> {r['p99_ms']:.1f} ms")
+        base_rate = base["errors"] / base["requests"] if base["requests"] else 0
+        rate = r["errors"] / r["requests"] if r["requests"] else 0
+        if r["errors"] > base["errors"] or rate > base_rate:
+            regressions.append(
+                f"{name}: errors {base['errors']} ({base_rate:.1%}) -> {r['errors']} ({rate:.1%})"
+            )
+        if base["throughput_rps"] and r["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {base['throughput_rps']:.1f} -> {r['throughput_rps']:.1f} req/s")
+        base_calls = sum(base["upstream_calls"].values())
+        calls = sum(r["upstream_calls"].values())
+        if calls > base_calls * (1 + tolerance):
+            regressions.append(f"{name}: upstream calls {base_calls} -> {calls}")
+    return regressions
+
+
+async def run(args):
+    port = free_port()
+    workdir = args.workdir or tempfile.mkdtemp(prefix="bot-bench-")
+    configure_environment(f"http://127.0.0.1:{port}", workdir, args.concurrency)
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    import bot
+
+    logging.getLogger().setLevel(logging.ERROR)
+
+    stubs = StubUpstreams(
+        args.latency, args.jitter, args.error_rate, args.rate_limit_rate,
+        args.playlist_size, args.playlist_churn, args.vocabulary
+    )
+    stub_server = StubServer(stubs, port)
+    stub_server.start()
+
+    scenarios = Scenarios(bot, args)
+    results = {}
+    try:
+        for name in args.scenarios:
+            if name == "startup":
+                results[name] = await run_startup(args.startup_runs, stubs)
+                continue
+            results[name] = await run_scenario(
+                name, getattr(scenarios, name), args.requests, args.concurrency, stubs
+            )
+    finally:
+        stub_server.stop()
+        if bot.http_session and not bot.http_session.closed:
+            await bot.http_session.close()
+        bot.log_listener.stop()
+
+    return results
+
+
+def run_processes(args):
+    """Run the scenarios in args.processes child benchmarks at once"""
+    workdir = tempfile.mkdtemp(prefix="bot-bench-")
+    scenarios = [name for name in args.scenarios if name != "startup"]
+    command = [
+        sys.executable, os.path.abspath(__file__),
+        "--scenarios", ",".join(scenarios),
+        "--requests", str(max(1, args.requests // args.processes)),
+        "--workdir", workdir,
+        "--child"
+    ]
+    for option in CHILD_OPTIONS:
+        command += [f"--{option.replace('_', '-')}", str(getattr(args, option))]
+
+    children = [
+        subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+        for _ in range(args.processes)
+    ]
+    reports = []
+    for child in children:
+        output, _ = child.communicate()
+        for line in output.splitlines():
+            if line.startswith("RESULTS "):
+                reports.append(json.loads(line[len("RESULTS "):]))
+
+    results = {}
+    for name in scenarios:
+        parts = [report[name] for report in reports]
+        results[name] = {
+            "requests": sum(part["requests"] for part in parts),
+            "errors": sum(part["errors"] for part in parts),
+            "shed": sum(part["shed"] for part in parts),
+            "p50_ms": statistics.median(part["p50_ms"] for part in parts),
+            "p99_ms": max(part["p99_ms"] for part in parts),
+            "throughput_rps": round(sum(part["throughput_rps"] for part in parts), 2),
+            "upstream_calls": dict(sum((Counter(part["upstream_calls"]) for part in parts), Counter())),
+            "upstream_failures": dict(sum((Counter(part["upstream_failures"]) for part in parts), Counter())),
+            "upstream_not_modified": dict(sum((Counter(part["upstream_not_modified"]) for part in parts), Counter()))
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=50, help="stub latency in ms")
+    parser.add_argument("--jitter", type=float, default=20, help="+/- ms added to stub latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of stub responses that are 500s")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of stub responses that are 429s")
+    parser.add_argument("--discord-latency", type=float, default=30, help="ms per fake Discord REST call")
+    parser.add_argument("--songs", type=int, default=200, help="distinct song URLs to draw from")
+    parser.add_argument("--vocabulary", type=int, default=500, help="distinct random words")
+    parser.add_argument("--playlist-size", type=int, default=120)
+    parser.add_argument("--playlist-churn", type=float, default=0.0, help="fraction of playlist pages that change per load")
+    parser.add_argument("--guild-members", type=int, default=300)
+    parser.add_argument("--startup-runs", type=int, default=5)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--save-baseline")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    if args.processes > 1:
+        results = run_processes(args)
+    else:
+        results = asyncio.run(run(args))
+
+    if args.child:
+        print("RESULTS " + json.dumps(results), flush=True)
+        return
+
+    print_results(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nNo regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,55 @@
+import time
+
+# Taken before anything else is imported so the startup report covers imports
+STARTUP_STARTED_AT = time.perf_counter()
+
 import os
 import re
 import json
 import base64
+import hashlib
+import hmac
 import asyncio
+import math
+import bisect
 import random
-import requests
+import signal
+import threading
+import traceback
+import aiohttp
 import discord
+import sys
 import uuid
-from urllib.parse import urlparse, parse_qs
-
-from flask import Flask
-import threading
+import mmap
+import zlib
+import struct
+import sqlite3
+import contextlib
+import functools
+import contextvars
+import multiprocessing
+import concurrent.futures
+import tracemalloc
+import logging
+import logging.handlers
+import queue
+from collections import OrderedDict, defaultdict, deque
+from collections.abc import Mapping
+from urllib.parse import urlparse, parse_qs, urlencode
+from html.parser import HTMLParser
+
+from aiohttp import web
 
 from discord.ext import commands
 from discord import app_commands
 from discord.ui import View, Button, Modal, TextInput, Select
 
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo, available_timezones
 from dotenv import load_dotenv
 
+IMPORTS_DONE_AT = time.perf_counter()
+
 # ---------------------------
 # Load Environment Variables
 # ---------------------------
@@ -29,14 +59,634 @@ load_dotenv()
 TOKEN = os.getenv("DISCORD_TOKEN")
 GENIUS_API_KEY = os.getenv("GENIUS_API_KEY")
 API_NINJA_RANDOM_WORD_KEY = os.getenv("API_NINJA_RANDOM_WORD_KEY")
-GUILD_ID = int(os.getenv("GUILD_ID"))
+# Guild that owns the legacy flat timezone file, if any
+GUILD_ID = int(os.getenv("GUILD_ID")) if os.getenv("GUILD_ID") else None
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 GITHUB_REPO = os.getenv("GITHUB_REPO")
 GITHUB_FILE = os.getenv("GITHUB_FILE", "timezones.json")
+GITHUB_TIMEZONE_DIR = os.getenv("GITHUB_TIMEZONE_DIR", "timezones")
+
+# Timezone storage: "github" (repo shards) or "sqlite" (local database)
+TIMEZONE_BACKEND = os.getenv("TIMEZONE_BACKEND", "github").lower()
+TIMEZONE_DB = os.getenv("TIMEZONE_DB", "timezones.db")
+# How often the SQLite backend checks for changes other processes (the
+# workers of a sharded deployment) committed to the same database
+TIMEZONE_RESYNC_INTERVAL = float(os.getenv("TIMEZONE_RESYNC_INTERVAL", 5))
+
+# Timezone write-behind (GitHub backend)
+TIMEZONE_JOURNAL = os.getenv("TIMEZONE_JOURNAL", "timezone_journal.jsonl")
+TIMEZONE_FLUSH_QUIET = float(os.getenv("TIMEZONE_FLUSH_QUIET", 10))
+TIMEZONE_FLUSH_MAX_DELAY = float(os.getenv("TIMEZONE_FLUSH_MAX_DELAY", 300))
+TIMEZONE_PUSH_ATTEMPTS = 3
+
+# Live time boards
+LIVE_BOARD_MAX_EDITS_PER_MINUTE = int(os.getenv("LIVE_BOARD_MAX_EDITS_PER_MINUTE", 50))
+BOARD_REFRESH_DEBOUNCE = float(os.getenv("BOARD_REFRESH_DEBOUNCE", 5))
+
+# Member cache: "full" chunks and caches every member of every guild,
+# "lazy" skips startup chunking and resolves only the ids a board shows
+MEMBER_CACHE = os.getenv("MEMBER_CACHE", "full").lower()
+MEMBER_NAME_TTL = float(os.getenv("MEMBER_NAME_TTL", 600))
+MEMBER_NAME_CACHE_SIZE = int(os.getenv("MEMBER_NAME_CACHE_SIZE", 5000))
+
+# Latency budgets in seconds for slash commands that wait on upstreams.
+# Commands whose budget reaches INTERACTION_ACK_AFTER are deferred first,
+# since Discord drops interactions not acknowledged within 3 s
+INTERACTION_ACK_AFTER = float(os.getenv("INTERACTION_ACK_AFTER", 2.0))
+COMMAND_BUDGETS = {
+    "word": float(os.getenv("BUDGET_WORD", 2.5)),
+    "quote": float(os.getenv("BUDGET_QUOTE", 1.5)),
+    "time": float(os.getenv("BUDGET_TIME", 1.5)),
+}
+
+# Admission control for expensive commands: (concurrent runs, queued
+# waiters) per command class, how long a waiter may queue, token costs, and
+# per-user / per-channel buckets. Interactions queue for at most
+# ADMIT_INTERACTION_QUEUE_TIMEOUT, since the wait comes out of Discord's 3 s
+# window and the command still has to answer (or defer) after it
+ADMISSION_LIMITS = {
+    "playlist": (int(os.getenv("ADMIT_PLAYLIST_CONCURRENCY", 2)), int(os.getenv("ADMIT_PLAYLIST_QUEUE", 2))),
+    "songlink": (int(os.getenv("ADMIT_SONGLINK_CONCURRENCY", 6)), int(os.getenv("ADMIT_SONGLINK_QUEUE", 12))),
+    "word": (int(os.getenv("ADMIT_WORD_CONCURRENCY", 4)), int(os.getenv("ADMIT_WORD_QUEUE", 8))),
+}
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMIT_QUEUE_TIMEOUT", 2.0))
+ADMISSION_INTERACTION_QUEUE_TIMEOUT = float(os.getenv("ADMIT_INTERACTION_QUEUE_TIMEOUT", 0.5))
+ADMISSION_COSTS = {"playlist": 5, "songlink": 2, "word": 2}
+USER_BUCKET = (float(os.getenv("ADMIT_USER_BURST", 10)), float(os.getenv("ADMIT_USER_PER_MINUTE", 10)))
+CHANNEL_BUCKET = (float(os.getenv("ADMIT_CHANNEL_BURST", 30)), float(os.getenv("ADMIT_CHANNEL_PER_MINUTE", 30)))
+
+# CPU-heavy stages run off the loop. Parsing and encoding go to a "thread"
+# pool, a "process" pool (json.loads keeps the GIL, so only a process keeps
+# big parses from stalling the loop, at the cost of each worker importing
+# bot.py once) or stay "inline"; stages that build discord objects always
+# use threads. Payloads under OFFLOAD_MIN_BYTES, and playlists or
+# timezone files under OFFLOAD_MIN_ITEMS entries, are cheap enough to stay
+# on the loop. Offloaded parsers return only the fields the bot reads, since
+# unpickling a big result back on the loop costs as much as parsing it
+OFFLOAD_POOL = os.getenv("OFFLOAD_POOL", "thread").lower()
+OFFLOAD_WORKERS = int(os.getenv("OFFLOAD_WORKERS", min(4, os.cpu_count() or 1)))
+OFFLOAD_MIN_BYTES = int(os.getenv("OFFLOAD_MIN_BYTES", 64 * 1024))
+OFFLOAD_MIN_ITEMS = int(os.getenv("OFFLOAD_MIN_ITEMS", 200))
+
+# Word source: "online" (api-ninjas) or "local" (bundled dictionary files)
+WORD_SOURCE = os.getenv("WORD_SOURCE", "online").lower()
+LOCAL_DICTIONARY = os.getenv("LOCAL_DICTIONARY", "dictionary")
+
+# Random word prefetching; WORD_POOL_SIZE=0 disables the pool
+WORD_POOL_SIZE = int(os.getenv("WORD_POOL_SIZE", 10))
+
+# Requests per minute the bot may send each word provider. Every request
+# counts, on-demand ones included; only the prefetcher waits for a slot
+WORD_PROVIDER_RATES = {
+    "api-ninjas": int(os.getenv("WORD_RATE_API_NINJAS", 10)),
+    "dictionary": int(os.getenv("WORD_RATE_DICTIONARYAPI", 20)),
+    "datamuse": int(os.getenv("WORD_RATE_DATAMUSE", 30)),
+    "wiktionary": int(os.getenv("WORD_RATE_WIKTIONARY", 20)),
+}
+
+# ZenQuotes batch buffer
+QUOTE_BUFFER_SIZE = int(os.getenv("QUOTE_BUFFER_SIZE", 100))
+QUOTE_REFILL_AT = int(os.getenv("QUOTE_REFILL_AT", 10))
+QUOTE_RECENT_WINDOW = int(os.getenv("QUOTE_RECENT_WINDOW", 200))
+QUOTE_REFILL_COOLDOWN = float(os.getenv("QUOTE_REFILL_COOLDOWN", 10))
+
+# Seconds a SQLite statement waits on another worker's lock before failing.
+# Only reads run on the loop, so this bounds how long one can stall it
+SQLITE_BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", 0.5))
+
+# Response cache: in-process LRU in front of an on-disk SQLite store
+CACHE_DB = os.getenv("CACHE_DB", "cache.db")
+CACHE_MEMORY_ITEMS = int(os.getenv("CACHE_MEMORY_ITEMS", 2000))
+CACHE_DISK_MAX_BYTES = int(os.getenv("CACHE_DISK_MAX_BYTES", 100 * 1024 * 1024))
+
+DAY = 24 * 60 * 60
+
+# provider -> (ttl, negative ttl) in seconds
+CACHE_TTLS = {
+    "odesli": (7 * DAY, 60 * 60),
+    "genius": (30 * DAY, DAY),
+    "dictionary": (30 * DAY, DAY),
+    "datamuse": (7 * DAY, DAY),
+    "wiktionary": (30 * DAY, DAY),
+    # Playlist pages are revalidated with their ETag on every load; the TTL
+    # only bounds how long an unused one is kept
+    "youtube": (7 * DAY, 60 * 60),
+}
+
+# Event loop watchdog
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", 0.25))
+LOOP_STALL_THRESHOLD = float(os.getenv("LOOP_STALL_THRESHOLD", 0.5))
+
+# Health server
+PORT = int(os.getenv("PORT", 10000))
+HEALTH_MAX_LOOP_LAG = float(os.getenv("HEALTH_MAX_LOOP_LAG", 2.0))
+HEALTH_MAX_HEARTBEAT_AGE = float(os.getenv("HEALTH_MAX_HEARTBEAT_AGE", 90))
+
+# Logging and tracing
+LOG_FILE = os.getenv("LOG_FILE")
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", 0.1))
+
+# Memory introspection: tracemalloc is off unless MEMORY_PROFILING=1 or
+# switched on at runtime; DEBUG_TOKEN enables the /debug health endpoints
+MEMORY_PROFILING = os.getenv("MEMORY_PROFILING", "0") == "1"
+MEMORY_TRACE_FRAMES = int(os.getenv("MEMORY_TRACE_FRAMES", 1))
+DEBUG_TOKEN = os.getenv("DEBUG_TOKEN")
+
+# Sharding, set for each worker by launcher.py: this process owns SHARD_IDS
+# (comma separated) out of SHARD_COUNT. Worker 0 also runs the jobs that
+# happen once per deployment, such as syncing slash commands
+SHARD_COUNT = int(os.getenv("SHARD_COUNT")) if os.getenv("SHARD_COUNT") else None
+SHARD_IDS = [int(shard_id) for shard_id in os.getenv("SHARD_IDS", "").split(",") if shard_id.strip()] or None
+WORKER_INDEX = int(os.getenv("WORKER_INDEX", 0))
+WORKER_COUNT = int(os.getenv("WORKER_COUNT", 1))
+
+# Playlist sessions and live boards live in SQLite so any worker can answer
+# a dropdown and boards keep updating after a restart
+SESSION_DB = os.getenv("SESSION_DB", "sessions.db")
+PLAYLIST_SESSION_TTL = float(os.getenv("PLAYLIST_SESSION_TTL", 30 * 60))
+PLAYLIST_SESSION_MEMORY_ITEMS = int(os.getenv("PLAYLIST_SESSION_MEMORY_ITEMS", 200))
+
+# Hash of the last synced command tree; sync is skipped while it matches.
+# It sits next to SESSION_DB, so a volume mounted for the state files keeps
+# it across deploys; on a container's own disk every deploy syncs again
+COMMAND_HASH_FILE = os.getenv(
+    "COMMAND_HASH_FILE", os.path.join(os.path.dirname(SESSION_DB), "command_tree.hash")
+)
 
 # Playlist API Keys
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 
+# Upstream API base URLs; benchmark.py points these at local stubs
+ODESLI_API = os.getenv("ODESLI_API", "https://api.song.link/v1-alpha.1")
+GENIUS_API = os.getenv("GENIUS_API", "https://api.genius.com")
+YOUTUBE_API = os.getenv("YOUTUBE_API", "https://www.googleapis.com/youtube/v3")
+ZENQUOTES_API = os.getenv("ZENQUOTES_API", "https://zenquotes.io/api")
+API_NINJAS_API = os.getenv("API_NINJAS_API", "https://api.api-ninjas.com/v1")
+DICTIONARY_API = os.getenv("DICTIONARY_API", "https://api.dictionaryapi.dev/api/v2")
+DATAMUSE_API = os.getenv("DATAMUSE_API", "https://api.datamuse.com")
+WIKTIONARY_API = os.getenv("WIKTIONARY_API", "https://en.wiktionary.org/w/api.php")
+GITHUB_BASE = os.getenv("GITHUB_BASE", "https://api.github.com")
+
+# ---------------------------
+# Logging and Tracing
+# ---------------------------
+
+log = logging.getLogger("bot")
+
+current_trace = contextvars.ContextVar("current_trace", default=None)
+current_span = contextvars.ContextVar("current_span", default=None)
+
+
+class TraceContextFilter(logging.Filter):
+    """Stamps records with the active trace id before they leave the loop thread"""
+
+    def filter(self, record):
+        trace_id = current_trace.get()
+        if trace_id:
+            record.trace_id = trace_id
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; extra fields come from extra={"fields": {...}}"""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+        if getattr(record, "trace_id", None):
+            entry["trace_id"] = record.trace_id
+        if SHARD_COUNT:
+            entry["worker"] = WORKER_INDEX
+        entry.update(getattr(record, "fields", {}))
+        return json.dumps(entry, default=str)
+
+
+def setup_logging():
+    """Route all logging through a queue so the loop never waits on output.
+
+    Returns the listener; stop it on shutdown to flush the queue.
+    """
+    records = queue.SimpleQueue()
+
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if LOG_FILE:
+        handlers.append(logging.FileHandler(LOG_FILE, encoding="utf-8"))
+    for handler in handlers:
+        handler.setFormatter(JsonFormatter())
+
+    queue_handler = logging.handlers.QueueHandler(records)
+    queue_handler.addFilter(TraceContextFilter())
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(logging.INFO)
+
+    listener = logging.handlers.QueueListener(records, *handlers)
+    listener.start()
+    return listener
+
+
+log_listener = setup_logging()
+
+
+def start_trace(name, **fields):
+    """Start a trace for the current task, subject to TRACE_SAMPLE_RATE"""
+    current_span.set(None)
+    if random.random() >= TRACE_SAMPLE_RATE:
+        current_trace.set(None)
+        return None
+    trace_id = uuid.uuid4().hex[:16]
+    current_trace.set(trace_id)
+    log.info("trace", extra={"fields": {"type": "trace", "name": name, **fields}})
+    return trace_id
+
+
+class span:
+    """Times one step of the current trace; does nothing when unsampled.
+
+        with span("upstream", provider="odesli") as sp:
+            ...
+            sp.set(status=200)
+    """
+
+    __slots__ = ("name", "fields", "trace_id", "span_id", "parent_id", "token", "start_ts", "started_at")
+
+    def __init__(self, name, **fields):
+        self.name = name
+        self.fields = fields
+        self.trace_id = None
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def __enter__(self):
+        self.trace_id = current_trace.get()
+        if self.trace_id:
+            self.span_id = uuid.uuid4().hex[:8]
+            self.parent_id = current_span.get()
+            self.token = current_span.set(self.span_id)
+            self.start_ts = time.time()
+            self.started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.trace_id:
+            return False
+        duration = time.perf_counter() - self.started_at
+        current_span.reset(self.token)
+        if exc_type:
+            self.fields.setdefault("error", exc_type.__name__)
+        log.info("span", extra={"fields": {
+            "type": "span",
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": round(self.start_ts, 6),
+            "duration_ms": round(duration * 1000, 3),
+            **self.fields
+        }})
+        return False
+
+
+def traced(name):
+    """Decorator wrapping every call of a function in a span"""
+    def decorate(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with span(name):
+                    return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# ---------------------------
+# Metrics
+# ---------------------------
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+
+class GaugeChild(CounterChild):
+    __slots__ = ()
+
+    def set(self, value):
+        self.value = value
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+
+class HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metric:
+    """A named metric family; labels() returns a cached child to record into.
+
+    Everything runs on the event loop thread, so children are plain
+    attribute updates with no locking.
+    """
+
+    def __init__(self, kind, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS, function=None):
+        self.kind = kind
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.function = function
+        self.children = {}
+        metrics_registry.append(self)
+
+    def labels(self, *values):
+        child = self.children.get(values)
+        if child is None:
+            if self.kind == "histogram":
+                child = HistogramChild(self.buckets)
+            elif self.kind == "gauge":
+                child = GaugeChild()
+            else:
+                child = CounterChild()
+            self.children[values] = child
+        return child
+
+    def samples(self):
+        """Yield (label values, child or value); function metrics are read at scrape time"""
+        if self.function:
+            yield from self.function()
+        else:
+            yield from self.children.items()
+
+
+metrics_registry = []
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names, values, extra=None):
+    pairs = [f'{n}="{escape_label(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def render_metrics():
+    """Render every registered metric in the Prometheus text format"""
+    lines = []
+    for metric in metrics_registry:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for values, sample in metric.samples():
+            if metric.kind != "histogram":
+                value = sample.value if isinstance(sample, CounterChild) else sample
+                lines.append(f"{metric.name}{format_labels(metric.labelnames, values)} {value}")
+                continue
+            cumulative = 0
+            for bound, count in zip(metric.buckets + ("+Inf",), sample.counts):
+                cumulative += count
+                labels = format_labels(metric.labelnames, values, f'le="{bound}"')
+                lines.append(f"{metric.name}_bucket{labels} {cumulative}")
+            labels = format_labels(metric.labelnames, values)
+            lines.append(f"{metric.name}_sum{labels} {sample.sum}")
+            lines.append(f"{metric.name}_count{labels} {sample.count}")
+    return "\n".join(lines) + "\n"
+
+
+command_latency = Metric(
+    "histogram", "bot_command_latency_seconds",
+    "Command handler latency", ("command", "kind")
+)
+command_results = Metric(
+    "counter", "bot_commands_total",
+    "Commands handled by outcome", ("command", "kind", "status")
+)
+interaction_deadline_misses = Metric(
+    "counter", "bot_interaction_deadline_misses_total",
+    "Interactions that expired before the bot responded", ("command",)
+)
+admission_rejections = Metric(
+    "counter", "bot_admission_rejections_total",
+    "Expensive commands turned away by admission control", ("command_class", "reason")
+)
+Metric(
+    "gauge", "bot_admission_active",
+    "Expensive commands running per command class", ("command_class",),
+    function=lambda: [((name,), gate.active) for name, gate in admission.gates.items()]
+)
+Metric(
+    "gauge", "bot_admission_queued",
+    "Expensive commands waiting for a slot per command class", ("command_class",),
+    function=lambda: [((name, ), len(gate.waiters)) for name, gate in admission.gates.items()]
+)
+conditional_fetches = Metric(
+    "counter", "bot_conditional_fetches_total",
+    "Upstream pages fetched with a stored ETag, by whether they had changed", ("provider", "result")
+)
+offload_tasks = Metric(
+    "counter", "bot_offload_tasks_total",
+    "CPU-heavy stages by where they ran (inline, thread or process)", ("stage", "where")
+)
+command_budget_misses = Metric(
+    "counter", "bot_command_budget_misses_total",
+    "Commands that ran out of latency budget and answered with a fallback", ("command",)
+)
+upstream_latency = Metric(
+    "histogram", "bot_upstream_latency_seconds",
+    "Upstream HTTP request latency until response headers", ("provider",)
+)
+upstream_responses = Metric(
+    "counter", "bot_upstream_responses_total",
+    "Upstream HTTP responses by status", ("provider", "status")
+)
+upstream_timeouts = Metric(
+    "counter", "bot_upstream_timeouts_total",
+    "Upstream HTTP requests that timed out", ("provider",)
+)
+upstream_errors = Metric(
+    "counter", "bot_upstream_errors_total",
+    "Upstream HTTP requests that failed without a response", ("provider",)
+)
+playlist_sessions_created = Metric(
+    "counter", "bot_playlist_sessions_created_total",
+    "Playlist sessions created"
+)
+Metric(
+    "gauge", "bot_playlist_sessions",
+    "Playlist sessions held in this process's memory tier",
+    function=lambda: [((), len(playlist_sessions))]
+)
+Metric(
+    "gauge", "bot_gateway_latency_seconds",
+    "Discord heartbeat latency",
+    function=lambda: [((), bot.latency)] if math.isfinite(bot.latency) else []
+)
+loop_lag_seconds = Metric(
+    "histogram", "bot_loop_lag_seconds",
+    "Event loop lag samples",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+Metric(
+    "gauge", "bot_loop_lag_quantile_seconds",
+    "Event loop lag percentiles over the recent sample window", ("quantile",),
+    function=lambda: loop_watchdog.quantiles()
+)
+loop_stalls = Metric(
+    "counter", "bot_loop_stalls_total",
+    "Times the event loop was blocked longer than LOOP_STALL_THRESHOLD"
+)
+Metric(
+    "counter", "bot_cache_lookups_total",
+    "Response cache lookups by provider and tier", ("provider", "result"),
+    function=lambda: [
+        ((provider, result), count)
+        for provider, counts in response_cache.stats.items()
+        for result, count in counts.items()
+    ]
+)
+Metric(
+    "gauge", "bot_cache_disk_bytes",
+    "Bytes held in the on-disk response cache",
+    function=lambda: [((), response_cache.disk_bytes)]
+)
+Metric(
+    "gauge", "bot_word_pool_depth",
+    "Prefetched words ready to serve",
+    function=lambda: [((), word_pool.queue.qsize())]
+)
+Metric(
+    "counter", "bot_word_pool_served_total",
+    "Words served from the pool or generated on demand", ("source",),
+    function=lambda: [(("pool",), word_pool.hits), (("on_demand",), word_pool.fallbacks)]
+)
+
+UPSTREAM_PROVIDERS = {
+    ODESLI_API: "odesli",
+    GENIUS_API: "genius",
+    DICTIONARY_API: "dictionary",
+    DATAMUSE_API: "datamuse",
+    WIKTIONARY_API: "wiktionary",
+    ZENQUOTES_API: "zenquotes",
+    API_NINJAS_API: "api-ninjas",
+    GITHUB_BASE: "github",
+    YOUTUBE_API: "youtube",
+}
+
+
+def upstream_provider(url):
+    """Map a request URL to its provider label by base URL prefix"""
+    url = str(url)
+    for base, provider in UPSTREAM_PROVIDERS.items():
+        if url.startswith(base):
+            return provider
+    return "other"
+
+
+async def upstream_middleware(request, handler):
+    """aiohttp client middleware recording latency, status and failures per provider.
+
+    The span wraps the whole request in one block, so it is closed even
+    when the request is cancelled.
+    """
+    provider = upstream_provider(request.url)
+    started_at = time.perf_counter()
+
+    with span("upstream", provider=provider, method=request.method, path=request.url.path) as sp:
+        try:
+            response = await handler(request)
+        except asyncio.TimeoutError:
+            upstream_timeouts.labels(provider).inc()
+            raise
+        except Exception:
+            upstream_errors.labels(provider).inc()
+            raise
+
+        upstream_latency.labels(provider).observe(time.perf_counter() - started_at)
+        upstream_responses.labels(provider, str(response.status)).inc()
+        sp.set(status=response.status)
+        return response
+
+
+async def rate_limit_middleware(request, handler):
+    """Charge each request to a word provider against its rate limit.
+
+    Nothing waits here (the wait would count against the request's
+    timeout); the word pool waits for free slots before it starts a word.
+    """
+    limiter = provider_limiters.get(upstream_provider(request.url))
+    if limiter:
+        limiter.take()
+    return await handler(request)
+
+
+class StartupTimer:
+    """Offsets of each startup phase from the first line of bot.py"""
+
+    def __init__(self, started_at):
+        self.started_at = started_at
+        self.phases = {}
+        self.reported = False
+
+    def mark(self, phase, at=None):
+        """Record a phase once; later marks (e.g. on reconnect) are ignored"""
+        if phase not in self.phases:
+            self.phases[phase] = (at or time.perf_counter()) - self.started_at
+
+    def report(self):
+        if self.reported:
+            return
+        self.reported = True
+        log.info("Startup timing", extra={"fields": {
+            "type": "startup",
+            "phases_ms": {phase: round(offset * 1000, 1) for phase, offset in self.phases.items()}
+        }})
+
+
+startup_timer = StartupTimer(STARTUP_STARTED_AT)
+startup_timer.mark("imports", IMPORTS_DONE_AT)
+
+Metric(
+    "gauge", "bot_startup_phase_seconds",
+    "Seconds from process start until each startup phase", ("phase",),
+    function=lambda: [((phase,), offset) for phase, offset in startup_timer.phases.items()]
+)
+
+
+def observe_command(name, kind, started_at, status):
+    command_latency.labels(name, kind).observe(time.perf_counter() - started_at)
+    command_results.labels(name, kind, status).inc()
+
 # ---------------------------
 # Discord Setup
 # ---------------------------
@@ -45,116 +695,1314 @@ intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True
 
-bot = commands.Bot(command_prefix="!", intents=intents)
+
+class MetricsTree(app_commands.CommandTree):
+    """Command tree that times slash commands and counts expired interactions"""
+
+    async def interaction_check(self, interaction):
+        interaction.extras["started_at"] = time.perf_counter()
+        start_trace(
+            f"/{interaction.command.qualified_name}" if interaction.command else "/unknown",
+            user=interaction.user.id,
+            guild=interaction.guild_id
+        )
+        return True
+
+    async def on_error(self, interaction, error):
+        name = interaction.command.qualified_name if interaction.command else "unknown"
+        if "started_at" in interaction.extras:
+            observe_command(name, "slash", interaction.extras["started_at"], "error")
+        original = getattr(error, "original", error)
+        if isinstance(original, discord.NotFound) and original.code == 10062:
+            interaction_deadline_misses.labels(name).inc()
+        await super().on_error(interaction, error)
+
+
+member_cache_options = {}
+if MEMBER_CACHE == "lazy":
+    member_cache_options = {
+        "chunk_guilds_at_startup": False,
+        "member_cache_flags": discord.MemberCacheFlags.none()
+    }
+
+bot_class = commands.Bot
+shard_options = {}
+if SHARD_COUNT:
+    bot_class = commands.AutoShardedBot
+    shard_options = {"shard_count": SHARD_COUNT, "shard_ids": SHARD_IDS}
+
+bot = bot_class(command_prefix="!", intents=intents, tree_cls=MetricsTree, **member_cache_options, **shard_options)
 tree = bot.tree
 
+
+@bot.before_invoke
+async def start_command_timer(ctx):
+    ctx.started_at = time.perf_counter()
+    start_trace(
+        f"!{ctx.command.qualified_name}",
+        user=ctx.author.id,
+        guild=ctx.guild.id if ctx.guild else None
+    )
+
+
+class TracedView(View):
+    """View base that starts a trace for each component interaction"""
+
+    async def interaction_check(self, interaction):
+        start_trace(
+            f"component:{interaction.data.get('custom_id', 'unknown')}",
+            user=interaction.user.id,
+            guild=interaction.guild_id
+        )
+        return True
+
+
+class TracedHTTPClient(discord.http.HTTPClient):
+    """Discord REST client that puts each call in a span"""
+
+    async def request(self, route, **kwargs):
+        with span("discord.rest", method=route.method, path=route.path):
+            return await super().request(route, **kwargs)
+
+
+# Client.__init__ builds the HTTPClient and hands it to the connection
+# state, so the existing instance is switched to the tracing subclass
+bot.http.__class__ = TracedHTTPClient
+
+
+@bot.after_invoke
+async def stop_command_timer(ctx):
+    observe_command(ctx.command.qualified_name, "prefix", ctx.started_at, "error" if ctx.command_failed else "ok")
+
+
+@bot.event
+async def on_app_command_completion(interaction, command):
+    observe_command(command.qualified_name, "slash", interaction.extras["started_at"], "ok")
+
+# ---------------------------
+# Admission Control
+# ---------------------------
+
+class AdmissionGate:
+    """Concurrency limit with a bounded wait queue.
+
+    Waiters beyond the queue are shed at once, and a waiter that doesn't
+    get a slot within the timeout (or the caller's own, shorter one) gives
+    up, so callers always hear back quickly. A released slot is handed
+    straight to the oldest waiter.
+    """
+
+    def __init__(self, limit, queue_size, timeout):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.active = 0
+        self.waiters = deque()
+
+    async def acquire(self, timeout=None):
+        if self.active < self.limit and not self.waiters:
+            self.active += 1
+            return True
+        if len(self.waiters) >= self.queue_size:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        acquired = False
+        try:
+            acquired = await asyncio.wait_for(waiter, min(self.timeout, timeout or self.timeout))
+            return acquired
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            if not waiter.done() or waiter.cancelled():
+                with contextlib.suppress(ValueError):
+                    self.waiters.remove(waiter)
+            elif not acquired:
+                # release() handed us the slot, but we were cancelled or
+                # timed out before taking it; pass it on rather than leak it
+                self.release()
+
+    def release(self):
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)
+                return
+        self.active -= 1
+
+
+class TokenBuckets:
+    """Per-key token buckets, least recently used keys dropped past max_keys"""
+
+    def __init__(self, burst, per_minute, max_keys=10000):
+        self.burst = burst
+        self.rate = per_minute / 60
+        self.max_keys = max_keys
+        self.buckets = OrderedDict()
+
+    def available(self, key):
+        """Refill key's bucket and return its current token count"""
+        now = time.monotonic()
+        tokens, updated = self.buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        self.buckets[key] = (tokens, now)
+        self.buckets.move_to_end(key)
+        while len(self.buckets) > self.max_keys:
+            self.buckets.popitem(last=False)
+        return tokens
+
+    def retry_after(self, key, cost):
+        """Seconds until key can afford cost, 0 if it can now"""
+        missing = cost - self.available(key)
+        return missing / self.rate if missing > 0 else 0
+
+    def take(self, key, cost):
+        tokens, updated = self.buckets[key]
+        self.buckets[key] = (tokens - cost, updated)
+
+
+class AdmissionController:
+    """Decides whether an expensive command may run now.
+
+    Each command class costs tokens from the caller's user and channel
+    buckets and needs a slot in its class's gate. Tokens are taken before
+    queueing, so a user can't pile up waiters their bucket can't pay for,
+    and a shed request keeps its cost. Cheap commands never pass through
+    here, so they are never queued behind expensive ones.
+    """
+
+    def __init__(self, limits, costs, user_bucket, channel_bucket, queue_timeout):
+        self.gates = {
+            name: AdmissionGate(limit, queue_size, queue_timeout)
+            for name, (limit, queue_size) in limits.items()
+        }
+        self.costs = costs
+        self.users = TokenBuckets(*user_bucket)
+        self.channels = TokenBuckets(*channel_bucket)
+
+    async def acquire(self, command_class, user_id, channel_id, timeout=None):
+        """Return None once admitted, else a short message for the user"""
+        cost = self.costs.get(command_class, 1)
+
+        retry_after = max(
+            self.users.retry_after(user_id, cost),
+            self.channels.retry_after(channel_id, cost)
+        )
+        if retry_after:
+            reason = "user_rate" if self.users.retry_after(user_id, cost) else "channel_rate"
+            admission_rejections.labels(command_class, reason).inc()
+            return f"Slow down a little, try that again in {math.ceil(retry_after)}s."
+
+        self.users.take(user_id, cost)
+        self.channels.take(channel_id, cost)
+
+        if not await self.gates[command_class].acquire(timeout):
+            admission_rejections.labels(command_class, "busy").inc()
+            return "I'm busy with lots of requests like that right now, please try again in a moment."
+
+        return None
+
+    def release(self, command_class):
+        self.gates[command_class].release()
+
+
+admission = AdmissionController(
+    ADMISSION_LIMITS, ADMISSION_COSTS, USER_BUCKET, CHANNEL_BUCKET, ADMISSION_QUEUE_TIMEOUT
+)
+
+
+def command_target(args):
+    """The Interaction or Context among a callback's arguments"""
+    for arg in args:
+        if hasattr(arg, "followup") or (hasattr(arg, "author") and hasattr(arg, "send")):
+            return arg
+    raise TypeError("callback has no Interaction or Context argument")
+
+
+async def reject(target, message):
+    if hasattr(target, "followup"):
+        if target.response.is_done():
+            await target.followup.send(message, ephemeral=True)
+        else:
+            await target.response.send_message(message, ephemeral=True)
+    else:
+        await target.send(message)
+
+
+def admitted(command_class):
+    """Gate a command callback through admission control.
+
+    command_class is a class name, or a function of the callback's
+    arguments after the Interaction/Context that returns one.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            target = command_target(args)
+            rest = args[args.index(target) + 1:]
+            name = command_class(*rest, **kwargs) if callable(command_class) else command_class
+
+            user = getattr(target, "user", None) or target.author
+            channel_id = getattr(target, "channel_id", None) or target.channel.id
+
+            timeout = ADMISSION_INTERACTION_QUEUE_TIMEOUT if hasattr(target, "followup") else None
+            rejection = await admission.acquire(name, user.id, channel_id, timeout)
+            if rejection:
+                await reject(target, rejection)
+                return
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                admission.release(name)
+        return wrapper
+    return decorate
+
+
+def songlink_class(query):
+    return "playlist" if detect_playlist_url(query) else "songlink"
+
+# ---------------------------
+# CPU Offload
+# ---------------------------
+
+offload_pools = {}
+
+
+def offload_pool(kind):
+    """The shared executor of the given kind, created on first use"""
+    if kind not in offload_pools:
+        if kind == "process":
+            # Never fork: a child forked from this multi-threaded process
+            # can inherit a lock another thread held and hang on it.
+            # forkserver children come from a clean single-threaded server
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            offload_pools[kind] = concurrent.futures.ProcessPoolExecutor(
+                OFFLOAD_WORKERS, mp_context=multiprocessing.get_context(method)
+            )
+        else:
+            offload_pools[kind] = concurrent.futures.ThreadPoolExecutor(
+                OFFLOAD_WORKERS, thread_name_prefix="offload"
+            )
+    return offload_pools[kind]
+
+
+async def offload(func, *args, size, threshold=OFFLOAD_MIN_BYTES, kind=None):
+    """Run func(*args) in the offload pool once size reaches threshold.
+
+    kind overrides OFFLOAD_POOL; pass "thread" for anything whose
+    arguments or result don't pickle. Threads keep the trace context.
+    """
+    kind = kind or OFFLOAD_POOL
+    if kind == "inline" or size < threshold:
+        offload_tasks.labels(func.__name__, "inline").inc()
+        return func(*args)
+
+    pool = offload_pool(kind)
+    where = "process" if isinstance(pool, concurrent.futures.ProcessPoolExecutor) else "thread"
+    offload_tasks.labels(func.__name__, where).inc()
+
+    with span("offload", stage=func.__name__, size=size, where=where):
+        if where == "thread":
+            context = contextvars.copy_context()
+            return await asyncio.get_running_loop().run_in_executor(pool, functools.partial(context.run, func, *args))
+        return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+
+
+def shutdown_offload_pools():
+    for pool in offload_pools.values():
+        pool.shutdown(wait=False, cancel_futures=True)
+    offload_pools.clear()
+
+
+def parse_json(body):
+    # Same as aiohttp's response.json(): an empty body is None
+    return json.loads(body) if body.strip() else None
+
+
+async def read_json(response, parse=parse_json):
+    """Parse a response body with parse(body), off the loop when it is large"""
+    body = await response.read()
+    return await offload(parse, body, size=len(body))
+
+# ---------------------------
+# Shared HTTP Session
+# ---------------------------
+
+http_session = None
+
+
+async def get_http_session():
+    """Return the bot-wide aiohttp session, creating it on first use"""
+
+    global http_session
+
+    if http_session is None or http_session.closed:
+        http_session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=20),
+            middlewares=(rate_limit_middleware, upstream_middleware)
+        )
+
+    return http_session
+
+# ---------------------------
+# SQLite State
+# ---------------------------
+
+# Every SQLite write runs on this one thread: transactions on a shared
+# connection never overlap, and waiting on another worker's lock doesn't
+# block the loop
+sqlite_writer = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix="sqlite")
+
+
+def open_sqlite(path):
+    """Open a WAL connection read on the loop and written by sqlite_writer"""
+    db = sqlite3.connect(path, isolation_level=None, timeout=SQLITE_BUSY_TIMEOUT, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+
+async def sqlite_write(func, *args):
+    """Run a blocking write on the SQLite writer thread"""
+    return await asyncio.get_running_loop().run_in_executor(sqlite_writer, func, *args)
+
+# ---------------------------
+# Response Cache
+# ---------------------------
+
+class ResponseCache:
+    """Two-tier cache for upstream responses shared by every provider.
+
+    Values live in an in-process LRU backed by a SQLite table, so a
+    restart only loses the memory tier and every worker process shares
+    the disk tier. None is a cached "not found" and uses the provider's
+    shorter negative TTL. Concurrent misses on one key share a single
+    load. MediaWiki reports errors with HTTP 200 and an "error" object:
+    the "not found" codes are cached as None, anything else (maxlag,
+    ratelimited, internal_api_error...) is returned but never stored.
+    """
+
+    MISSING = object()
+
+    NOT_FOUND_ERRORS = {"missingtitle", "invalidtitle", "nosuchsection", "nosuchpageid", "nosuchrevid"}
+
+    # Writes between re-reading the table size, which other workers also grow
+    RESYNC_EVERY = 256
+
+    def __init__(self, path, memory_items, disk_max_bytes, ttls):
+        self.memory = OrderedDict()
+        self.memory_items = memory_items
+        self.disk_max_bytes = disk_max_bytes
+        self.ttls = ttls
+        self.stats = {}
+        self.writes = 0
+        self.loading = {}
+
+        self.db = open_sqlite(path)
+        self.db.execute(
+            """CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)")
+        self.disk_bytes = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+
+    @staticmethod
+    def encode(value):
+        return zlib.compress(json.dumps(value, separators=(",", ":")).encode())
+
+    @staticmethod
+    def decode(blob):
+        return json.loads(zlib.decompress(blob))
+
+    def count(self, provider, outcome):
+        counts = self.stats.setdefault(provider, {"memory": 0, "disk": 0, "miss": 0})
+        counts[outcome] += 1
+
+    def remember(self, key, expires_at, value):
+        self.memory[key] = (expires_at, value)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_items:
+            self.memory.popitem(last=False)
+
+    def get(self, provider, key):
+        """Return the cached value, or ResponseCache.MISSING"""
+        with span("cache.get", provider=provider) as sp:
+            result, value = self.lookup(f"{provider}:{key}")
+            sp.set(result=result)
+        self.count(provider, result)
+        return value
+
+    def lookup(self, key):
+        now = time.time()
+
+        entry = self.memory.get(key)
+        if entry and entry[0] > now:
+            self.memory.move_to_end(key)
+            return "memory", entry[1]
+
+        row = self.db.execute(
+            "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row and row[1] > now:
+            value = self.decode(row[0])
+            sqlite_writer.submit(self.write, "UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self.remember(key, row[1], value)
+            return "disk", value
+
+        return "miss", self.MISSING
+
+    async def set(self, provider, key, value):
+        key = f"{provider}:{key}"
+        ttl, negative_ttl = self.ttls.get(provider, (DAY, 60 * 60))
+        now = time.time()
+        expires_at = now + (negative_ttl if value is None else ttl)
+
+        self.remember(key, expires_at, value)
+        await sqlite_write(self.store, key, value, expires_at, now)
+
+    def store(self, key, value, expires_at, now):
+        """Write one entry to the disk tier; runs on the SQLite writer thread"""
+        blob = self.encode(value)
+        try:
+            old = self.db.execute("SELECT size FROM cache WHERE key = ?", (key,)).fetchone()
+            self.db.execute(
+                "INSERT OR REPLACE INTO cache (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), expires_at, now)
+            )
+            self.disk_bytes += len(blob) - (old[0] if old else 0)
+
+            self.writes += 1
+            if self.writes % self.RESYNC_EVERY == 0:
+                self.disk_bytes = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+
+            if self.disk_bytes > self.disk_max_bytes:
+                self.evict()
+        except sqlite3.Error as e:
+            # The memory tier still has it; the disk copy is only a bonus
+            log.warning(f"Response cache write failed: {e}")
+
+    def write(self, sql, params):
+        """Run one best-effort statement; runs on the SQLite writer thread"""
+        try:
+            self.db.execute(sql, params)
+        except sqlite3.Error as e:
+            log.warning(f"Response cache write failed: {e}")
+
+    async def touch(self, provider, key):
+        """Restart a stored entry's TTL without rewriting its value"""
+        key = f"{provider}:{key}"
+        ttl, _ = self.ttls.get(provider, (DAY, 60 * 60))
+        now = time.time()
+        expires_at = now + ttl
+
+        entry = self.memory.get(key)
+        if entry:
+            self.remember(key, expires_at, entry[1])
+        await sqlite_write(
+            self.write, "UPDATE cache SET expires_at = ?, accessed_at = ? WHERE key = ?", (expires_at, now, key)
+        )
+
+    def evict(self):
+        """Drop expired rows, then least recently used ones, down to 90% of the cap.
+
+        Runs on the SQLite writer thread.
+        """
+        with self.db:
+            self.db.execute("BEGIN")
+            self.db.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+            total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+            target = self.disk_max_bytes * 0.9
+            for key, size in self.db.execute(
+                "SELECT key, size FROM cache ORDER BY accessed_at"
+            ).fetchall():
+                if total <= target:
+                    break
+                self.db.execute("DELETE FROM cache WHERE key = ?", (key,))
+                total -= size
+        self.disk_bytes = total
+
+    async def fetch(self, provider, key, loader):
+        """Return the cached value for key, calling loader() on a miss.
+
+        Exceptions from loader propagate to every caller waiting on that
+        load and are not cached.
+        """
+        value = self.get(provider, key)
+        if value is not self.MISSING:
+            return value
+
+        full_key = f"{provider}:{key}"
+        task = self.loading.get(full_key)
+        if task is None:
+            task = asyncio.ensure_future(self.load(provider, key, loader))
+            self.loading[full_key] = task
+            task.add_done_callback(lambda _: self.loading.pop(full_key, None))
+        # One caller giving up doesn't cancel the load for the others
+        return await asyncio.shield(task)
+
+    async def load(self, provider, key, loader):
+        value = await loader()
+        if isinstance(value, dict) and "error" in value:
+            error = value["error"]
+            if isinstance(error, dict) and error.get("code") in self.NOT_FOUND_ERRORS:
+                value = None
+            else:
+                log.warning(f"Not caching {provider} error response: {str(error)[:200]}")
+                return value
+        await self.set(provider, key, value)
+        return value
+
+
+response_cache = ResponseCache(CACHE_DB, CACHE_MEMORY_ITEMS, CACHE_DISK_MAX_BYTES, CACHE_TTLS)
+
+
+async def fetch_json_cached(provider, url, params=None, headers=None, timeout=10, not_found=(404,)):
+    """GET a JSON resource through the response cache.
+
+    Statuses in not_found are cached as None; other errors raise.
+    """
+    key = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+
+    async def load():
+        session = await get_http_session()
+        async with session.get(url, params=params, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)) as r:
+            if r.status in not_found:
+                return None
+            r.raise_for_status()
+            return await read_json(r)
+
+    return await response_cache.fetch(provider, key, load)
+
 # ---------------------------
 # GitHub Timezone Database
 # ---------------------------
 
-GITHUB_API = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{GITHUB_FILE}"
+GITHUB_CONTENTS = f"{GITHUB_BASE}/repos/{GITHUB_REPO}/contents"
+GITHUB_API = f"{GITHUB_CONTENTS}/{GITHUB_FILE}"
 
 github_headers = {
     "Authorization": f"token {GITHUB_TOKEN}",
     "Accept": "application/vnd.github+json"
 }
 
+# guild_id -> {user_id: tz}; every key is a string
 timezones = {}
-timezones_sha = None
-timezone_dirty = False
+# user_id -> set of guild_ids the user has a timezone saved in
+user_guilds = {}
+# guild_id -> sha of that guild's shard on GitHub
+timezones_sha = {}
+# guild_id -> shard contents as of the last fetch or push, for merges
+timezones_base = {}
+# guild_ids whose shard has unsaved changes
+dirty_guilds = set()
+# dirty guild_ids GitHub refused with a 4xx that retrying won't fix (bad
+# token, no access, no such repo); tried again only after their next edit
+rejected_guilds = set()
+# guild_id -> change counter, so a push can tell if it raced a newer edit
+guild_versions = {}
 
+timezone_changed = asyncio.Event()
+timezone_push_lock = asyncio.Lock()
 
-async def load_timezones_from_github():
 
-    global timezones_sha
+def guild_timezone_url(guild_id):
+    return f"{GITHUB_CONTENTS}/{GITHUB_TIMEZONE_DIR}/{guild_id}.json"
 
-    r = requests.get(GITHUB_API, headers=github_headers)
 
-    if r.status_code != 200:
-        print("Failed to fetch timezone database.")
-        return {}
+def get_guild_timezones(guild_id):
+    return timezones.get(str(guild_id), {})
 
-    data = r.json()
 
-    timezones_sha = data["sha"]
+def index_timezones():
+    """Rebuild the user -> guilds membership index from the partitions"""
+    user_guilds.clear()
+    for guild_id, entries in timezones.items():
+        for uid in entries:
+            user_guilds.setdefault(uid, set()).add(guild_id)
 
-    decoded = base64.b64decode(data["content"]).decode()
 
-    return json.loads(decoded)
+def reindex_guild(guild_id, before, after):
+    """Update the membership index after a guild partition was replaced"""
+    for uid in set(before) - set(after):
+        user_guilds.get(uid, set()).discard(guild_id)
+    for uid in after:
+        user_guilds.setdefault(uid, set()).add(guild_id)
 
 
-async def push_timezones_to_github():
+def put_timezone(guild_id, user_id, tz_name):
+    """Set or clear (tz_name=None) one entry in the in-memory partitions"""
+    entries = timezones.setdefault(guild_id, {})
+    if tz_name is None:
+        entries.pop(user_id, None)
+    else:
+        entries[user_id] = tz_name
 
-    global timezone_dirty
-    global timezones_sha
 
-    if not timezone_dirty:
-        return
+def mark_guild_dirty(guild_id):
+    dirty_guilds.add(guild_id)
+    rejected_guilds.discard(guild_id)
+    guild_versions[guild_id] = guild_versions.get(guild_id, 0) + 1
+
+
+# Held by the worker threads that append to or rewrite the journal
+timezone_journal_lock = threading.Lock()
+
+
+def append_timezone_journal(records):
+    """Durably append change records; blocks on fsync, so run it in a thread"""
+    with timezone_journal_lock:
+        with open(TIMEZONE_JOURNAL, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def read_timezone_journal():
+    """Return the journaled change records, oldest first"""
+
+    if not os.path.exists(TIMEZONE_JOURNAL):
+        return []
+
+    records = []
+
+    with open(TIMEZONE_JOURNAL, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue  # torn final write
+
+    return records
+
+
+def replay_timezone_journal():
+    """Re-apply changes that were journaled but never reached GitHub.
+
+    Returns the records replayed.
+    """
+
+    replayed = read_timezone_journal()
+
+    for record in replayed:
+        put_timezone(record["guild"], record["user"], record["tz"])
+        mark_guild_dirty(record["guild"])
+
+    if replayed:
+        log.info(f"Replayed {len(replayed)} journaled timezone changes")
+        timezone_changed.set()
+
+    return replayed
+
+
+def rewrite_timezone_journal(guild_ids):
+    """Keep the latest record per user in guild_ids; run it in a thread.
+
+    Holding the lock across the read and the replace means an append can
+    land before or after the rewrite, never in between and lost.
+    """
+    tmp_path = f"{TIMEZONE_JOURNAL}.tmp"
+    with timezone_journal_lock:
+        latest = {
+            (record["guild"], record["user"]): record
+            for record in read_timezone_journal()
+            if record["guild"] in guild_ids
+        }
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in latest.values():
+                f.write(json.dumps(record) + "\n")
+        os.replace(tmp_path, TIMEZONE_JOURNAL)
+
+
+async def compact_timezone_journal():
+    """Rewrite the journal keeping only changes for guilds still unsynced"""
+    await asyncio.to_thread(rewrite_timezone_journal, set(dirty_guilds))
+
+
+async def set_user_timezone(guild_id, user_id, tz_name):
+    """Save a user's timezone in guild_id and every other guild they are in.
 
-    encoded = base64.b64encode(
-        json.dumps(timezones, indent=4).encode()
-    ).decode()
+    Returns the guild_ids whose partition changed, once they are persisted.
+    """
+    guild_id, user_id = str(guild_id), str(user_id)
 
-    payload = {
-        "message": "Update timezone database",
-        "content": encoded,
-        "sha": timezones_sha
+    guilds = user_guilds.setdefault(user_id, set())
+    guilds.add(guild_id)
+
+    changed = {
+        gid for gid in guilds
+        if timezones.get(gid, {}).get(user_id) != tz_name
     }
 
-    r = requests.put(GITHUB_API, headers=github_headers, json=payload)
+    # Memory first: a journal compaction racing the save then keeps it
+    for gid in changed:
+        put_timezone(gid, user_id, tz_name)
+    await timezone_store.save([(gid, user_id, tz_name) for gid in changed])
 
-    if r.status_code in [200, 201]:
+    return changed
 
-        data = r.json()
 
-        timezones_sha = data["content"]["sha"]
+def merge_timezones(base, ours, theirs):
+    """Three-way merge of a guild shard: our edits since base win over theirs"""
+    merged = dict(theirs)
+    for uid in set(base) | set(ours):
+        if ours.get(uid) == base.get(uid):
+            continue
+        if uid in ours:
+            merged[uid] = ours[uid]
+        else:
+            merged.pop(uid, None)
+    return merged
 
-        timezone_dirty = False
 
-        print("Timezone DB synced to GitHub")
+def encode_github_content(data):
+    return base64.b64encode(json.dumps(data, indent=4).encode()).decode()
+
+
+def decode_github_content(content):
+    return json.loads(base64.b64decode(content).decode())
+
+
+async def fetch_github_json(url):
+    """Return (data, sha) for a JSON file in the repo, or (None, None)"""
+
+    session = await get_http_session()
+
+    async with session.get(url, headers=github_headers) as r:
+        if r.status != 200:
+            return None, None
+        data = await read_json(r)
+
+    content = data["content"]
+
+    return await offload(decode_github_content, content, size=len(content)), data["sha"]
+
+
+async def load_timezones_from_github():
+
+    partitions = {}
+
+    session = await get_http_session()
+
+    async with session.get(f"{GITHUB_CONTENTS}/{GITHUB_TIMEZONE_DIR}", headers=github_headers) as r:
+        status = r.status
+        listing = await r.json() if status == 200 else []
+
+    if status not in (200, 404):
+        log.warning("Failed to fetch timezone database.")
+
+    for entry in listing:
+        name = entry.get("name", "")
+        if not name.endswith(".json"):
+            continue
+
+        guild_id = name[:-len(".json")]
+        data, sha = await fetch_github_json(guild_timezone_url(guild_id))
+
+        if data is None:
+            log.warning(f"Failed to fetch timezones for guild {guild_id}.")
+            continue
+
+        partitions[guild_id] = data
+        timezones_sha[guild_id] = sha
+        timezones_base[guild_id] = dict(data)
+
+    # Migrate the legacy flat file into its guild's shard
+    if GUILD_ID and str(GUILD_ID) not in partitions:
+        legacy, _ = await fetch_github_json(GITHUB_API)
+        if legacy:
+            partitions[str(GUILD_ID)] = legacy
+            dirty_guilds.add(str(GUILD_ID))
+            timezone_changed.set()
+            log.info("Migrating flat timezone file to per-guild storage")
+
+    return partitions
 
-    else:
-        print("GitHub update failed")
+
+async def push_guild_timezones(guild_id):
+    """PUT one guild's shard, merging with the remote copy on sha conflicts"""
+
+    session = await get_http_session()
+    url = guild_timezone_url(guild_id)
+
+    for _ in range(TIMEZONE_PUSH_ATTEMPTS):
+
+        version = guild_versions.get(guild_id, 0)
+        snapshot = dict(timezones.get(guild_id, {}))
+
+        encoded = await offload(
+            encode_github_content, snapshot, size=len(snapshot), threshold=OFFLOAD_MIN_ITEMS
+        )
+
+        payload = {
+            "message": f"Update timezone database for guild {guild_id}",
+            "content": encoded
+        }
+
+        if timezones_sha.get(guild_id):
+            payload["sha"] = timezones_sha[guild_id]
+
+        async with session.put(url, headers=github_headers, json=payload) as r:
+            status = r.status
+            data = await r.json() if status in (200, 201) else None
+            # GitHub sends rate limits as 403 (or 429) with these headers
+            rate_limited = r.headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in r.headers
+
+        if status in (200, 201):
+
+            timezones_sha[guild_id] = data["content"]["sha"]
+            timezones_base[guild_id] = snapshot
+
+            # Edits made while the PUT was in flight stay dirty
+            if guild_versions.get(guild_id, 0) == version:
+                dirty_guilds.discard(guild_id)
+
+            log.info(f"Timezone DB for guild {guild_id} synced to GitHub")
+            return True
+
+        if 400 <= status < 500 and status not in (409, 422, 429) and not rate_limited:
+            # 409 and 422 are sha conflicts, merged below; anything else in
+            # 4xx fails the same way however often it is retried
+            rejected_guilds.add(guild_id)
+            log.error(
+                f"GitHub rejected the timezone update for guild {guild_id} ({status}); "
+                f"keeping it in the journal and not retrying until it changes again"
+            )
+            return False
+
+        if status not in (409, 422):
+            log.warning(f"GitHub update failed for guild {guild_id} ({status})")
+            return False
+
+        # Stale sha: pull the remote copy, merge our edits onto it, retry
+        theirs, sha = await fetch_github_json(url)
+        if theirs is None:
+            log.warning(f"GitHub conflict for guild {guild_id} could not be resolved")
+            return False
+
+        ours = timezones.get(guild_id, {})
+        merged = merge_timezones(timezones_base.get(guild_id, {}), ours, theirs)
+
+        timezones[guild_id] = merged
+        timezones_base[guild_id] = dict(theirs)
+        timezones_sha[guild_id] = sha
+        reindex_guild(guild_id, ours, merged)
+        invalidate_board_renders(guild_id)
+
+        log.info(f"Merged remote timezone changes for guild {guild_id}")
+
+    return False
+
+
+async def push_timezones_to_github():
+    """Push every dirty guild shard, returning True if nothing is left worth retrying"""
+
+    async with timezone_push_lock:
+
+        pending = dirty_guilds - rejected_guilds
+        for guild_id in pending:
+            try:
+                await push_guild_timezones(guild_id)
+            except aiohttp.ClientError as e:
+                log.warning(f"GitHub update failed for guild {guild_id}: {e}")
+
+        # The journal only shrinks when a guild synced
+        if pending - dirty_guilds:
+            await compact_timezone_journal()
+
+        return not (dirty_guilds - rejected_guilds)
 
 
 async def timezone_sync_loop():
 
     await bot.wait_until_ready()
 
+    retry_delay = TIMEZONE_FLUSH_QUIET
+
     while not bot.is_closed():
 
-        await asyncio.sleep(300)
+        await timezone_changed.wait()
+
+        # Flush once changes go quiet, but never hold a batch past the max delay
+        first_change = time.monotonic()
+        while True:
+            timezone_changed.clear()
+            remaining = TIMEZONE_FLUSH_MAX_DELAY - (time.monotonic() - first_change)
+            if remaining <= 0:
+                break
+            try:
+                await asyncio.wait_for(
+                    timezone_changed.wait(),
+                    timeout=min(TIMEZONE_FLUSH_QUIET, remaining)
+                )
+            except asyncio.TimeoutError:
+                break
+
+        if await push_timezones_to_github():
+            retry_delay = TIMEZONE_FLUSH_QUIET
+            continue
+
+        # Back off and try the leftovers again
+        await asyncio.sleep(retry_delay)
+        retry_delay = min(retry_delay * 2, TIMEZONE_FLUSH_MAX_DELAY)
+        timezone_changed.set()
 
-        await push_timezones_to_github()
+
+# ---------------------------
+# Timezone Storage Backends
+# ---------------------------
+
+class TimezoneStore:
+    """Persistence backend for the per-guild timezone partitions"""
+
+    async def load(self):
+        """Return {guild_id: {user_id: tz}} available right now"""
+        raise NotImplementedError
+
+    async def load_all(self):
+        """Return the complete data set, waiting on remote sources if needed"""
+        return await self.load()
+
+    def get(self, guild_id, user_id):
+        raise NotImplementedError
+
+    async def save(self, changes):
+        """Persist (guild_id, user_id, tz_name) changes; tz_name=None removes the entry"""
+        raise NotImplementedError
+
+    async def import_partitions(self, partitions):
+        """Bulk-write a full data set, used by migrations"""
+        raise NotImplementedError
+
+    def start(self):
+        """Start any background work; safe to call more than once"""
+
+    async def flush(self):
+        """Persist anything still pending"""
+
+    async def close(self):
+        pass
+
+
+class GitHubTimezoneStore(TimezoneStore):
+    """Per-guild JSON shards in the GitHub repo, written behind a local journal"""
+
+    def __init__(self):
+        self.load_task = None
+        self.sync_task = None
+        # guild_id -> user_ids changed locally before GitHub was first
+        # fetched; None once the fetch has been merged in
+        self.local_edits = {}
+        self.replayed = False
+
+    def replay(self):
+        if self.replayed:
+            return
+        self.replayed = True
+        for record in replay_timezone_journal():
+            self.local_edits.setdefault(record["guild"], set()).add(record["user"])
+
+    async def load(self):
+        # Journaled changes are served immediately; GitHub fills in behind them
+        self.replay()
+        if self.load_task is None:
+            self.load_task = asyncio.ensure_future(self.load_in_background())
+        return timezones
+
+    async def load_in_background(self):
+        while True:
+            try:
+                await self.load_all()
+                return
+            except aiohttp.ClientError as e:
+                log.warning(f"Failed to fetch timezone database, retrying: {e}")
+                await asyncio.sleep(60)
+
+    async def load_all(self):
+        self.replay()
+        remote = await load_timezones_from_github()
+
+        for guild_id, theirs in remote.items():
+            ours = timezones.get(guild_id, {})
+            # Memory holds only what changed locally, so the merge base is
+            # GitHub's copy of just those users; their edits (removals
+            # included) win, and everyone else comes from GitHub
+            edited = self.local_edits.get(guild_id, ())
+            base = {uid: theirs[uid] for uid in edited if uid in theirs}
+            merged = merge_timezones(base, ours, theirs)
+
+            timezones[guild_id] = merged
+            reindex_guild(guild_id, ours, merged)
+            invalidate_board_renders(guild_id)
+
+        self.local_edits = None
+        log.info("Timezone database loaded from GitHub")
+        return timezones
+
+    def get(self, guild_id, user_id):
+        return timezones.get(str(guild_id), {}).get(str(user_id))
+
+    async def save(self, changes):
+        for guild_id, user_id, _ in changes:
+            mark_guild_dirty(guild_id)
+            if self.local_edits is not None:
+                self.local_edits.setdefault(guild_id, set()).add(user_id)
+        records = [{"guild": guild_id, "user": user_id, "tz": tz_name} for guild_id, user_id, tz_name in changes]
+        await asyncio.to_thread(append_timezone_journal, records)
+        timezone_changed.set()
+
+    async def import_partitions(self, partitions):
+        for guild_id, entries in partitions.items():
+            timezones[guild_id] = dict(entries)
+            mark_guild_dirty(guild_id)
+        await self.flush()
+
+    def start(self):
+        if self.sync_task is None or self.sync_task.done():
+            self.sync_task = asyncio.ensure_future(timezone_sync_loop())
+
+    async def flush(self):
+        if dirty_guilds:
+            log.info("Flushing timezone changes to GitHub")
+            await push_timezones_to_github()
+
+
+class SQLiteTimezoneStore(TimezoneStore):
+    """Local SQLite database in WAL mode, one row per user per guild.
+
+    Several processes may share the file. PRAGMA data_version only moves
+    when another connection commits, so polling it is cheap, and the
+    partitions are reloaded only when some other worker wrote.
+    """
+
+    def __init__(self, path):
+        self.version = None
+        self.resync_task = None
+        self.db = open_sqlite(path)
+        self.db.execute(
+            """CREATE TABLE IF NOT EXISTS timezones (
+                guild_id TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                tz TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (guild_id, user_id)
+            )"""
+        )
+
+    def data_version(self):
+        return self.db.execute("PRAGMA data_version").fetchone()[0]
+
+    async def load(self):
+        self.version = self.data_version()
+        partitions = {}
+        for guild_id, user_id, tz in self.db.execute("SELECT guild_id, user_id, tz FROM timezones"):
+            partitions.setdefault(guild_id, {})[user_id] = tz
+        return partitions
+
+    def start(self):
+        if self.resync_task is None:
+            self.resync_task = asyncio.ensure_future(self.resync_forever())
+
+    async def resync_forever(self):
+        while True:
+            await asyncio.sleep(TIMEZONE_RESYNC_INTERVAL)
+            try:
+                if self.data_version() == self.version:
+                    continue
+                partitions = await self.load()
+            except sqlite3.Error as e:
+                log.warning(f"Timezone resync failed: {e}")
+                continue
+            changed = {
+                guild_id for guild_id in set(timezones) | set(partitions)
+                if timezones.get(guild_id) != partitions.get(guild_id)
+            }
+            timezones.clear()
+            timezones.update(partitions)
+            index_timezones()
+            for guild_id in changed:
+                invalidate_board_renders(guild_id)
+
+    def get(self, guild_id, user_id):
+        row = self.db.execute(
+            "SELECT tz FROM timezones WHERE guild_id = ? AND user_id = ?",
+            (str(guild_id), str(user_id))
+        ).fetchone()
+        return row[0] if row else None
+
+    async def save(self, changes):
+        await sqlite_write(self.write_changes, changes)
+
+    def write_changes(self, changes):
+        """Apply changes in one transaction; runs on the SQLite writer thread"""
+        now = time.time()
+        with self.db:
+            self.db.execute("BEGIN")
+            for guild_id, user_id, tz_name in changes:
+                if tz_name is None:
+                    self.db.execute(
+                        "DELETE FROM timezones WHERE guild_id = ? AND user_id = ?",
+                        (guild_id, user_id)
+                    )
+                    continue
+                self.db.execute(
+                    """INSERT INTO timezones (guild_id, user_id, tz, updated_at)
+                       VALUES (?, ?, ?, ?)
+                       ON CONFLICT (guild_id, user_id)
+                       DO UPDATE SET tz = excluded.tz, updated_at = excluded.updated_at""",
+                    (guild_id, user_id, tz_name, now)
+                )
+
+    async def import_partitions(self, partitions):
+        now = time.time()
+        rows = [
+            (guild_id, user_id, tz, now)
+            for guild_id, entries in partitions.items()
+            for user_id, tz in entries.items()
+        ]
+        with self.db:
+            self.db.execute("BEGIN")
+            self.db.executemany(
+                """INSERT INTO timezones (guild_id, user_id, tz, updated_at)
+                   VALUES (?, ?, ?, ?)
+                   ON CONFLICT (guild_id, user_id)
+                   DO UPDATE SET tz = excluded.tz, updated_at = excluded.updated_at""",
+                rows
+            )
+
+    async def close(self):
+        if self.resync_task:
+            self.resync_task.cancel()
+        # Behind any writes still queued
+        await sqlite_write(self.db.close)
+
+
+def create_timezone_store(backend):
+    if backend == "github":
+        return GitHubTimezoneStore()
+    if backend == "sqlite":
+        return SQLiteTimezoneStore(TIMEZONE_DB)
+    raise ValueError(f"Unknown timezone backend: {backend}")
+
+
+async def migrate_timezones(source_backend, target_backend):
+    """One-shot copy of every saved timezone from one backend to another"""
+
+    source = create_timezone_store(source_backend)
+    target = create_timezone_store(target_backend)
+
+    partitions = await source.load_all()
+    await target.import_partitions(partitions)
+
+    await target.flush()
+    await source.close()
+    await target.close()
+
+    if http_session and not http_session.closed:
+        await http_session.close()
+
+    count = sum(len(entries) for entries in partitions.values())
+    log.info(f"Migrated {count} timezones in {len(partitions)} guilds from {source_backend} to {target_backend}")
+
+
+timezone_store = create_timezone_store(TIMEZONE_BACKEND)
 
 # ---------------------------
 # Playlist Session Management
 # ---------------------------
 
-playlist_sessions = {}
+class PlaylistSessions:
+    """Playlist track lists keyed by session id.
+
+    Every session is written to a SQLite table, so a dropdown works in
+    whichever worker process receives it and survives restarts. Recently
+    used sessions are also kept in a small in-process LRU.
+    """
+
+    def __init__(self, path, ttl, memory_items):
+        self.ttl = ttl
+        self.memory_items = memory_items
+        self.memory = OrderedDict()
+
+        self.db = open_sqlite(path)
+        self.db.execute(
+            """CREATE TABLE IF NOT EXISTS playlist_sessions (
+                session_id TEXT PRIMARY KEY,
+                data BLOB NOT NULL,
+                created_at REAL NOT NULL
+            )"""
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS playlist_sessions_created ON playlist_sessions (created_at)")
+
+    def __len__(self):
+        return len(self.memory)
+
+    def __iter__(self):
+        return iter(self.memory)
+
+    def remember(self, session_id, session):
+        self.memory[session_id] = session
+        self.memory.move_to_end(session_id)
+        while len(self.memory) > self.memory_items:
+            self.memory.popitem(last=False)
+
+    async def create(self, session):
+        """Store a session and return its id once other workers can read it"""
+        session_id = str(uuid.uuid4())
+        now = time.time()
+        session["created_at"] = now
+
+        self.remember(session_id, session)
+        await sqlite_write(self.store, session_id, session, now)
+        return session_id
+
+    def store(self, session_id, session, now):
+        """Runs on the SQLite writer thread"""
+        self.db.execute(
+            "INSERT INTO playlist_sessions (session_id, data, created_at) VALUES (?, ?, ?)",
+            (session_id, ResponseCache.encode(session), now)
+        )
+        self.db.execute("DELETE FROM playlist_sessions WHERE created_at <= ?", (now - self.ttl,))
+
+    def get(self, session_id):
+        session = self.memory.get(session_id)
+        if session is None:
+            row = self.db.execute(
+                "SELECT data FROM playlist_sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            session = ResponseCache.decode(row[0])
+
+        if time.time() - session["created_at"] > self.ttl:
+            self.memory.pop(session_id, None)
+            return None
 
-def create_playlist_session(tracks, platform, title, thumbnail=None):
+        self.remember(session_id, session)
+        return session
+
+
+playlist_sessions = PlaylistSessions(SESSION_DB, PLAYLIST_SESSION_TTL, PLAYLIST_SESSION_MEMORY_ITEMS)
+
+async def create_playlist_session(tracks, platform, title, thumbnail=None):
     """Create a session for a playlist and return session ID"""
-    session_id = str(uuid.uuid4())
-    playlist_sessions[session_id] = {
+    playlist_sessions_created.labels().inc()
+    return await playlist_sessions.create({
         "tracks": tracks,
         "platform": platform,
         "title": title,
-        "thumbnail": thumbnail,
-        "created_at": datetime.now()
-    }
-    return session_id
+        "thumbnail": thumbnail
+    })
 
 def get_playlist_session(session_id):
-    """Retrieve playlist session data"""
-    if session_id in playlist_sessions:
-        session = playlist_sessions[session_id]
-        # Clean up old sessions (30+ minutes)
-        if (datetime.now() - session["created_at"]).total_seconds() > 1800:
-            del playlist_sessions[session_id]
-            return None
-        return session
-    return None
+    """Retrieve playlist session data, None once it has expired"""
+    return playlist_sessions.get(session_id)
 
 def normalize_track_data(title, artist, album="", url="", isrc="", thumbnail=""):
     """Normalize track data across platforms"""
@@ -174,6 +2022,70 @@ def detect_playlist_url(query: str):
         return "youtube"
     return None
 
+def parse_youtube_playlist_info(body):
+    """Title and thumbnail from a playlists response, None if there is no such playlist"""
+    items = (parse_json(body) or {}).get("items", [])
+    if not items:
+        return None
+    snippet = items[0].get("snippet", {})
+    return {
+        "title": snippet.get("title", "Unknown Playlist"),
+        "thumbnail": snippet.get("thumbnails", {}).get("high", {}).get("url")
+    }
+
+def parse_youtube_items(body):
+    """Normalized tracks and the next page token from a playlistItems page"""
+    data = parse_json(body) or {}
+    tracks = []
+    for item in data.get("items", []):
+        snippet = item.get("snippet", {})
+        tracks.append(normalize_track_data(
+            title=snippet.get("title", ""),
+            artist=snippet.get("videoOwnerChannelTitle", ""),
+            url=f"https://youtu.be/{snippet.get('resourceId', {}).get('videoId', '')}",
+            thumbnail=snippet.get("thumbnails", {}).get("high", {}).get("url", "")
+        ))
+    return tracks, data.get("nextPageToken")
+
+async def fetch_youtube_page(endpoint, params, parse):
+    """GET a YouTube Data API page, revalidating the stored copy by ETag.
+
+    Pages are stored parsed, next to the ETag they came with. When YouTube
+    answers If-None-Match with 304 the stored result is reused, so an
+    unchanged page costs a round trip but no body or parsing. Returns
+    parse(body), or None if the request failed.
+    """
+    key = f"{endpoint}?{urlencode(sorted(params.items()))}"
+    stored = response_cache.get("youtube", key)
+    if stored is ResponseCache.MISSING:
+        stored = None
+
+    headers = {"If-None-Match": stored["etag"]} if stored else {}
+
+    session = await get_http_session()
+    async with session.get(
+        f"{YOUTUBE_API}/{endpoint}",
+        params={**params, "key": YOUTUBE_API_KEY},
+        headers=headers,
+        timeout=aiohttp.ClientTimeout(total=10)
+    ) as r:
+        if r.status == 304 and stored:
+            conditional_fetches.labels("youtube", "not_modified").inc()
+            await response_cache.touch("youtube", key)
+            return stored["page"]
+
+        if r.status != 200:
+            return None
+
+        etag = r.headers.get("ETag")
+        page = await read_json(r, parse)
+
+    if stored:
+        conditional_fetches.labels("youtube", "modified").inc()
+    if etag:
+        await response_cache.set("youtube", key, {"etag": etag, "page": page})
+    return page
+
 async def parse_youtube_playlist(playlist_url: str):
     """Parse YouTube playlist and return normalized tracks"""
     try:
@@ -182,69 +2094,40 @@ async def parse_youtube_playlist(playlist_url: str):
             playlist_id = playlist_url.split("?list=")[1].split("&")[0]
         else:
             return None, "Invalid YouTube playlist URL"
-        
+
         if not YOUTUBE_API_KEY:
             return None, "YouTube API key not configured"
-        
+
         # Fetch playlist metadata
-        playlist_r = requests.get(
-            "https://www.googleapis.com/youtube/v3/playlists",
-            params={
-                "part": "snippet",
-                "id": playlist_id,
-                "key": YOUTUBE_API_KEY
-            },
-            timeout=10
+        info = await fetch_youtube_page(
+            "playlists",
+            {"part": "snippet", "id": playlist_id},
+            parse_youtube_playlist_info
         )
-        
-        if playlist_r.status_code != 200:
+        if not info:
             return None, "Playlist not found"
-        
-        items = playlist_r.json().get("items", [])
-        if not items:
-            return None, "Playlist not found"
-        
-        playlist_data = items[0].get("snippet", {})
-        playlist_title = playlist_data.get("title", "Unknown Playlist")
-        playlist_thumbnail = playlist_data.get("thumbnails", {}).get("high", {}).get("url")
-        
+
         # Fetch all tracks with pagination
         tracks = []
         next_page_token = None
-        
+
         while True:
-            r = requests.get(
-                "https://www.googleapis.com/youtube/v3/playlistItems",
-                params={
-                    "part": "snippet",
-                    "playlistId": playlist_id,
-                    "maxResults": 50,
-                    "pageToken": next_page_token,
-                    "key": YOUTUBE_API_KEY
-                },
-                timeout=10
-            )
-            
-            if r.status_code != 200:
+            params = {"part": "snippet", "playlistId": playlist_id, "maxResults": 50}
+            if next_page_token:
+                params["pageToken"] = next_page_token
+
+            page = await fetch_youtube_page("playlistItems", params, parse_youtube_items)
+            if page is None:
                 break
-            
-            data = r.json()
-            for item in data.get("items", []):
-                snippet = item.get("snippet", {})
-                normalized = normalize_track_data(
-                    title=snippet.get("title", ""),
-                    artist=snippet.get("videoOwnerChannelTitle", ""),
-                    url=f"https://youtu.be/{snippet.get('resourceId', {}).get('videoId', '')}",
-                    thumbnail=snippet.get("thumbnails", {}).get("high", {}).get("url", "")
-                )
-                tracks.append(normalized)
-            
-            next_page_token = data.get("nextPageToken")
+
+            page_tracks, next_page_token = page
+            tracks.extend(page_tracks)
+
             if not next_page_token:
                 break
-        
-        return (tracks, playlist_title, playlist_thumbnail), None
-    
+
+        return (tracks, info["title"], info["thumbnail"]), None
+
     except Exception as e:
         return None, f"Error parsing YouTube playlist: {str(e)}"
 
@@ -261,19 +2144,54 @@ def clean_song_title(title: str) -> str:
     title = re.sub(r"\s+", " ", title)
     return title.strip()
 
-async def fetch_song_links(query: str, ctx_or_interaction=None, is_slash=False):
-    try:
-        if "spotify.com" in query.lower():
+async def odesli_lookup(url: str):
+    """Fetch Odesli links for a song/album URL, or None if Odesli can't resolve it"""
+
+    async def load():
+        # Odesli resolves Spotify links through Spotify's own rate limits
+        if "spotify.com" in url.lower():
             await asyncio.sleep(1.0)
+        session = await get_http_session()
+        async with session.get(
+            f"{ODESLI_API}/links",
+            params={"url": url, "userCountry": "US"},
+            timeout=aiohttp.ClientTimeout(total=20)
+        ) as r:
+            if r.status in (400, 404):
+                return None
+            r.raise_for_status()
+            return await read_json(r, parse_odesli_response)
 
-        r = requests.get(
-            "https://api.song.link/v1-alpha.1/links",
-            params={"url": query, "userCountry": "US"},
-            timeout=20
-        )
-        r.raise_for_status()
-        data = r.json()
+    return await response_cache.fetch("odesli", url, load)
+
+def parse_odesli_response(body):
+    """An Odesli response cut down to the first song/album entity and the link URLs"""
+    data = parse_json(body)
+    if not data:
         return data
+
+    entities = {}
+    for uid, entity in data.get("entitiesByUniqueId", {}).items():
+        if entity.get("type") in ["song", "album"]:
+            entities[uid] = {
+                key: entity[key]
+                for key in ("type", "title", "artistName", "thumbnailUrl", "artworkUrl")
+                if key in entity
+            }
+            break
+
+    return {
+        "entitiesByUniqueId": entities,
+        "linksByPlatform": {
+            platform: {"url": link["url"]}
+            for platform, link in data.get("linksByPlatform", {}).items()
+            if isinstance(link, dict) and "url" in link
+        }
+    }
+
+async def fetch_song_links(query: str, ctx_or_interaction=None, is_slash=False):
+    try:
+        return await odesli_lookup(query)
     except Exception as e:
         if is_slash:
             await ctx_or_interaction.followup.send(f"Error fetching song data: {e}")
@@ -284,30 +2202,27 @@ async def fetch_song_links(query: str, ctx_or_interaction=None, is_slash=False):
 async def fetch_odesli_links(track_url: str):
     """Fetch Odesli links for a specific track"""
     try:
-        r = requests.get(
-            "https://api.song.link/v1-alpha.1/links",
-            params={"url": track_url, "userCountry": "US"},
-            timeout=20
-        )
-        r.raise_for_status()
-        return r.json()
+        return await odesli_lookup(track_url)
     except Exception as e:
-        print(f"Error fetching Odesli links: {e}")
+        log.warning(f"Error fetching Odesli links: {e}")
         return None
 
-def get_genius_link(title: str, artist: str):
+async def get_genius_link(title: str, artist: str):
     if not title or not GENIUS_API_KEY:
         return None
     clean_title_str = clean_song_title(title)
     query = f"{clean_title_str} {artist}"
-    try:
-        r = requests.get(
-            "https://api.genius.com/search",
+
+    async def load():
+        session = await get_http_session()
+        async with session.get(
+            f"{GENIUS_API}/search",
             params={"q": query},
             headers={"Authorization": f"Bearer {GENIUS_API_KEY}"},
-            timeout=20
-        )
-        data = r.json()
+            timeout=aiohttp.ClientTimeout(total=20)
+        ) as r:
+            r.raise_for_status()
+            data = await read_json(r)
         hits = data.get("response", {}).get("hits", [])
         for hit in hits:
             result = hit.get("result", {})
@@ -316,9 +2231,13 @@ def get_genius_link(title: str, artist: str):
             if clean_title_str.lower() in result_title and artist.lower() in result_artist:
                 return result.get("url")
         return hits[0]["result"].get("url") if hits else None
+
+    try:
+        return await response_cache.fetch("genius", query.lower(), load)
     except Exception:
         return None
 
+@traced("songlink.reply")
 async def send_songlink_embed(ctx_or_interaction, song_data, is_slash=False):
     entity_id = None
     for uid, entity in song_data.get("entitiesByUniqueId", {}).items():
@@ -337,7 +2256,7 @@ async def send_songlink_embed(ctx_or_interaction, song_data, is_slash=False):
     title = song.get("title", "Unknown Title")
     artist = song.get("artistName", "Unknown Artist")
     thumbnail = song.get("thumbnailUrl") or song.get("artworkUrl")
-    genius_url = get_genius_link(title, artist)
+    genius_url = await get_genius_link(title, artist)
     platforms = list(song_data.get("linksByPlatform", {}).items())[:50]
     platform_links = "\n".join(
         f"[{platform.replace('_',' ').title()}]({data['url']})"
@@ -369,7 +2288,8 @@ async def send_songlink_embed(ctx_or_interaction, song_data, is_slash=False):
         if len(chunks) > 1:
             embed.set_footer(text=f"Page {i+1}/{len(chunks)}")
         if is_slash:
-            await ctx_or_interaction.followup.send(embed=embed)
+            with span("discord.followup", page=i + 1):
+                await ctx_or_interaction.followup.send(embed=embed)
         else:
             await ctx_or_interaction.send(embed=embed)
 
@@ -402,6 +2322,7 @@ class PlaylistTrackSelect(discord.ui.Select):
         self.playlist_title = playlist_title
         self.platform = platform
     
+    @admitted("songlink")
     async def callback(self, interaction: discord.Interaction):
         session = get_playlist_session(self.session_id)
         if not session:
@@ -443,13 +2364,42 @@ class PlaylistTrackSelect(discord.ui.Select):
                 f"No URL available for: **{track['title']}** by {track['artist']}"
             )
 
-class PlaylistView(discord.ui.View):
-    """View containing playlist track dropdown"""
-    def __init__(self, session_id, chunk_index, tracks_chunk, playlist_title, platform):
+class PlaylistTrackPicker(
+    discord.ui.DynamicItem[PlaylistTrackSelect],
+    template=r"playlist_select_(?P<session_id>[0-9a-f-]+)_(?P<chunk_index>[0-9]+)"
+):
+    """Dispatches playlist dropdowns by custom_id.
+
+    The process that answers a dropdown need not be the one that sent it
+    (another worker, or this one after a restart); the session is looked
+    up in the shared store. No per-message view is kept in memory.
+    """
+
+    def __init__(self, select):
+        super().__init__(select)
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        select = PlaylistTrackSelect(match["session_id"], int(match["chunk_index"]), [], "", None)
+        select.options = item.options
+        return cls(select)
+
+    async def interaction_check(self, interaction):
+        start_trace(
+            f"component:{interaction.data.get('custom_id', 'unknown')}",
+            user=interaction.user.id,
+            guild=interaction.guild_id
+        )
+        return True
+
+
+class PlaylistView(TracedView):
+    """View containing one prebuilt playlist track dropdown"""
+    def __init__(self, picker):
         super().__init__(timeout=None)
-        select = PlaylistTrackSelect(session_id, chunk_index, tracks_chunk, playlist_title, platform)
-        self.add_item(select)
+        self.add_item(picker)
 
+@traced("render.playlist_embed")
 def create_playlist_embed(playlist_title, platform, total_tracks, preview_tracks, thumbnail=None):
     """Create an embed showing playlist info and track preview"""
     platform_icons = {
@@ -473,43 +2423,122 @@ def create_playlist_embed(playlist_title, platform, total_tracks, preview_tracks
     
     if thumbnail:
         embed.set_thumbnail(url=thumbnail)
-    
+
     return embed
 
-# ---------------------------
-# Load Weird Laws Database
-# ---------------------------
-with open("weird_laws.json", "r", encoding="utf-8") as f:
-    WEIRD_LAWS = json.load(f)
 
-# ---------------------------
-# Load Affirmations
-# ---------------------------
-with open("affirmations.json", "r", encoding="utf-8") as f:
-    affirmations = json.load(f)
+def render_playlist_messages(session_id, tracks, playlist_title, playlist_platform, thumbnail):
+    """Embed and dropdown for each message of a playlist, 25 tracks per message.
+
+    Needs no event loop, so big playlists are built in the offload pool;
+    the Views themselves are created on the loop.
+    """
+    chunk_size = 25
+    num_chunks = (len(tracks) + chunk_size - 1) // chunk_size
+
+    messages = []
+    for chunk_idx in range(num_chunks):
+        start_idx = chunk_idx * chunk_size
+        end_idx = min(start_idx + chunk_size, len(tracks))
+        chunk = tracks[start_idx:end_idx]
+
+        embed = create_playlist_embed(
+            playlist_title,
+            playlist_platform,
+            len(tracks),
+            chunk,
+            thumbnail
+        )
+
+        if num_chunks > 1:
+            embed.description += f"\n\n**Dropdown {chunk_idx + 1}/{num_chunks}** (showing tracks {start_idx + 1}-{end_idx})"
+
+        select = PlaylistTrackSelect(session_id, chunk_idx, chunk, playlist_title, playlist_platform)
+        messages.append((embed, PlaylistTrackPicker(select)))
+
+    return messages
+
+# ---------------------------
+# Bundled Datasets
+# ---------------------------
+
+class Dataset(Mapping):
+    """A bundled JSON object that is parsed on first access.
+
+    preload() parses it in a worker thread once the bot is up, so neither
+    startup nor the first command pays for it on the loop.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.data = None
+        self.lock = threading.Lock()
+
+    def load(self):
+        if self.data is None:
+            with self.lock:
+                if self.data is None:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        self.data = json.load(f)
+        return self.data
+
+    async def preload(self):
+        if self.data is None:
+            await asyncio.to_thread(self.load)
+
+    def __getitem__(self, key):
+        return self.load()[key]
+
+    def __iter__(self):
+        return iter(self.load())
+
+    def __len__(self):
+        return len(self.load())
+
+
+WEIRD_LAWS = Dataset("weird_laws.json")
+affirmations = Dataset("affirmations.json")
 
-CATEGORIES = list(affirmations.keys())
-category_indexes = {cat: 0 for cat in affirmations.keys()}
-current_category = random.choice(CATEGORIES)  # start with random category
+category_indexes = defaultdict(int)
+current_category = None  # picked at random on first use
 
 # ---------------------------
 # Affirmation View with Embed
 # ---------------------------
-class AffirmationView(discord.ui.View):
+class AffirmationView(TracedView):
+    """Affirmation embed with navigation and category buttons.
+
+    The persistent instance is registered before affirmations.json is
+    parsed, so it starts with just the navigation buttons; ready() adds
+    the categories once a callback has awaited the dataset.
+    """
     def __init__(self, category=None):
         super().__init__(timeout=None)
-        global current_category
-        if category and category in affirmations:
-            current_category = category
         # Add main nav buttons (row 0)
         self.add_item(AffirmationPrevButton(self))
         self.add_item(AffirmationSwitchCategoryButton(self))
         self.add_item(AffirmationNextButton(self))
+        self.has_categories = False
+        if affirmations.data is not None:
+            self.add_categories(category)
+
+    def add_categories(self, category=None):
+        global current_category
+        if category and category in affirmations:
+            current_category = category
+        elif current_category is None:
+            current_category = random.choice(list(affirmations.keys()))
         # Add category buttons (row 1)
         for cat in affirmations.keys():
-            btn = AffirmationCategoryButton(cat, self)
-            btn.row = 1
-            self.add_item(btn)
+            self.add_item(AffirmationCategoryButton(cat))
+        self.has_categories = True
+
+    async def ready(self):
+        """This view with its category buttons, once the dataset is loaded"""
+        await affirmations.preload()
+        if not self.has_categories:
+            self.add_categories()
+        return self
 
     def get_embed(self):
         """Return a Discord Embed for the current category/index"""
@@ -538,10 +2567,11 @@ class AffirmationPrevButton(discord.ui.Button):
         self.persistent = True
 
     async def callback(self, interaction: discord.Interaction):
+        view = await self.parent_view.ready()
         category_indexes[current_category] -= 1
         if category_indexes[current_category] < 0:
             category_indexes[current_category] = len(affirmations[current_category]) - 1
-        await interaction.response.edit_message(embed=self.parent_view.get_embed(), view=self.parent_view)
+        await interaction.response.edit_message(embed=view.get_embed(), view=view)
 
 class AffirmationSwitchCategoryButton(discord.ui.Button):
     def __init__(self, parent_view):
@@ -551,13 +2581,14 @@ class AffirmationSwitchCategoryButton(discord.ui.Button):
 
     async def callback(self, interaction: discord.Interaction):
         global current_category
+        view = await self.parent_view.ready()
         categories = list(affirmations.keys())
         current_idx = categories.index(current_category)
         current_category = categories[(current_idx + 1) % len(categories)]
         category_indexes[current_category] = random.randint(
             0, len(affirmations[current_category]) - 1
         )
-        await interaction.response.edit_message(embed=self.parent_view.get_embed(), view=self.parent_view)
+        await interaction.response.edit_message(embed=view.get_embed(), view=view)
 
 class AffirmationNextButton(discord.ui.Button):
     def __init__(self, parent_view):
@@ -566,33 +2597,57 @@ class AffirmationNextButton(discord.ui.Button):
         self.persistent = True
 
     async def callback(self, interaction: discord.Interaction):
+        view = await self.parent_view.ready()
         category_indexes[current_category] += 1
         if category_indexes[current_category] >= len(affirmations[current_category]):
             category_indexes[current_category] = 0
-        await interaction.response.edit_message(embed=self.parent_view.get_embed(), view=self.parent_view)
-
-class AffirmationCategoryButton(discord.ui.Button):
-    def __init__(self, category, parent_view):
-        super().__init__(label=category.replace("_", " ").title(), style=discord.ButtonStyle.success, custom_id=f"affirm_cat_{category}")
+        await interaction.response.edit_message(embed=view.get_embed(), view=view)
+
+class AffirmationCategoryButton(discord.ui.DynamicItem[discord.ui.Button], template=r"affirm_cat_(?P<category>\w+)"):
+    """Category button, dispatched by custom_id so it needs no dataset to register"""
+    def __init__(self, category):
+        super().__init__(discord.ui.Button(
+            label=category.replace("_", " ").title(),
+            style=discord.ButtonStyle.success,
+            custom_id=f"affirm_cat_{category}",
+            row=1
+        ))
         self.category = category
-        self.parent_view = parent_view
-        self.persistent = True
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match["category"])
 
     async def callback(self, interaction: discord.Interaction):
         global current_category
+        await affirmations.preload()
+        if self.category not in affirmations:
+            await interaction.response.send_message("That category no longer exists.", ephemeral=True)
+            return
         current_category = self.category
         category_indexes[current_category] = random.randint(0, len(affirmations[current_category]) - 1)
-        await interaction.response.edit_message(embed=self.parent_view.get_embed(), view=self.parent_view)
+        view = AffirmationView(category=self.category)
+        await interaction.response.edit_message(embed=view.get_embed(), view=view)
         
 # ---------------------------
 # Weird Laws Viewer
 # ---------------------------
-class WeirdLawView(View):
-    def __init__(self, laws, index=0):
+class WeirdLawView(TracedView):
+    """Pages through the weird laws.
+
+    The persistent instance is registered with laws=None before the
+    dataset is parsed; its callbacks await the dataset first.
+    """
+    def __init__(self, laws=None, index=0):
         super().__init__(timeout=None)
         self.laws = laws
         self.index = index
 
+    async def ready(self):
+        if self.laws is None:
+            await WEIRD_LAWS.preload()
+            self.laws = list(WEIRD_LAWS.values())
+
     def create_embed(self):
         law = self.laws[self.index]
         embed = discord.Embed(
@@ -607,23 +2662,118 @@ class WeirdLawView(View):
 
     @discord.ui.button(label="⬅ Previous", style=discord.ButtonStyle.secondary, custom_id="weirdlaw_prev")
     async def previous(self, interaction: discord.Interaction, button: Button):
+        await self.ready()
         self.index = (self.index - 1) % len(self.laws)
         await interaction.response.edit_message(embed=self.create_embed(), view=self)
 
     @discord.ui.button(label="🎲 Random", style=discord.ButtonStyle.primary, custom_id="weirdlaw_random")
     async def random_law(self, interaction: discord.Interaction, button: Button):
+        await self.ready()
         self.index = random.randint(0, len(self.laws) - 1)
         await interaction.response.edit_message(embed=self.create_embed(), view=self)
 
     @discord.ui.button(label="Next ➡", style=discord.ButtonStyle.secondary, custom_id="weirdlaw_next")
     async def next(self, interaction: discord.Interaction, button: Button):
+        await self.ready()
         self.index = (self.index + 1) % len(self.laws)
         await interaction.response.edit_message(embed=self.create_embed(), view=self)
 
+# ---------------------------
+# ZenQuotes Buffer
+# ---------------------------
+
+class QuoteProvider:
+    """Ring buffer of quotes bulk-fetched from the ZenQuotes batch endpoint.
+
+    Popping is local; the buffer refills in the background once it runs
+    low, skipping quotes that were shown recently.
+    """
+
+    def __init__(self, size, refill_at, recent_window):
+        self.buffer = deque(maxlen=size)
+        self.buffered = set()
+        self.refill_at = refill_at
+        self.recent = deque()
+        self.recent_set = set()
+        self.recent_window = recent_window
+        self.refill_task = None
+        self.next_refill_at = 0.0
+
+    def request_refill(self):
+        """Start a refill unless one is running or the last one was too recent"""
+        if self.refill_task is None or self.refill_task.done():
+            if time.monotonic() < self.next_refill_at:
+                return None
+            self.next_refill_at = time.monotonic() + QUOTE_REFILL_COOLDOWN
+            self.refill_task = asyncio.ensure_future(self.refill())
+        return self.refill_task
+
+    async def refill(self):
+        try:
+            session = await get_http_session()
+            async with session.get(f"{ZENQUOTES_API}/quotes", timeout=aiohttp.ClientTimeout(total=10)) as r:
+                r.raise_for_status()
+                data = await r.json(content_type=None)
+        except Exception as e:
+            log.warning(f"Quote refill failed: {e}")
+            return
+
+        repeats = []
+        for item in data if isinstance(data, list) else []:
+            quote = (item.get("q", ""), item.get("a", ""))
+            # Rate-limit notices come back shaped like quotes
+            if not quote[0] or quote[1] == "zenquotes.io":
+                continue
+            if quote in self.buffered:
+                continue
+            if quote in self.recent_set:
+                repeats.append(quote)
+                continue
+            if len(self.buffer) == self.buffer.maxlen:
+                break
+            self.buffer.append(quote)
+            self.buffered.add(quote)
+
+        # Showing a repeat beats showing nothing
+        if not self.buffer:
+            for quote in repeats:
+                self.buffer.append(quote)
+                self.buffered.add(quote)
+
+    def remember(self, quote):
+        self.recent.append(quote)
+        self.recent_set.add(quote)
+        if len(self.recent) > self.recent_window:
+            self.recent_set.discard(self.recent.popleft())
+
+    def pop(self):
+        """Return a (quote, author) pair from the buffer, or None if it is empty"""
+        if len(self.buffer) <= self.refill_at:
+            self.request_refill()
+        if not self.buffer:
+            return None
+        quote = self.buffer.popleft()
+        self.buffered.discard(quote)
+        self.remember(quote)
+        return quote
+
+    async def get(self):
+        """Pop a quote, waiting for a refill only when the buffer is empty"""
+        quote = self.pop()
+        if quote is None:
+            refill = self.request_refill()
+            if refill:
+                await refill
+            quote = self.pop()
+        return quote
+
+
+quote_provider = QuoteProvider(QUOTE_BUFFER_SIZE, QUOTE_REFILL_AT, QUOTE_RECENT_WINDOW)
+
 # ---------------------------
 # ZenQuotes Viewer
 # ---------------------------
-class ZenQuoteView(View):
+class ZenQuoteView(TracedView):
     def __init__(self, quote_text="", author=""):
         super().__init__(timeout=None)
         self.quote_text = quote_text
@@ -638,18 +2788,11 @@ class ZenQuoteView(View):
         return embed
 
     async def fetch_new_quote(self):
-        try:
-            r = requests.get("https://zenquotes.io/api/random", timeout=10)
-            r.raise_for_status()
-            data = r.json()
-            if isinstance(data, list) and len(data) > 0:
-                self.quote_text = data[0].get("q", "No quote found")
-                self.author = data[0].get("a", "")
-            else:
-                self.quote_text = "No quote found"
-                self.author = ""
-        except Exception as e:
-            self.quote_text = f"Error fetching quote: {e}"
+        quote = await quote_provider.get()
+        if quote:
+            self.quote_text, self.author = quote
+        else:
+            self.quote_text = "No quote available right now, try again in a moment."
             self.author = ""
 
     @discord.ui.button(label="🎲 New Quote", style=discord.ButtonStyle.primary, custom_id="quote_new")
@@ -657,88 +2800,352 @@ class ZenQuoteView(View):
         await self.fetch_new_quote()
         await interaction.response.edit_message(embed=self.create_embed(), view=self)
 
+# ---------------------------
+# Local Dictionary
+# ---------------------------
+
+class LocalDictionary:
+    """Memory-mapped word list and definitions built by build_dictionary.py.
+
+    Random picks and lookups read a fixed-width index slot and one entry
+    line, so only the pages for the words we touch are ever loaded.
+    """
+
+    def __init__(self, path):
+        with open(f"{path}.dat", "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(f"{path}.idx", "rb") as f:
+            self.index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.count, self.slots = struct.unpack_from("<4sII", self.index, 0)
+        if magic != b"WDX1":
+            raise ValueError(f"{path}.idx is not a dictionary index")
+        if not self.count:
+            raise ValueError(f"{path} has no words")
+        if self.slots <= self.count:
+            # build_dictionary.py leaves free slots so a probe always ends
+            raise ValueError(f"{path}.idx hash table is full ({self.count} words, {self.slots} slots)")
+
+        self.dense_at = 12
+        self.table_at = self.dense_at + 8 * self.count
+
+    def entry_at(self, offset):
+        end = self.data.find(b"\n", offset)
+        word, _, defs = self.data[offset:end].decode("utf-8").partition("\t")
+        return word, defs.split("\x1f") if defs else []
+
+    def random_word(self):
+        i = random.randrange(self.count)
+        (offset,) = struct.unpack_from("<Q", self.index, self.dense_at + 8 * i)
+        return self.entry_at(offset)[0]
+
+    def lookup(self, word):
+        """Return the definitions for word, or None if it is not in the dictionary"""
+        key = word.lower()
+        slot = zlib.crc32(key.encode("utf-8")) % self.slots
+        for _ in range(self.slots):
+            (stored,) = struct.unpack_from("<Q", self.index, self.table_at + 8 * slot)
+            if not stored:
+                return None
+            entry_word, defs = self.entry_at(stored - 1)
+            if entry_word.lower() == key:
+                return defs
+            slot = (slot + 1) % self.slots
+        return None
+
+
+def open_local_dictionary():
+    if WORD_SOURCE != "local":
+        return None
+    try:
+        dictionary = LocalDictionary(LOCAL_DICTIONARY)
+    except (OSError, ValueError, struct.error) as e:
+        log.warning(f"Local dictionary unavailable, using online word source: {e}")
+        return None
+    log.info(f"Local dictionary loaded ({dictionary.count} words)")
+    return dictionary
+
+
+local_dictionary = open_local_dictionary()
+
+# ---------------------------
+# Wiktionary Section Parsing
+# ---------------------------
+
+def english_etymology_sections(sections):
+    """Return the section indexes of the Etymology headings under English"""
+    indexes, in_english = [], False
+    for section in sections:
+        if section.get("level") == "2":
+            in_english = section.get("line") == "English"
+        elif in_english and section.get("line", "").startswith("Etymology"):
+            indexes.append(section["index"])
+    return indexes
+
+
+class SectionTextParser(HTMLParser):
+    """Streams a rendered wiki section into plain-text paragraphs.
+
+    action=parse&section=N also returns the section's subsections (under
+    "Etymology 1" that is Pronunciation, Noun and so on), so collection
+    stops at the first heading after the section's own. Headings,
+    reference markers, styles and scripts are skipped.
+    """
+
+    HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+    SKIP_TAGS = HEADING_TAGS | {"sup", "style", "script"}
+    BLOCK_TAGS = {"p", "li", "dd"}
+    VOID_TAGS = {"br", "img", "hr", "wbr", "input", "meta", "link"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.paragraphs = []
+        self.current = []
+        self.skipping = []
+        self.seen_heading = False
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if self.done or tag in self.VOID_TAGS:
+            return
+        if tag in self.HEADING_TAGS:
+            if self.seen_heading:
+                self.flush()
+                self.done = True
+                return
+            self.seen_heading = True
+        if self.skipping or tag in self.SKIP_TAGS:
+            self.skipping.append(tag)
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        if self.skipping:
+            if tag in self.skipping:
+                while self.skipping.pop() != tag:
+                    pass
+            return
+        if tag in self.BLOCK_TAGS:
+            self.flush()
+
+    def handle_data(self, data):
+        if not self.skipping and not self.done:
+            self.current.append(data)
+
+    def flush(self):
+        text = " ".join("".join(self.current).split())
+        if text:
+            self.paragraphs.append(text)
+        self.current = []
+
+    def close(self):
+        super().close()
+        self.flush()
+
+
+def extract_section_text(html):
+    """Plain-text paragraphs of a section's HTML; run off the event loop"""
+    parser = SectionTextParser()
+    parser.feed(html)
+    parser.close()
+    return parser.paragraphs
+
 # ---------------------------
 # Fixed WordView Class
 # ---------------------------
-class WordView(View):
+class WordView(TracedView):
     def __init__(self):
         super().__init__(timeout=None)
         self.pages = []
         self.page_types = []
         self.index = 0
+        self.word = None
+        self.pron = "N/A"
+        self.defs, self.examples, self.related, self.ety = [], [], [], None
+        self.pending = set()
+        self.finish_task = None
+
+    async def fetch_json(self, url, timeout=10, **kwargs):
+        session = await get_http_session()
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout), **kwargs) as r:
+            r.raise_for_status()
+            return await r.json(content_type=None)
 
     async def fetch_random_word(self):
-        url = "https://api.api-ninjas.com/v1/randomword"
+        if local_dictionary:
+            return local_dictionary.random_word()
+        url = f"{API_NINJAS_API}/randomword"
         headers = {"X-Api-Key": API_NINJA_RANDOM_WORD_KEY}
         try:
-            r = requests.get(url, headers=headers, timeout=15)
-            r.raise_for_status()
-            word = r.json().get("word", "example")
+            data = await self.fetch_json(url, timeout=15, headers=headers)
+            word = data.get("word", "example")
             if isinstance(word, list):
                 word = word[0]
             return str(word)
-        except:
+        except Exception:
             return "example"
 
     async def dictionary(self, word):
         defs, examples, pron = [], [], "N/A"
         try:
-            r = requests.get(f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}", timeout=10)
-            if r.status_code == 200:
-                data = r.json()[0]
-                if data.get("phonetics"):
-                    pron = data["phonetics"][0].get("text", "N/A")
-                for meaning in data.get("meanings", []):
-                    for d in meaning.get("definitions", []):
-                        defs.append(d.get("definition"))
-                        if d.get("example"):
-                            examples.append(d.get("example"))
-        except:
+            data = (await fetch_json_cached("dictionary", f"{DICTIONARY_API}/entries/en/{word}"))[0]
+            if data.get("phonetics"):
+                pron = data["phonetics"][0].get("text", "N/A")
+            for meaning in data.get("meanings", []):
+                for d in meaning.get("definitions", []):
+                    defs.append(d.get("definition"))
+                    if d.get("example"):
+                        examples.append(d.get("example"))
+        except Exception:
             pass
 
         if not defs:
             try:
-                r = requests.get(f"https://api.datamuse.com/words?sp={word}&md=d&max=1", timeout=10)
-                data = r.json()
+                data = await fetch_json_cached("datamuse", f"{DATAMUSE_API}/words?sp={word}&md=d&max=1")
                 if data and "defs" in data[0]:
                     defs = [d.split("\t")[1] for d in data[0]["defs"]]
-            except:
+            except Exception:
                 pass
 
         return pron, defs[:10], examples[:8]
 
     async def related_words(self, word):
         try:
-            r = requests.get(f"https://api.datamuse.com/words?ml={word}&max=20", timeout=10)
-            return [x["word"] for x in r.json()]
-        except:
+            data = await fetch_json_cached("datamuse", f"{DATAMUSE_API}/words?ml={word}&max=20")
+            return [x["word"] for x in data]
+        except Exception:
             return []
 
     async def etymology(self, word):
+        api = WIKTIONARY_API
         try:
-            r = requests.get(
-                f"https://en.wiktionary.org/w/api.php?action=parse&page={word}&prop=text&format=json",
-                timeout=10
-            )
-            html = r.json()["parse"]["text"]["*"]
-            matches = re.findall(r"<h[1-6][^>]*>Etymology.*?</h[1-6]>(.*?)<h[1-6]", html, re.S | re.I)
+            # Ask for the table of contents first, then fetch only the
+            # English Etymology sections instead of the whole page
+            data = await fetch_json_cached("wiktionary", api, params={
+                "action": "parse", "page": word, "prop": "sections",
+                "redirects": "1", "format": "json"
+            })
+            indexes = english_etymology_sections(data["parse"]["sections"])
+            if not indexes:
+                return "Etymology not found."
+
+            sections = await asyncio.gather(*(
+                fetch_json_cached("wiktionary", api, params={
+                    "action": "parse", "page": word, "prop": "text", "section": index,
+                    "redirects": "1", "disableeditsection": "1", "format": "json"
+                })
+                for index in indexes
+            ))
+
             paragraphs = []
-            for match in matches:
-                text = re.sub("<.*?>", "", match).strip()
-                if text:
-                    paragraphs.append(text)
+            for section in sections:
+                html = section["parse"]["text"]["*"]
+                paragraphs.extend(await offload(extract_section_text, html, size=len(html)))
             if paragraphs:
                 return "\n\n".join(paragraphs)[:900]
-        except:
+        except Exception:
             pass
         return "Etymology not found."
 
     async def generate(self):
+        """Serve a prefetched word if one is ready, else generate one now"""
+        entry = word_pool.pop()
+        if entry:
+            self.load_entry(entry)
+            return
+        await self.generate_fresh()
+
+    def snapshot(self):
+        return {
+            "word": self.word,
+            "pron": self.pron,
+            "defs": self.defs,
+            "examples": self.examples,
+            "related": self.related,
+            "ety": self.ety
+        }
+
+    def load_entry(self, entry):
+        self.word = entry["word"]
+        self.pron = entry["pron"]
+        self.defs = entry["defs"]
+        self.examples = entry["examples"]
+        self.related = entry["related"]
+        self.ety = entry["ety"]
+        self.pending = set()
+        self.index = 0
+        self.build_pages()
+
+    async def generate_fresh(self):
+        """Pick a word and return once its definitions page is ready.
+
+        Related words and etymology keep loading; call finish() or
+        finish_in_background() to fill in the remaining pages.
+        """
         word = await self.fetch_random_word()
-        pron, defs, examples = await self.dictionary(word)
-        rel = await self.related_words(word)
-        ety = await self.etymology(word)
 
+        self.word = word
+        self.pron = "N/A"
+        self.defs, self.examples, self.related, self.ety = [], [], [], None
+
+        dictionary = asyncio.ensure_future(self.dictionary(word))
+        related = asyncio.ensure_future(self.related_words(word))
+        ety = asyncio.ensure_future(self.etymology(word))
+
+        def store_dictionary(task):
+            if self.word == word and not task.cancelled():
+                pron, defs, examples = task.result()
+                self.pron, self.examples = pron, examples
+                self.defs = self.defs or defs
+
+        def store_related(task):
+            if self.word == word and not task.cancelled():
+                self.related = task.result()
+
+        def store_ety(task):
+            if self.word == word and not task.cancelled():
+                self.ety = task.result()
+
+        dictionary.add_done_callback(store_dictionary)
+        related.add_done_callback(store_related)
+        ety.add_done_callback(store_ety)
+        self.pending = {related, ety}
+
+        local_defs = local_dictionary.lookup(word) if local_dictionary else None
+
+        if local_defs:
+            # Local definitions render now; the online lookup only enriches
+            self.defs = local_defs[:10]
+            self.pending.add(dictionary)
+        else:
+            await dictionary
+            store_dictionary(dictionary)
+
+        self.index = 0
+        self.build_pages()
+
+    async def finish(self, timeout=None):
+        """Wait up to timeout for the remaining lookups and rebuild the pages"""
+        pending = self.pending
+        if pending:
+            _, still_pending = await asyncio.wait(pending, timeout=timeout)
+            # A newer generate() may have replaced the set while we waited
+            if self.pending is pending:
+                self.pending = still_pending
+        self.build_pages()
+
+    def finish_in_background(self, edit):
+        """Fill in the remaining pages, then re-render the page being shown"""
+        async def finish():
+            await self.finish()
+            with contextlib.suppress(discord.HTTPException):
+                await edit(embed=self.pages[self.index], view=self)
+
+        if self.pending and (self.finish_task is None or self.finish_task.done()):
+            self.finish_task = asyncio.ensure_future(finish())
+
+    @traced("render.word_pages")
+    def build_pages(self):
         self.pages = []
         self.page_types = []
 
@@ -747,7 +3154,7 @@ class WordView(View):
             embed = discord.Embed(
                 title=embed_word_str.capitalize(),
                 url=f"https://www.google.com/search?q=define+{embed_word_str}",
-                description=f"Pronunciation: {pron}",
+                description=f"Pronunciation: {self.pron}",
                 color=discord.Color.blue()
             )
             if len(content) > 1024:
@@ -755,42 +3162,151 @@ class WordView(View):
             embed.add_field(name=title, value=content or "N/A", inline=False)
             return embed
 
-        if defs:
-            self.pages.append(build_embed(word, "Definitions", "\n".join(f"• {d}" for d in defs)))
+        word = self.word
+        if self.defs:
+            self.pages.append(build_embed(word, "Definitions", "\n".join(f"• {d}" for d in self.defs)))
             self.page_types.append("Definitions")
-        if examples:
-            self.pages.append(build_embed(word, "Examples", "\n".join(f"• {e}" for e in examples)))
+        if self.examples:
+            self.pages.append(build_embed(word, "Examples", "\n".join(f"• {e}" for e in self.examples)))
             self.page_types.append("Examples")
-        if rel:
-            self.pages.append(build_embed(word, "Related Words", ", ".join(rel[:15])))
+        if self.related:
+            self.pages.append(build_embed(word, "Related Words", ", ".join(self.related[:15])))
             self.page_types.append("Related Words")
-        if ety:
-            self.pages.append(build_embed(word, "Etymology", ety))
+        if self.ety:
+            self.pages.append(build_embed(word, "Etymology", self.ety))
             self.page_types.append("Etymology")
 
-        self.index = 0
+        if not self.pages:
+            self.pages.append(build_embed(word, "Definitions", "Loading…" if self.pending else "No definitions found."))
+            self.page_types.append("Definitions")
+
+        self.index = min(self.index, len(self.pages) - 1)
+        total = f"{len(self.pages)}+" if self.pending else str(len(self.pages))
         for i, embed in enumerate(self.pages):
-            next_type = self.page_types[i + 1] if i + 1 < len(self.pages) else "End"
-            embed.set_footer(text=f"Page {i+1}/{len(self.pages)} | Next: {next_type}")
+            if i + 1 < len(self.pages):
+                next_type = self.page_types[i + 1]
+            else:
+                next_type = "Loading…" if self.pending else "End"
+            embed.set_footer(text=f"Page {i+1}/{total} | Next: {next_type}")
 
     @discord.ui.button(label="⬅ Prev", style=discord.ButtonStyle.secondary, custom_id="word_prev")
     async def prev(self, interaction: discord.Interaction, button: Button):
         if not self.pages:
             await self.generate()
+        await self.finish(timeout=1.5)
         self.index = (self.index - 1) % len(self.pages)
         await interaction.response.edit_message(embed=self.pages[self.index], view=self)
+        self.finish_in_background(interaction.edit_original_response)
 
     @discord.ui.button(label="🎲 Random Word", style=discord.ButtonStyle.primary, custom_id="word_random")
+    @admitted("word")
     async def new_word(self, interaction: discord.Interaction, button: Button):
+        # Acknowledge first, as respond_within does for /word: a fresh word
+        # can take longer than the 3s Discord allows before the first reply
+        await interaction.response.defer()
         await self.generate()
-        await interaction.response.edit_message(embed=self.pages[0], view=self)
+        await interaction.edit_original_response(embed=self.pages[0], view=self)
+        self.finish_in_background(interaction.edit_original_response)
 
     @discord.ui.button(label="➡ Next", style=discord.ButtonStyle.secondary, custom_id="word_next")
     async def next(self, interaction: discord.Interaction, button: Button):
         if not self.pages:
             await self.generate()
+        await self.finish(timeout=1.5)
         self.index = (self.index + 1) % len(self.pages)
         await interaction.response.edit_message(embed=self.pages[self.index], view=self)
+        self.finish_in_background(interaction.edit_original_response)
+
+# ---------------------------
+# Random Word Pool
+# ---------------------------
+
+class RateLimiter:
+    """Spaces calls evenly so at most per_minute start in any minute.
+
+    take() records a call, wait() sleeps until the next one would be
+    within the rate. Calls are recorded even when nobody waited, so a
+    burst pushes waiters back (by at most a minute).
+    """
+
+    def __init__(self, per_minute):
+        self.interval = 60 / max(per_minute, 1)
+        self.next_at = 0.0
+
+    def take(self):
+        now = time.monotonic()
+        self.next_at = min(max(now, self.next_at) + self.interval, now + 60)
+
+    async def wait(self):
+        while (delay := self.next_at - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+
+
+# Each worker gets its share of the provider rate limits
+provider_limiters = {
+    provider: RateLimiter(max(1, rate // WORKER_COUNT))
+    for provider, rate in WORD_PROVIDER_RATES.items()
+}
+
+
+class WordPool:
+    """Keeps fully generated words queued so /word rarely waits on the network"""
+
+    def __init__(self, size):
+        self.queue = asyncio.Queue(maxsize=max(size, 1))
+        self.enabled = size > 0
+        self.hits = 0
+        self.fallbacks = 0
+        self.task = None
+
+    def pop(self):
+        """Return a ready word entry, or None when the caller must generate one"""
+        try:
+            entry = self.queue.get_nowait()
+        except asyncio.QueueEmpty:
+            self.fallbacks += 1
+            if self.enabled and self.hits:
+                log.info(f"Word pool empty, generating on demand ({self.stats()})")
+            return None
+        self.hits += 1
+        return entry
+
+    def stats(self):
+        served = self.hits + self.fallbacks
+        return {
+            "depth": self.queue.qsize(),
+            "hits": self.hits,
+            "fallbacks": self.fallbacks,
+            "fallback_rate": self.fallbacks / served if served else 0.0
+        }
+
+    def start(self):
+        if self.enabled and (self.task is None or self.task.done()):
+            self.task = asyncio.ensure_future(self.run())
+
+    async def produce(self):
+        # The word's requests are charged as they go out; this only waits
+        # until every provider has room for another
+        for limiter in provider_limiters.values():
+            await limiter.wait()
+        view = WordView()
+        await view.generate_fresh()
+        await view.finish()
+        return view.snapshot()
+
+    async def run(self):
+        while True:
+            try:
+                entry = await self.produce()
+            except Exception as e:
+                log.warning(f"Word prefetch failed: {e}")
+                await asyncio.sleep(30)
+                continue
+            if entry["defs"]:
+                await self.queue.put(entry)
+
+
+word_pool = WordPool(WORD_POOL_SIZE)
 
 # ---------------------------
 # Timezone Modal
@@ -798,123 +3314,563 @@ class WordView(View):
 
 class TimezoneModal(Modal):
 
-    def __init__(self, user_id):
+    def __init__(self, user_id, guild_id):
         super().__init__(title="Set Your Timezone")
 
         self.user_id = user_id
+        self.guild_id = guild_id
 
         self.tz_input = TextInput(
             label="Enter your timezone or city",
             placeholder="America/New_York or New York",
+            default=timezone_store.get(guild_id, user_id),
             required=True
         )
 
-        self.add_item(self.tz_input)
+        self.add_item(self.tz_input)
+
+    async def on_submit(self, interaction: discord.Interaction):
+
+        zone = self.tz_input.value.strip()
+
+        if zone in available_timezones():
+            tz_name = zone
+        else:
+            matches = [z for z in available_timezones() if zone.lower() in z.lower()]
+            tz_name = matches[0] if matches else None
+
+        if not tz_name:
+            await interaction.response.send_message(
+                "Could not find a matching timezone.",
+                ephemeral=True
+            )
+            return
+
+        for guild_id in await set_user_timezone(self.guild_id, self.user_id, tz_name):
+            invalidate_board_renders(guild_id)
+
+        await interaction.response.send_message(
+            f"Timezone saved: **{tz_name}**",
+            ephemeral=True
+        )
+
+
+# ---------------------------
+# Timezone Embed Builder
+# ---------------------------
+
+TIMEZONE_GROUPS_PER_PAGE = 15
+TIMEZONE_PAGE_CHARS = 3800  # Discord caps embed descriptions at 4096
+TIMEZONE_LINE_CHARS = 1000
+
+zone_cache = {}
+
+
+def get_zone(tz_name):
+    """Return a cached ZoneInfo for tz_name, or None if it does not resolve"""
+    if tz_name not in zone_cache:
+        try:
+            zone_cache[tz_name] = ZoneInfo(tz_name)
+        except Exception:
+            zone_cache[tz_name] = None
+    return zone_cache[tz_name]
+
+
+def group_timezones(entries, now_utc):
+    """Group {user_id: tz} entries by current UTC offset.
+
+    Local time is computed once per distinct zone, so the cost scales with
+    the number of zones in use rather than the number of users.
+    """
+    users_by_zone = {}
+    for uid, tz in entries.items():
+        users_by_zone.setdefault(tz, []).append(uid)
+
+    groups = {}
+    for tz, uids in users_by_zone.items():
+        zone = get_zone(tz)
+        if zone is None:
+            offset, label = None, "Invalid TZ"
+        else:
+            local = now_utc.astimezone(zone)
+            offset = local.utcoffset()
+            label = local.strftime("%I:%M %p %a").lstrip("0")
+        group = groups.setdefault(offset, {"label": label, "user_ids": []})
+        group["user_ids"].extend(uids)
+
+    ordered = sorted(
+        groups.items(),
+        key=lambda item: (item[0] is None, item[0] or timedelta(0))
+    )
+    return [group for _, group in ordered]
+
+
+def format_timezone_line(label, names):
+    """Render one board line, trimming the name list to fit a single line budget"""
+    names = sorted(names, key=str.lower)
+    line = f"**{label}** — {', '.join(names)}"
+    if len(line) <= TIMEZONE_LINE_CHARS:
+        return line
+    shown = []
+    for name in names:
+        candidate = f"**{label}** — {', '.join(shown + [name])}"
+        if len(candidate) > TIMEZONE_LINE_CHARS - 20:
+            break
+        shown.append(name)
+    return f"**{label}** — {', '.join(shown)} and {len(names) - len(shown)} more"
+
+
+def paginate_timezone_lines(lines):
+    """Split board lines into pages bounded by group count and characters"""
+    pages, current, size = [], [], 0
+    for line in lines:
+        if current and (
+            len(current) >= TIMEZONE_GROUPS_PER_PAGE
+            or size + len(line) + 1 > TIMEZONE_PAGE_CHARS
+        ):
+            pages.append(current)
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        pages.append(current)
+    return pages
+
+
+def parse_board_page(embed):
+    """Return (page, total) from a board embed footer, 0-based page"""
+    footer = embed.footer.text if embed and embed.footer else None
+    match = re.search(r"Page (\d+)/(\d+)", footer or "")
+    if not match:
+        return 0, 1
+    return int(match.group(1)) - 1, int(match.group(2))
+
+
+class MemberNames:
+    """Display names for the user ids a board shows, without a member cache.
+
+    Unknown ids are fetched with batched gateway member queries. Names live
+    in a bounded LRU; once older than the TTL they are still served while a
+    background query refreshes them, so a board only waits on ids it has
+    never seen. Ids no longer in the guild are remembered as None.
+    """
+
+    BATCH = 100  # most user_ids one member request may carry
+
+    def __init__(self, ttl, size):
+        self.ttl = ttl
+        self.size = size
+        self.names = OrderedDict()
+        self.inflight = {}
+        self.refresh_tasks = {}
+
+    def store(self, guild_id, user_id, name):
+        self.names[(guild_id, user_id)] = (time.monotonic(), name)
+        self.names.move_to_end((guild_id, user_id))
+        while len(self.names) > self.size:
+            self.names.popitem(last=False)
+
+    async def resolve(self, guild, user_ids):
+        """Return {user_id: display_name} for the ids still in the guild"""
+        now = time.monotonic()
+        found, missing, stale = {}, [], []
+
+        for user_id in user_ids:
+            entry = self.names.get((guild.id, user_id))
+            if entry is None:
+                missing.append(user_id)
+                continue
+            self.names.move_to_end((guild.id, user_id))
+            fetched_at, name = entry
+            if name:
+                found[user_id] = name
+            if now - fetched_at > self.ttl:
+                stale.append(user_id)
+
+        if missing:
+            found.update(await self.query_once(guild, missing))
+        if stale:
+            self.refresh_in_background(guild, stale)
+
+        return found
+
+    async def query_once(self, guild, user_ids):
+        """Query ids not already being fetched and share in-flight queries for the rest"""
+        tasks = {self.inflight[(guild.id, user_id)] for user_id in user_ids if (guild.id, user_id) in self.inflight}
+        new_ids = [user_id for user_id in user_ids if (guild.id, user_id) not in self.inflight]
+
+        if new_ids:
+            task = asyncio.ensure_future(self.query(guild, new_ids))
+            for user_id in new_ids:
+                self.inflight[(guild.id, user_id)] = task
+
+            def done(_):
+                for user_id in new_ids:
+                    if self.inflight.get((guild.id, user_id)) is task:
+                        del self.inflight[(guild.id, user_id)]
+
+            task.add_done_callback(done)
+            tasks.add(task)
+
+        names = {}
+        for batch_names in await asyncio.gather(*tasks):
+            names.update(batch_names)
+        return {user_id: names[user_id] for user_id in user_ids if user_id in names}
+
+    async def query(self, guild, user_ids):
+        batches = [user_ids[i:i + self.BATCH] for i in range(0, len(user_ids), self.BATCH)]
+        results = await asyncio.gather(
+            *(self.query_batch(guild, batch) for batch in batches)
+        )
+        names = {}
+        for batch_names in results:
+            names.update(batch_names)
+        return names
+
+    async def query_batch(self, guild, user_ids):
+        with span("discord.query_members", count=len(user_ids)):
+            try:
+                members = await guild.query_members(user_ids=user_ids, limit=len(user_ids), cache=False)
+            except asyncio.TimeoutError:
+                # Nothing stored, so these ids are retried on the next render
+                log.warning(f"Member query timed out for {len(user_ids)} users in guild {guild.id}")
+                return {}
+            except (discord.ClientException, discord.HTTPException) as e:
+                # e.g. the shard's websocket isn't up yet; retried on the next render too
+                log.warning(f"Member query failed for {len(user_ids)} users in guild {guild.id}: {e}")
+                return {}
+
+        names = {member.id: member.display_name for member in members}
+        for user_id in user_ids:
+            self.store(guild.id, user_id, names.get(user_id))
+        return names
+
+    def refresh_in_background(self, guild, user_ids):
+        task = self.refresh_tasks.get(guild.id)
+        if task is None or task.done():
+            self.refresh_tasks[guild.id] = asyncio.ensure_future(self.query(guild, user_ids))
+
+
+member_names = MemberNames(MEMBER_NAME_TTL, MEMBER_NAME_CACHE_SIZE)
+
+
+async def member_display_names(guild, user_ids):
+    """Map user ids to display names using whichever member cache mode is on"""
+    if MEMBER_CACHE == "lazy":
+        return await member_names.resolve(guild, user_ids)
+    names = {}
+    for user_id in user_ids:
+        member = guild.get_member(user_id)
+        if member:
+            names[user_id] = member.display_name
+    return names
+
+
+@traced("render.time_board")
+async def build_timezone_embed(viewer, guild, page=0):
+
+    now = datetime.now(timezone.utc)
+    unix_ts = int(now.timestamp())
+
+    embed = discord.Embed(
+        title="Server Times",
+        description=f"Last refreshed: <t:{unix_ts}:f>",
+        color=discord.Color.dark_purple()
+    )
+
+    entries = get_guild_timezones(guild.id)
+
+    if not entries:
+        embed.description += "\n\nNo timezones saved yet."
+        return embed
+
+    display_names = await member_display_names(guild, [int(uid) for uid in entries])
+
+    lines = []
+    for group in group_timezones(entries, now):
+        names = [
+            display_names[int(uid)]
+            for uid in group["user_ids"]
+            if int(uid) in display_names
+        ]
+        if names:
+            lines.append(format_timezone_line(group["label"], names))
+
+    if not lines:
+        embed.description += "\n\nNo timezones saved yet."
+        return embed
+
+    pages = paginate_timezone_lines(lines)
+    page = max(0, min(page, len(pages) - 1))
+
+    embed.description += "\n\n" + "\n".join(pages[page])
+
+    if len(pages) > 1:
+        embed.set_footer(text=f"Page {page+1}/{len(pages)}")
+
+    return embed
+
+
+# ---------------------------
+# Timezone Buttons
+# ---------------------------
+
+class TimezoneView(TracedView):
+
+    def __init__(self, paged=True):
+        super().__init__(timeout=None)
+
+        if not paged:
+            self.remove_item(self.prev_page)
+            self.remove_item(self.next_page)
+
+    @classmethod
+    def for_embed(cls, embed):
+        _, total = parse_board_page(embed)
+        return cls(paged=total > 1)
+
+    async def show_page(self, interaction, step):
+
+        current = interaction.message.embeds[0] if interaction.message and interaction.message.embeds else None
+        page, total = parse_board_page(current)
+
+        # Refresh clicks right after a render have nothing new to show
+        rendered_at = board_rendered_at(current)
+        if step == 0 and rendered_at and time.time() - rendered_at < BOARD_REFRESH_DEBOUNCE:
+            await interaction.response.defer()
+            return
+
+        page = (page + step) % total if step else page
+        embed = await render_timezone_board(interaction.guild, page)
+
+        if interaction.message and interaction.message.channel.id in live_boards:
+            board = live_boards[interaction.message.channel.id]
+            if board["message_id"] == interaction.message.id and board["page"] != page:
+                board["page"] = page
+                await live_board_store.save(interaction.message.channel.id, board)
+
+        if step == 0 and current and current.description == embed.description:
+            await interaction.response.defer()
+            return
+
+        await interaction.response.edit_message(
+            embed=embed,
+            view=TimezoneView.for_embed(embed)
+        )
+
+    @discord.ui.button(
+        label="Set Your Timezone",
+        style=discord.ButtonStyle.primary,
+        custom_id="timezone_set"
+    )
+    async def set_timezone(self, interaction: discord.Interaction, button: Button):
+
+        modal = TimezoneModal(interaction.user.id, interaction.guild_id)
+
+        await interaction.response.send_modal(modal)
+
+    @discord.ui.button(
+        label="Refresh Times",
+        style=discord.ButtonStyle.secondary,
+        custom_id="timezone_refresh"
+    )
+    async def refresh(self, interaction: discord.Interaction, button: Button):
+
+        await self.show_page(interaction, 0)
+
+    @discord.ui.button(
+        label="⬅ Prev",
+        style=discord.ButtonStyle.secondary,
+        custom_id="timezone_prev"
+    )
+    async def prev_page(self, interaction: discord.Interaction, button: Button):
+
+        await self.show_page(interaction, -1)
+
+    @discord.ui.button(
+        label="Next ➡",
+        style=discord.ButtonStyle.secondary,
+        custom_id="timezone_next"
+    )
+    async def next_page(self, interaction: discord.Interaction, button: Button):
+
+        await self.show_page(interaction, 1)
+
+
+# ---------------------------
+# Live Time Boards
+# ---------------------------
+
+class LiveBoardStore:
+    """Live board rows in SESSION_DB, restored into live_boards on startup"""
+
+    def __init__(self, path):
+        self.db = open_sqlite(path)
+        self.db.execute(
+            """CREATE TABLE IF NOT EXISTS live_boards (
+                channel_id INTEGER PRIMARY KEY,
+                guild_id INTEGER NOT NULL,
+                message_id INTEGER NOT NULL,
+                page INTEGER NOT NULL
+            )"""
+        )
+
+    def load(self):
+        """Return {channel_id: board} for the guilds this worker's shards own"""
+        rows = self.db.execute("SELECT channel_id, guild_id, message_id, page FROM live_boards").fetchall()
+        return {
+            channel_id: {"guild_id": guild_id, "message_id": message_id, "page": page}
+            for channel_id, guild_id, message_id, page in rows
+            if not SHARD_IDS or (guild_id >> 22) % SHARD_COUNT in SHARD_IDS
+        }
+
+    async def save(self, channel_id, board):
+        await sqlite_write(
+            self.db.execute,
+            """INSERT INTO live_boards (channel_id, guild_id, message_id, page)
+               VALUES (?, ?, ?, ?)
+               ON CONFLICT (channel_id) DO UPDATE SET
+                   guild_id = excluded.guild_id,
+                   message_id = excluded.message_id,
+                   page = excluded.page""",
+            (channel_id, board["guild_id"], board["message_id"], board["page"])
+        )
+
+    async def delete(self, channel_id):
+        await sqlite_write(self.db.execute, "DELETE FROM live_boards WHERE channel_id = ?", (channel_id,))
+
+
+live_board_store = LiveBoardStore(SESSION_DB)
+
+# channel_id -> {"guild_id", "message_id", "page"}, least recently edited first
+live_boards = OrderedDict()
+live_board_task = None
+
+# (guild_id, page) -> shared render task for the current minute
+board_renders = {}
+board_renders_window = None
+
+# (guild_id, page) -> last completed render, served when a render runs late
+board_last_renders = {}
+
+
+def board_rendered_at(embed):
+    """Return the unix timestamp a board embed was rendered at, if any"""
+    match = re.search(r"<t:(\d+):f>", embed.description or "") if embed else None
+    return int(match.group(1)) if match else None
+
+
+async def render_timezone_board(guild, page=0):
+    """Render a board page, sharing one render per guild/page per minute"""
+
+    global board_renders_window
+
+    window = int(time.time() // 60)
+    if window != board_renders_window:
+        board_renders.clear()
+        board_renders_window = window
+
+    key = (guild.id, page)
+    task = board_renders.get(key)
+    if task is None:
+        task = asyncio.ensure_future(build_timezone_embed(None, guild, page=page))
+        board_renders[key] = task
+
+    try:
+        embed = await asyncio.shield(task)
+    except Exception:
+        board_renders.pop(key, None)
+        raise
+
+    board_last_renders[key] = embed
+    return embed
+
 
-    async def on_submit(self, interaction: discord.Interaction):
+def invalidate_board_renders(guild_id):
+    """Drop a guild's shared renders so the next refresh picks up timezone changes"""
+    for key in [key for key in board_renders if str(key[0]) == str(guild_id)]:
+        del board_renders[key]
 
-        global timezone_dirty
 
-        zone = self.tz_input.value.strip()
+async def start_live_board(channel, guild):
+    """Post a live board in channel, replacing any previous one there"""
 
-        if zone in available_timezones():
-            tz_name = zone
-        else:
-            matches = [z for z in available_timezones() if zone.lower() in z.lower()]
-            tz_name = matches[0] if matches else None
+    embed = await render_timezone_board(guild)
 
-        if not tz_name:
-            await interaction.response.send_message(
-                "Could not find a matching timezone.",
-                ephemeral=True
-            )
-            return
+    message = await channel.send(
+        embed=embed,
+        view=TimezoneView.for_embed(embed)
+    )
 
-        timezones[str(self.user_id)] = tz_name
+    live_boards.pop(channel.id, None)
+    live_boards[channel.id] = {
+        "guild_id": guild.id,
+        "message_id": message.id,
+        "page": 0
+    }
+    await live_board_store.save(channel.id, live_boards[channel.id])
 
-        timezone_dirty = True
+    ensure_live_board_task()
 
-        await interaction.response.send_message(
-            f"Timezone saved: **{tz_name}**",
-            ephemeral=True
-        )
 
+async def stop_live_board(channel_id):
+    stopped = live_boards.pop(channel_id, None) is not None
+    await live_board_store.delete(channel_id)
+    return stopped
 
-# ---------------------------
-# Timezone Embed Builder
-# ---------------------------
 
-async def build_timezone_embed(viewer, guild):
+def restore_live_boards():
+    """Pick up the boards that were running before a restart"""
+    live_boards.update(live_board_store.load())
+    if live_boards:
+        log.info(f"Restored {len(live_boards)} live time boards")
+        ensure_live_board_task()
 
-    now = datetime.now().astimezone()
-    unix_ts = int(now.timestamp())
 
-    embed = discord.Embed(
-        title="Server Times",
-        description=f"Last refreshed: <t:{unix_ts}:f>",
-        color=discord.Color.dark_purple()
-    )
+def ensure_live_board_task():
 
-    if not timezones:
-        embed.description += "\n\nNo timezones saved yet."
-        return embed
+    global live_board_task
 
-    for uid, tz in timezones.items():
-        member = guild.get_member(int(uid))
-        if not member:
-            continue
+    if live_board_task is None or live_board_task.done():
+        live_board_task = bot.loop.create_task(live_board_loop())
 
-        try:
-            t = datetime.now(ZoneInfo(tz))
-            display = t.strftime("%A %I:%M %p")
-        except:
-            display = "Invalid TZ"
-
-        embed.add_field(
-            name=member.display_name,
-            value=f"{display}",  # Removed raw tz display
-            inline=True
-        )
 
-    return embed
+async def update_live_boards():
+    """Edit up to LIVE_BOARD_MAX_EDITS_PER_MINUTE boards, stalest first"""
 
+    for channel_id in list(live_boards)[:LIVE_BOARD_MAX_EDITS_PER_MINUTE]:
 
-# ---------------------------
-# Timezone Buttons
-# ---------------------------
+        board = live_boards.get(channel_id)
+        guild = bot.get_guild(board["guild_id"]) if board else None
+        if not guild:
+            # The bot left the guild, possibly while it was offline
+            await stop_live_board(channel_id)
+            continue
 
-class TimezoneView(View):
+        embed = await render_timezone_board(guild, board["page"])
+        message = bot.get_partial_messageable(channel_id).get_partial_message(board["message_id"])
 
-    def __init__(self):
-        super().__init__(timeout=None)
+        try:
+            await message.edit(embed=embed, view=TimezoneView.for_embed(embed))
+        except (discord.NotFound, discord.Forbidden):
+            await stop_live_board(channel_id)
+            continue
+        except discord.HTTPException as e:
+            log.warning(f"Live board edit failed: {e}")
 
-    @discord.ui.button(
-        label="Set Your Timezone",
-        style=discord.ButtonStyle.primary,
-        custom_id="timezone_set"
-    )
-    async def set_timezone(self, interaction: discord.Interaction, button: Button):
+        live_boards.move_to_end(channel_id)
 
-        modal = TimezoneModal(interaction.user.id)
 
-        await interaction.response.send_modal(modal)
+async def live_board_loop():
 
-    @discord.ui.button(
-        label="Refresh Times",
-        style=discord.ButtonStyle.secondary,
-        custom_id="timezone_refresh"
-    )
-    async def refresh(self, interaction: discord.Interaction, button: Button):
+    await bot.wait_until_ready()
 
-        embed = await build_timezone_embed(
-            interaction.user,
-            interaction.guild
-        )
+    while not bot.is_closed() and live_boards:
 
-        await interaction.response.edit_message(
-            embed=embed,
-            view=self
-        )
+        # Wake just after the next minute boundary
+        await asyncio.sleep(60 - time.time() % 60 + 0.5)
+
+        await update_live_boards()
 
 
 # ---------------------------
@@ -931,22 +3887,36 @@ async def prefix_time(ctx):
 
     await ctx.send(
         embed=embed,
-        view=TimezoneView()
+        view=TimezoneView.for_embed(embed)
     )
 
 
+@bot.command(name="timeboard")
+async def prefix_timeboard(ctx, action: str = "start"):
+
+    if action.lower() == "stop":
+        stopped = await stop_live_board(ctx.channel.id)
+        await ctx.send("Live time board stopped." if stopped else "No live time board in this channel.")
+        return
+
+    await start_live_board(ctx.channel, ctx.guild)
+
+
 @bot.command(name="word")
+@admitted("word")
 async def prefix_word(ctx):
 
     view = WordView()
 
     await view.generate()
 
-    await ctx.send(
+    message = await ctx.send(
         embed=view.pages[0],
         view=view
     )
 
+    view.finish_in_background(message.edit)
+
 
 @bot.command(name="quote")
 async def prefix_quote(ctx):
@@ -964,6 +3934,7 @@ async def prefix_quote(ctx):
 @bot.command(name="weird")
 async def prefix_weird(ctx):
 
+    await WEIRD_LAWS.preload()
     laws = list(WEIRD_LAWS.values())
 
     if not laws:
@@ -979,6 +3950,7 @@ async def prefix_weird(ctx):
 
 
 @bot.command(name="sl")
+@admitted(songlink_class)
 async def prefix_songlink(ctx, *, query: str):
 
     # Check if it's a playlist
@@ -1011,33 +3983,16 @@ async def prefix_songlink(ctx, *, query: str):
             return
         
         # Create session
-        session_id = create_playlist_session(tracks, playlist_platform, playlist_title, thumbnail)
+        session_id = await create_playlist_session(tracks, playlist_platform, playlist_title, thumbnail)
         
         # Send messages with dropdowns (25 tracks per message)
-        chunk_size = 25
-        num_chunks = (len(tracks) + chunk_size - 1) // chunk_size
-        
-        for chunk_idx in range(num_chunks):
-            start_idx = chunk_idx * chunk_size
-            end_idx = min(start_idx + chunk_size, len(tracks))
-            chunk = tracks[start_idx:end_idx]
-            
-            # Create embed
-            embed = create_playlist_embed(
-                playlist_title,
-                playlist_platform,
-                len(tracks),
-                chunk,
-                thumbnail
-            )
-            
-            if num_chunks > 1:
-                embed.description += f"\n\n**Dropdown {chunk_idx + 1}/{num_chunks}** (showing tracks {start_idx + 1}-{end_idx})"
-            
-            # Create view with dropdown
-            view = PlaylistView(session_id, chunk_idx, chunk, playlist_title, playlist_platform)
-            
-            await ctx.send(embed=embed, view=view)
+        messages = await offload(
+            render_playlist_messages, session_id, tracks, playlist_title, playlist_platform, thumbnail,
+            size=len(tracks), threshold=OFFLOAD_MIN_ITEMS, kind="thread"
+        )
+
+        for embed, picker in messages:
+            await ctx.send(embed=embed, view=PlaylistView(picker))
     else:
         # Single song logic
         song_data = await fetch_song_links(query, ctx)
@@ -1062,6 +4017,12 @@ async def prefix_ecm(ctx):
         inline=False
     )
 
+    embed.add_field(
+        name="!timeboard [stop]",
+        value="Time board that updates every minute",
+        inline=False
+    )
+
     embed.add_field(
         name="!word",
         value="Random word",
@@ -1096,26 +4057,143 @@ async def prefix_ecm(ctx):
 
 @bot.command(name="affirm")
 async def prefix_affirm(ctx, category: str = None):
-    selected = category.lower().replace(" ", "_") if category and category.lower().replace(" ", "_") in CATEGORIES else None
+    await affirmations.preload()
+    selected = category.lower().replace(" ", "_") if category and category.lower().replace(" ", "_") in affirmations else None
     view = AffirmationView(category=selected)
     await ctx.send(embed=view.get_embed(), view=view)
 
+
+@bot.command(name="memory", hidden=True)
+@commands.is_owner()
+async def prefix_memory(ctx, action: str = "report"):
+    """Owner only: !memory [report|start|stop|snapshot|diff]"""
+
+    action = action.lower()
+
+    try:
+        if action == "start":
+            memory_profiler.start()
+            lines = ["tracemalloc started"]
+        elif action == "stop":
+            memory_profiler.stop()
+            lines = ["tracemalloc stopped"]
+        elif action == "snapshot":
+            lines = ["Baseline recorded, largest allocation sites:"] + await memory_profiler.snapshot()
+        elif action == "diff":
+            lines = ["Growth since baseline:"] + await memory_profiler.diff()
+        else:
+            report = memory_report()
+            rss = report["rss_bytes"]
+            lines = [f"RSS: {rss / 1048576:.1f} MiB" if rss else "RSS: unavailable"]
+            for name, entry in report["subsystems"].items():
+                if entry == "unavailable":
+                    lines.append(f"{name:<18} unavailable")
+                    continue
+                size = entry.get("bytes", entry.get("mapped_bytes", 0))
+                lines.append(f"{name:<18} {entry['items']:>7} items {size / 1024:>10.1f} KiB")
+            lines.append(f"tracemalloc: {report['tracemalloc']}")
+    except RuntimeError as e:
+        lines = [str(e)]
+
+    text = "\n".join(lines)[:1900]
+    await ctx.send(f"```\n{text}\n```")
+
+# ---------------------------
+# Response Pipeline
+# ---------------------------
+
+async def respond_within(interaction, command, work, fallback, after=None):
+    """Answer a slash command within its latency budget.
+
+    work() returns the message kwargs for the real answer. If the budget
+    runs out (or work fails), fallback() answers instead with a cached or
+    partial result, and the real answer replaces it when it arrives.
+    after() runs once the real answer is on screen.
+
+    Returns the task that replaces the fallback, or None if there is
+    nothing left to do; callers holding resources for the work should
+    await it before letting go.
+    """
+    budget = COMMAND_BUDGETS[command]
+
+    deferred = budget >= INTERACTION_ACK_AFTER
+    if deferred:
+        await interaction.response.defer()
+
+    task = asyncio.ensure_future(work())
+    await asyncio.wait({task}, timeout=budget)
+
+    on_time = task.done() and task.exception() is None
+    if on_time:
+        payload = task.result()
+    else:
+        command_budget_misses.labels(command).inc()
+        if task.done():
+            log.warning(f"/{command} failed, answering with fallback", exc_info=task.exception())
+        payload = fallback()
+
+    if deferred:
+        await interaction.edit_original_response(**payload)
+    else:
+        await interaction.response.send_message(**payload)
+
+    if on_time:
+        if after:
+            after()
+        return None
+
+    async def replace_fallback():
+        try:
+            payload = await task
+        except Exception:
+            return
+        with contextlib.suppress(discord.HTTPException):
+            await interaction.edit_original_response(**payload)
+        if after:
+            after()
+
+    if task.done():
+        return None
+    return asyncio.ensure_future(replace_fallback())
+
+
+def placeholder_embed(title, color):
+    return discord.Embed(
+        title=title,
+        description="Still waiting on an upstream service, this message will update shortly.",
+        color=color
+    )
+
 # ---------------------------
 # Slash Commands
 # ---------------------------
 
 @tree.command(name="word", description="Random word")
+@admitted("word")
 async def slash_word(interaction: discord.Interaction):
 
     view = WordView()
 
-    await view.generate()
+    async def work():
+        await view.generate()
+        return {"embed": view.pages[0], "view": view}
 
-    await interaction.response.send_message(
-        embed=view.pages[0],
-        view=view
+    def fallback():
+        # Show the word with whatever definitions have arrived so far
+        if not view.word:
+            return {"embed": placeholder_embed("Finding a word…", discord.Color.blue())}
+        view.build_pages()
+        return {"embed": view.pages[0], "view": view}
+
+    replacement = await respond_within(
+        interaction, "word", work, fallback,
+        after=lambda: view.finish_in_background(interaction.edit_original_response)
     )
 
+    # The lookups still count against the admission slot until they land
+    if replacement:
+        await replacement
+
 
 @tree.command(
     name="quote",
@@ -1125,12 +4203,18 @@ async def slash_quote(interaction: discord.Interaction):
 
     view = ZenQuoteView()
 
-    await view.fetch_new_quote()
+    async def work():
+        await view.fetch_new_quote()
+        return {"embed": view.create_embed(), "view": view}
 
-    await interaction.response.send_message(
-        embed=view.create_embed(),
-        view=view
-    )
+    def fallback():
+        # A recently shown quote beats no answer
+        if not quote_provider.recent:
+            return {"embed": placeholder_embed("Fetching a quote…", discord.Color.purple())}
+        view.quote_text, view.author = random.choice(quote_provider.recent)
+        return {"embed": view.create_embed(), "view": view}
+
+    await respond_within(interaction, "quote", work, fallback)
 
 
 @tree.command(
@@ -1139,6 +4223,7 @@ async def slash_quote(interaction: discord.Interaction):
 )
 async def slash_weird(interaction: discord.Interaction):
 
+    await WEIRD_LAWS.preload()
     laws = list(WEIRD_LAWS.values())
 
     view = WeirdLawView(laws)
@@ -1153,6 +4238,7 @@ async def slash_weird(interaction: discord.Interaction):
     name="sl",
     description="Song links + Genius or playlist"
 )
+@admitted(songlink_class)
 async def slash_songlink(interaction: discord.Interaction, query: str):
 
     # Check if it's a playlist
@@ -1185,33 +4271,16 @@ async def slash_songlink(interaction: discord.Interaction, query: str):
             return
         
         # Create session
-        session_id = create_playlist_session(tracks, playlist_platform, playlist_title, thumbnail)
+        session_id = await create_playlist_session(tracks, playlist_platform, playlist_title, thumbnail)
         
         # Send messages with dropdowns (25 tracks per message)
-        chunk_size = 25
-        num_chunks = (len(tracks) + chunk_size - 1) // chunk_size
-        
-        for chunk_idx in range(num_chunks):
-            start_idx = chunk_idx * chunk_size
-            end_idx = min(start_idx + chunk_size, len(tracks))
-            chunk = tracks[start_idx:end_idx]
-            
-            # Create embed
-            embed = create_playlist_embed(
-                playlist_title,
-                playlist_platform,
-                len(tracks),
-                chunk,
-                thumbnail
-            )
-            
-            if num_chunks > 1:
-                embed.description += f"\n\n**Dropdown {chunk_idx + 1}/{num_chunks}** (showing tracks {start_idx + 1}-{end_idx})"
-            
-            # Create view with dropdown
-            view = PlaylistView(session_id, chunk_idx, chunk, playlist_title, playlist_platform)
-            
-            await interaction.followup.send(embed=embed, view=view)
+        messages = await offload(
+            render_playlist_messages, session_id, tracks, playlist_title, playlist_platform, thumbnail,
+            size=len(tracks), threshold=OFFLOAD_MIN_ITEMS, kind="thread"
+        )
+
+        for embed, picker in messages:
+            await interaction.followup.send(embed=embed, view=PlaylistView(picker))
     else:
         # Single song logic
         await interaction.response.defer()
@@ -1230,15 +4299,39 @@ async def slash_songlink(interaction: discord.Interaction, query: str):
 )
 async def slash_time(interaction: discord.Interaction):
 
-    embed = await build_timezone_embed(
-        interaction.user,
-        interaction.guild
-    )
+    guild = interaction.guild
 
-    await interaction.response.send_message(
-        embed=embed,
-        view=TimezoneView()
-    )
+    async def work():
+        embed = await render_timezone_board(guild)
+        return {"embed": embed, "view": TimezoneView.for_embed(embed)}
+
+    def fallback():
+        # The previous render is at most a few minutes stale
+        embed = board_last_renders.get((guild.id, 0))
+        if embed is None:
+            return {"embed": placeholder_embed("Server Times", discord.Color.dark_purple())}
+        return {"embed": embed, "view": TimezoneView.for_embed(embed)}
+
+    await respond_within(interaction, "time", work, fallback)
+
+
+@tree.command(
+    name="timeboard",
+    description="Post a time board that updates every minute"
+)
+async def slash_timeboard(interaction: discord.Interaction, stop: bool = False):
+
+    if stop:
+        stopped = await stop_live_board(interaction.channel_id)
+        await interaction.response.send_message(
+            "Live time board stopped." if stopped else "No live time board in this channel.",
+            ephemeral=True
+        )
+        return
+
+    await interaction.response.send_message("Starting live time board...", ephemeral=True)
+
+    await start_live_board(interaction.channel, interaction.guild)
 
 
 @tree.command(
@@ -1246,7 +4339,8 @@ async def slash_time(interaction: discord.Interaction):
     description="A reminder if ever needed"
 )
 async def slash_affirm(interaction: discord.Interaction, category: str = None):
-    selected = category.lower().replace(" ", "_") if category and category.lower().replace(" ", "_") in CATEGORIES else None
+    await affirmations.preload()
+    selected = category.lower().replace(" ", "_") if category and category.lower().replace(" ", "_") in affirmations else None
     view = AffirmationView(category=selected)
     await interaction.response.send_message(
         embed=view.get_embed(),
@@ -1264,6 +4358,7 @@ async def slash_ecm(interaction: discord.Interaction):
         color=discord.Color.red()
     )
     embed.add_field(name="/time", value="Interactive server timezone viewer", inline=False)
+    embed.add_field(name="/timeboard [stop]", value="Time board that updates every minute", inline=False)
     embed.add_field(name="/word", value="Random word", inline=False)
     embed.add_field(name="/quote", value="Random quote", inline=False)
     embed.add_field(name="/weird", value="Random weird law", inline=False)
@@ -1274,51 +4369,561 @@ async def slash_ecm(interaction: discord.Interaction):
 
 
 # ---------------------------
-# Bot Ready Event
+# Startup and Ready Events
 # ---------------------------
 
-@bot.event
-async def on_ready():
+def command_tree_hash():
+    """Stable hash of everything tree.sync() would upload"""
+    payload = sorted(
+        (command.to_dict(tree) for command in tree.get_commands()),
+        key=lambda command: (command.get("type", 1), command["name"])
+    )
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
 
-    global timezones
 
-    print(f"Logged in as {bot.user}")
+async def sync_commands_if_changed():
+    """Call tree.sync() only when the command tree differs from the last sync"""
+    digest = f"{bot.application_id}:{command_tree_hash()}"
 
-    timezones = await load_timezones_from_github()
+    try:
+        with open(COMMAND_HASH_FILE, "r", encoding="utf-8") as f:
+            if f.read().strip() == digest:
+                log.info("Command tree unchanged, skipping sync")
+                return
+    except OSError:
+        pass
+
+    try:
+        await tree.sync()
+    except discord.HTTPException as e:
+        log.error(f"Command sync failed: {e}")
+        return
+
+    with open(COMMAND_HASH_FILE, "w", encoding="utf-8") as f:
+        f.write(digest)
+    log.info("Commands synced")
+
+
+async def load_timezones():
+    timezones.update(await timezone_store.load())
+    index_timezones()
+    log.info("Timezone database loaded")
+
+
+async def load_datasets():
+    """Parse the bundled datasets off the loop"""
+    await asyncio.gather(WEIRD_LAWS.preload(), affirmations.preload())
+    startup_timer.mark("datasets")
+
+
+async def report_first_heartbeat():
+    """bot.latency stays infinite until the first heartbeat is acknowledged"""
+    while not math.isfinite(bot.latency):
+        await asyncio.sleep(0.1)
+    startup_timer.mark("first_heartbeat")
+    startup_timer.report()
+
+
+dataset_task = None
+
+
+@bot.event
+async def setup_hook():
+    """One-time startup, run after login and before the gateway connects.
 
-    print("Timezone database loaded")
+    on_ready fires again on every reconnect, so nothing here belongs there.
+    """
+    global dataset_task
 
-    bot.loop.create_task(timezone_sync_loop())
+    startup_timer.mark("login")
 
     bot.add_view(TimezoneView())
     bot.add_view(WordView())
     bot.add_view(ZenQuoteView())
-    bot.add_view(WeirdLawView(list(WEIRD_LAWS.values())))
+    # Their callbacks await the datasets, which load alongside the gateway
+    bot.add_view(WeirdLawView())
     bot.add_view(AffirmationView())
+    bot.add_dynamic_items(PlaylistTrackPicker, AffirmationCategoryButton)
+
+    # The datasets aren't needed to connect
+    dataset_task = asyncio.ensure_future(load_datasets())
+
+    # Commands are global, so only one worker of a sharded deployment syncs
+    await asyncio.gather(
+        load_timezones(),
+        sync_commands_if_changed() if WORKER_INDEX == 0 else asyncio.sleep(0)
+    )
+
+    restore_live_boards()
+
+    # Each of these is a no-op while its task is still running
+    timezone_store.start()
+    word_pool.start()
+    quote_provider.request_refill()
+
+    startup_timer.mark("setup_hook")
+
+
+@bot.event
+async def on_ready():
+
+    log.info(f"Logged in as {bot.user}")
+
+    if "ready" not in startup_timer.phases:
+        startup_timer.mark("ready")
+        asyncio.ensure_future(report_first_heartbeat())
+
+# ---------------------------
+# Event Loop Watchdog
+# ---------------------------
+
+class LoopWatchdog:
+    """Measures event loop lag and reports whatever is blocking the loop.
+
+    A ticker on the loop records how late each wake-up is. A sampling
+    thread watches the ticker; if it stops ticking for longer than the
+    stall threshold, the thread grabs the loop thread's current stack,
+    which is the callback hogging the loop.
+    """
+
+    def __init__(self, interval, threshold, window=1200):
+        self.interval = interval
+        self.threshold = threshold
+        self.samples = deque(maxlen=window)
+        self.last_tick = time.monotonic()
+        self.loop = None
+        self.loop_thread_id = None
+        self.task = None
+        self.thread = None
+        self.stopped = threading.Event()
+
+    def start(self):
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread_id = threading.get_ident()
+        self.last_tick = time.monotonic()
+        self.task = asyncio.ensure_future(self.tick())
+        self.thread = threading.Thread(target=self.watch, name="loop-watchdog", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        if self.task:
+            self.task.cancel()
+
+    async def tick(self):
+
+        global loop_lag
+
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            loop_lag = max(0.0, now - expected)
+            self.samples.append(loop_lag)
+            loop_lag_seconds.labels().observe(loop_lag)
+            self.last_tick = now
+
+    def watch(self):
+        reported = None
+        while not self.stopped.wait(self.threshold / 4):
+            tick = self.last_tick
+            stalled_for = time.monotonic() - tick - self.interval
+            if stalled_for < self.threshold or tick == reported:
+                continue
+            reported = tick
+            # Metrics are only touched on the loop; this lands once the stall ends
+            with contextlib.suppress(RuntimeError):  # loop already closed
+                self.loop.call_soon_threadsafe(lambda: loop_stalls.labels().inc())
+            frame = sys._current_frames().get(self.loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else "unavailable"
+            log.warning(f"Event loop blocked for {stalled_for:.2f}s, loop thread stack:\n{stack}")
+
+    def quantiles(self):
+        if not self.samples:
+            return []
+        ordered = sorted(self.samples)
+        return [
+            ((str(q),), ordered[min(int(q * len(ordered)), len(ordered) - 1)])
+            for q in (0.5, 0.9, 0.99)
+        ]
+
+
+loop_watchdog = LoopWatchdog(LOOP_LAG_INTERVAL, LOOP_STALL_THRESHOLD)
+
+# ---------------------------
+# Memory Accounting
+# ---------------------------
+
+SIZEOF_CONTAINERS = (list, tuple, set, frozenset, deque)
+SIZEOF_FOLLOW_MODULES = ("discord.ui", "discord.embeds", __name__)
+
+
+def deep_sizeof(*roots):
+    """Approximate bytes reachable from roots.
+
+    Follows containers and objects from this module, discord.ui and
+    discord.embeds. Anything else (guilds, clients, loops, sessions) is
+    counted shallowly so one stray reference can't pull in the world.
+    """
+    seen = set()
+    stack = list(roots)
+    total = 0
+
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj, 0)
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, SIZEOF_CONTAINERS):
+            stack.extend(obj)
+        elif type(obj).__module__.startswith(SIZEOF_FOLLOW_MODULES):
+            attrs = getattr(obj, "__dict__", None)
+            if attrs is not None:
+                stack.append(attrs)
+            for cls in type(obj).__mro__:
+                slots = cls.__dict__.get("__slots__", ())
+                for name in (slots,) if isinstance(slots, str) else slots:
+                    value = getattr(obj, name, None)
+                    if value is not None:
+                        stack.append(value)
+
+    return total
+
+
+def process_rss():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
 
-    await tree.sync()
 
-    print("Commands synced")
+def view_store_usage():
+    """Return (roots, live view count) for discord.py's view store, or None.
+
+    The store is discord.py internals (laid out as of 2.5); if they move,
+    the report says so instead of failing.
+    """
+    store = getattr(getattr(bot, "_connection", None), "_view_store", None)
+    roots = tuple(getattr(store, name, None) for name in ("_views", "_synced_message_views", "_modals"))
+    if None in roots:
+        return None
+
+    views, synced, _ = roots
+    try:
+        live = {id(item.view) for items in views.values() for item in items.values() if item.view}
+        live.update(id(view) for view in synced.values())
+    except (AttributeError, TypeError):
+        return None
+
+    return roots, len(live)
+
+
+def memory_report():
+    """Approximate size and item count per subsystem.
+
+    Walks live objects on the loop thread, so it is meant for on-demand
+    inspection rather than every metrics scrape.
+    """
+    subsystems = {
+        "playlist_sessions": (
+            (playlist_sessions,),
+            len(playlist_sessions)
+        ),
+        "view_store": view_store_usage(),
+        "response_cache": (
+            (response_cache.memory,),
+            len(response_cache.memory)
+        ),
+        "timezones": (
+            (timezones, user_guilds, guild_versions, zone_cache),
+            sum(len(users) for users in timezones.values())
+        ),
+        "time_boards": (
+            (live_boards, board_renders, board_last_renders),
+            len(live_boards)
+        ),
+        "member_names": (
+            (member_names.names,),
+            len(member_names.names)
+        ),
+        "quote_buffer": (
+            (quote_provider.buffer, quote_provider.buffered, quote_provider.recent, quote_provider.recent_set),
+            len(quote_provider.buffer)
+        ),
+        "word_pool": (
+            (word_pool.queue._queue,),
+            word_pool.queue.qsize()
+        ),
+        "datasets": (
+            (WEIRD_LAWS.data, affirmations.data),
+            len(WEIRD_LAWS.data or ()) + sum(len(items) for items in (affirmations.data or {}).values())
+        )
+    }
+
+    report = {
+        name: {"bytes": deep_sizeof(*usage[0]), "items": usage[1]} if usage else "unavailable"
+        for name, usage in subsystems.items()
+    }
+    if local_dictionary:
+        report["local_dictionary"] = {
+            "mapped_bytes": len(local_dictionary.data) + len(local_dictionary.index),
+            "items": local_dictionary.count
+        }
+
+    return {"rss_bytes": process_rss(), "subsystems": report, "tracemalloc": memory_profiler.status()}
+
+
+class MemoryProfiler:
+    """Runtime switch around tracemalloc.
+
+    snapshot() records a baseline; diff() reports what grew since then.
+    Snapshots and comparisons run in a worker thread so a large heap
+    doesn't stall the loop.
+    """
+
+    FILTERS = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<unknown>")
+    )
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.baseline = None
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+
+    def stop(self):
+        self.baseline = None
+        tracemalloc.stop()
+
+    def status(self):
+        if not tracemalloc.is_tracing():
+            return {"tracing": False}
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "tracing": True,
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "baseline": self.baseline is not None
+        }
+
+    def take_snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(self.FILTERS)
+
+    async def snapshot(self, limit=10):
+        """Record a new baseline and return its largest allocation sites"""
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not running")
+        self.baseline = await asyncio.to_thread(self.take_snapshot)
+        stats = await asyncio.to_thread(self.baseline.statistics, "lineno")
+        return [str(stat) for stat in stats[:limit]]
+
+    async def diff(self, limit=10):
+        """Return the allocation sites that grew most since the baseline"""
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not running")
+        if self.baseline is None:
+            raise RuntimeError("no baseline snapshot, take one first")
+        current = await asyncio.to_thread(self.take_snapshot)
+        stats = await asyncio.to_thread(current.compare_to, self.baseline, "lineno")
+        return [str(stat) for stat in stats[:limit]]
+
+
+memory_profiler = MemoryProfiler(MEMORY_TRACE_FRAMES)
 
 # ---------------------------
-# Keep-Alive Web Server
+# Health Server
 # ---------------------------
 
-app = Flask(__name__)
+loop_lag = 0.0
+
+
+def gateway_websockets():
+    """The gateway connections this process holds, one per shard when sharded"""
+    if isinstance(bot, commands.AutoShardedBot):
+        return [info._parent.ws for info in bot.shards.values()]
+    return [bot.ws] if bot.ws else []
+
+
+def gateway_status():
+    websockets = gateway_websockets()
+    last_acks = [
+        getattr(getattr(ws, "_keep_alive", None), "_last_ack", None)
+        for ws in websockets
+    ]
+    # The stalest shard decides whether this process is healthy
+    last_ack = min(last_acks) if websockets and all(last_acks) else None
+    status = {
+        "connected": bool(websockets) and all(ws.open for ws in websockets) and not bot.is_closed(),
+        "ready": bot.is_ready(),
+        "latency_ms": round(bot.latency * 1000, 1) if math.isfinite(bot.latency) else None,
+        "last_heartbeat_ack_s": round(time.perf_counter() - last_ack, 1) if last_ack else None
+    }
+    if SHARD_COUNT:
+        status["worker"] = WORKER_INDEX
+        status["shards"] = sorted(bot.shards)
+    return status
+
+
+async def handle_root(request):
+    return web.Response(text="Bot is alive.")
+
+
+async def handle_healthz(request):
+    gateway = gateway_status()
+    heartbeat_age = gateway["last_heartbeat_ack_s"]
+
+    healthy = (
+        gateway["connected"]
+        and loop_lag < HEALTH_MAX_LOOP_LAG
+        and (heartbeat_age is None or heartbeat_age < HEALTH_MAX_HEARTBEAT_AGE)
+    )
+
+    return web.json_response(
+        {
+            "status": "ok" if healthy else "unhealthy",
+            "gateway": gateway,
+            "loop_lag_ms": round(loop_lag * 1000, 1)
+        },
+        status=200 if healthy else 503
+    )
+
+
+async def handle_metrics(request):
+    return web.Response(text=render_metrics(), content_type="text/plain", charset="utf-8")
+
+
+async def handle_readyz(request):
+    ready = bot.is_ready() and not bot.is_closed()
+    return web.json_response({"ready": ready}, status=200 if ready else 503)
+
+
+def debug_authorized(request):
+    """Constant-time check of the bearer token; nothing is authorized without one"""
+    if not DEBUG_TOKEN:
+        return False
+    supplied = request.headers.get("Authorization", "").encode()
+    return hmac.compare_digest(supplied, f"Bearer {DEBUG_TOKEN}".encode())
 
-@app.route("/")
-def home():
-    return "Bot is alive."
 
-def run_flask():
-    port = int(os.environ.get("PORT", 10000))
-    app.run(host="0.0.0.0", port=port)
+async def handle_debug_memory(request):
+    if not debug_authorized(request):
+        raise web.HTTPUnauthorized()
+    return web.json_response(memory_report())
 
-# Start Flask in background thread
-threading.Thread(target=run_flask).start()
+
+async def handle_debug_tracemalloc(request):
+    """POST /debug/memory/{start,stop,snapshot,diff}"""
+    if not debug_authorized(request):
+        raise web.HTTPUnauthorized()
+
+    action = request.match_info["action"]
+    limit = int(request.query.get("limit", 10))
+
+    try:
+        if action == "start":
+            memory_profiler.start()
+            result = memory_profiler.status()
+        elif action == "stop":
+            memory_profiler.stop()
+            result = memory_profiler.status()
+        elif action == "snapshot":
+            result = {"top": await memory_profiler.snapshot(limit)}
+        elif action == "diff":
+            result = {"diff": await memory_profiler.diff(limit)}
+        else:
+            raise web.HTTPNotFound()
+    except RuntimeError as e:
+        return web.json_response({"error": str(e)}, status=409)
+
+    return web.json_response(result)
+
+
+def create_health_app():
+    app = web.Application()
+    app.router.add_get("/", handle_root)
+    app.router.add_get("/healthz", handle_healthz)
+    app.router.add_get("/readyz", handle_readyz)
+    app.router.add_get("/metrics", handle_metrics)
+    if DEBUG_TOKEN:
+        app.router.add_get("/debug/memory", handle_debug_memory)
+        app.router.add_post("/debug/memory/{action}", handle_debug_tracemalloc)
+    return app
+
+
+async def start_health_server():
+    """Serve the health endpoints on the bot's own event loop"""
+    runner = web.AppRunner(create_health_app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "0.0.0.0", PORT).start()
+    log.info(f"Health server listening on port {PORT}")
+    return runner
 
 # ---------------------------
 # Start Bot
 # ---------------------------
 
-bot.run(TOKEN)
+async def shutdown(health_runner):
+
+    loop_watchdog.stop()
+
+    await health_runner.cleanup()
+
+    await timezone_store.flush()
+    await timezone_store.close()
+
+    await sqlite_write(playlist_sessions.db.close)
+    sqlite_writer.shutdown(wait=True)
+
+    shutdown_offload_pools()
+
+    if http_session and not http_session.closed:
+        await http_session.close()
+
+
+async def main():
+
+    loop = asyncio.get_running_loop()
+
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(sig, lambda: asyncio.ensure_future(bot.close()))
+
+    loop_watchdog.start()
+
+    if MEMORY_PROFILING:
+        memory_profiler.start()
+
+    health_runner = await start_health_server()
+
+    startup_timer.mark("health_server")
+
+    try:
+        async with bot:
+            await bot.start(TOKEN)
+    finally:
+        await shutdown(health_runner)
+
+
+startup_timer.mark("module")
+
+
+if __name__ == "__main__":
+    try:
+        if len(sys.argv) == 4 and sys.argv[1] == "migrate-timezones":
+            # python bot.py migrate-timezones <github|sqlite> <github|sqlite>
+            asyncio.run(migrate_timezones(sys.argv[2], sys.argv[3]))
+        else:
+            asyncio.run(main())
+    finally:
+        # Flushes queued records, including the last ones of a SIGTERM exit
+        log_listener.stop()
@@ -0,0 +1,93 @@
+"""
+Build the compact local dictionary used when WORD_SOURCE=local.
+
+Usage:
+    python build_dictionary.py SOURCE [--out dictionary] [--max-defs 10]
+
+SOURCE is either a JSON object mapping words to a definition string or a
+list of definitions, or a plain text word list with one word per line
+(entries then have no definitions and the online providers fill them in).
+
+Two files are written:
+
+    <out>.dat  one UTF-8 line per entry: word TAB def1 US def2 US ...
+    <out>.idx  header  "WDX1", count (uint32), slots (uint32)
+               dense   count x uint64 entry offsets, for random picks
+               table   slots x uint64 (offset + 1, 0 = empty), an open
+                       addressing hash table keyed on crc32(word.lower())
+
+Both are read through mmap by the bot, so only the pages for the entries
+it touches are ever loaded.
+"""
+
+import argparse
+import json
+import struct
+import zlib
+
+INDEX_MAGIC = b"WDX1"
+DEF_SEPARATOR = "\x1f"
+
+
+def read_source(path, max_defs):
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        entries = {}
+        for word, defs in data.items():
+            if isinstance(defs, str):
+                defs = [defs]
+            defs = [" ".join(str(d).split()) for d in defs if d][:max_defs]
+            entries[word.strip()] = defs
+        return entries
+
+    with open(path, "r", encoding="utf-8") as f:
+        return {line.strip(): [] for line in f if line.strip()}
+
+
+def build(entries, out):
+    offsets = []
+    keys = []
+    seen = set()
+
+    with open(f"{out}.dat", "wb") as f:
+        for word in sorted(entries, key=str.lower):
+            clean = word.replace("\t", " ").replace("\n", " ")
+            if not clean or clean.lower() in seen:
+                continue
+            seen.add(clean.lower())
+            defs = DEF_SEPARATOR.join(d.replace("\n", " ") for d in entries[word])
+            offsets.append(f.tell())
+            keys.append(clean.lower())
+            f.write(f"{clean}\t{defs}\n".encode("utf-8"))
+
+    # Keep the table at most half full so probes stay short
+    slots = max(len(offsets) * 2, 1)
+    table = [0] * slots
+    for key, offset in zip(keys, offsets):
+        slot = zlib.crc32(key.encode("utf-8")) % slots
+        while table[slot]:
+            slot = (slot + 1) % slots
+        table[slot] = offset + 1
+
+    with open(f"{out}.idx", "wb") as f:
+        f.write(struct.pack("<4sII", INDEX_MAGIC, len(offsets), slots))
+        f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        f.write(struct.pack(f"<{slots}Q", *table))
+
+    return len(offsets)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source")
+    parser.add_argument("--out", default="dictionary")
+    parser.add_argument("--max-defs", type=int, default=10)
+    args = parser.parse_args()
+
+    count = build(read_source(args.source, args.max_defs), args.out)
+    print(f"Wrote {count} entries to {args.out}.dat / {args.out}.idx")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Runs the bot as several worker processes, each owning a slice of the
+gateway shards, and restarts any worker that exits.
+
+Usage:
+    python launcher.py [--workers 4] [--shards 8] [--ready-timeout 120]
+                       [--dry-run]
+
+Shard i goes to worker i % workers. Workers are started one at a time,
+each once the previous one reports ready on /readyz, so their gateway
+identifies don't collide. Worker i serves its health endpoints and
+metrics on PORT + i.
+
+Workers share state through local SQLite files in WAL mode: the upstream
+response cache (CACHE_DB), playlist sessions and live time boards
+(SESSION_DB) and timezones (TIMEZONE_DB). Nothing else needs to run, so a
+whole deployment fits on one machine. A saved timezone is copied to every guild the user is in,
+whichever worker owns it, so with more than one worker the timezones
+must live in the shared database: TIMEZONE_BACKEND defaults to sqlite
+and any other backend is refused. Move GitHub data over first with
+"python bot.py migrate-timezones github sqlite".
+
+--shards defaults to SHARD_COUNT, then to Discord's recommendation for
+the bot token. --dry-run prints the plan without starting anything.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+import urllib.request
+
+from dotenv import load_dotenv
+
+BOT_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bot.py")
+GATEWAY_BOT_URL = "https://discord.com/api/v10/gateway/bot"
+
+# A worker that stays up this long has its restart backoff reset
+HEALTHY_RUN = 60
+MAX_BACKOFF = 60
+
+# Seconds a stopping worker gets to flush state before it is killed
+STOP_GRACE = 20
+
+
+def log(msg, **fields):
+    """Same JSON line shape as the workers' own logs"""
+    entry = {"ts": round(time.time(), 6), "level": "INFO", "logger": "launcher", "msg": msg}
+    entry.update(fields)
+    print(json.dumps(entry), flush=True)
+
+
+def recommended_shards(token):
+    request = urllib.request.Request(GATEWAY_BOT_URL, headers={"Authorization": f"Bot {token}"})
+    with urllib.request.urlopen(request, timeout=10) as r:
+        return json.load(r)["shards"]
+
+
+def assign_shards(shard_count, workers):
+    """Worker index -> shard ids, spreading shards round-robin"""
+    return [list(range(index, shard_count, workers)) for index in range(workers)]
+
+
+def worker_env(index, shard_ids, shard_count, workers, base_port):
+    env = dict(os.environ)
+    env.update({
+        "SHARD_COUNT": str(shard_count),
+        "SHARD_IDS": ",".join(str(shard_id) for shard_id in shard_ids),
+        "WORKER_INDEX": str(index),
+        "WORKER_COUNT": str(workers),
+        "PORT": str(base_port + index),
+    })
+    if workers > 1:
+        env["TIMEZONE_BACKEND"] = "sqlite"
+    return env
+
+# ---------------------------
+# Supervision
+# ---------------------------
+
+class Worker:
+
+    def __init__(self, index, shard_ids, env):
+        self.index = index
+        self.shard_ids = shard_ids
+        self.env = env
+        self.port = int(env["PORT"])
+        self.process = None
+
+    async def spawn(self):
+        self.process = await asyncio.create_subprocess_exec(sys.executable, BOT_SCRIPT, env=self.env)
+        log("Worker started", worker=self.index, pid=self.process.pid, shards=self.shard_ids, port=self.port)
+
+    async def wait_ready(self, timeout):
+        """Poll the worker's /readyz until it answers 200 or the timeout passes"""
+        url = f"http://127.0.0.1:{self.port}/readyz"
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and self.process.returncode is None:
+            try:
+                status = await asyncio.to_thread(lambda: urllib.request.urlopen(url, timeout=2).status)
+                if status == 200:
+                    return True
+            except OSError:
+                pass
+            await asyncio.sleep(1)
+        return False
+
+    def signal(self, sig):
+        if self.process and self.process.returncode is None:
+            self.process.send_signal(sig)
+
+
+class Launcher:
+
+    def __init__(self, workers, ready_timeout):
+        self.workers = workers
+        self.ready_timeout = ready_timeout
+        self.stopping = asyncio.Event()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self.stop)
+
+        supervisors = []
+        for worker in self.workers:
+            if self.stopping.is_set():
+                break
+            await worker.spawn()
+            if not await worker.wait_ready(self.ready_timeout):
+                log("Worker not ready in time, starting the next one anyway", worker=worker.index)
+            supervisors.append(asyncio.ensure_future(self.supervise(worker)))
+
+        await self.stopping.wait()
+        await self.shutdown()
+        for supervisor in supervisors:
+            supervisor.cancel()
+
+    async def supervise(self, worker):
+        """Restart worker whenever it exits, backing off while it keeps failing"""
+        failures = 0
+        while True:
+            started = time.monotonic()
+            code = await worker.process.wait()
+            if self.stopping.is_set():
+                return
+
+            failures = 0 if time.monotonic() - started > HEALTHY_RUN else failures + 1
+            delay = min(MAX_BACKOFF, 2 ** failures) if failures else 1
+            log("Worker exited, restarting", worker=worker.index, code=code, restart_in_s=delay)
+
+            try:
+                await asyncio.wait_for(self.stopping.wait(), delay)
+                return
+            except asyncio.TimeoutError:
+                pass
+            await worker.spawn()
+
+    def stop(self):
+        if not self.stopping.is_set():
+            log("Stopping workers")
+            self.stopping.set()
+
+    async def shutdown(self):
+        for worker in self.workers:
+            worker.signal(signal.SIGTERM)
+
+        running = [worker.process.wait() for worker in self.workers if worker.process]
+        try:
+            await asyncio.wait_for(asyncio.gather(*running), STOP_GRACE)
+        except asyncio.TimeoutError:
+            for worker in self.workers:
+                worker.signal(signal.SIGKILL)
+        log("All workers stopped")
+
+
+def main():
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shards", type=int, default=int(os.getenv("SHARD_COUNT", 0)) or None)
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 10000)), help="health port of worker 0")
+    parser.add_argument("--ready-timeout", type=float, default=120, help="seconds to wait for each worker's first ready")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    shard_count = args.shards or recommended_shards(os.environ["DISCORD_TOKEN"])
+    # A worker with no shards would have nothing to do
+    workers = max(1, min(args.workers, shard_count))
+
+    backend = os.getenv("TIMEZONE_BACKEND", "sqlite" if workers > 1 else "github").lower()
+    if workers > 1 and backend != "sqlite":
+        parser.error(
+            f"TIMEZONE_BACKEND={backend} can't be shared between {workers} workers; "
+            f"run 'python bot.py migrate-timezones {backend} sqlite' and use TIMEZONE_BACKEND=sqlite"
+        )
+
+    plan = [
+        Worker(index, shard_ids, worker_env(index, shard_ids, shard_count, workers, args.port))
+        for index, shard_ids in enumerate(assign_shards(shard_count, workers))
+    ]
+
+    if args.dry_run:
+        for worker in plan:
+            print(f"worker {worker.index}: shards {worker.shard_ids} of {shard_count}, port {worker.port}")
+        return
+
+    log("Launching", workers=workers, shard_count=shard_count)
+    asyncio.run(Launcher(plan, args.ready_timeout).run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATE = tempfile.mkdtemp(prefix="bot-tests-")
+
+# bot.py reads its configuration at import time; keep its state files out of the repo
+os.environ.update({
+    "DISCORD_TOKEN": "test",
+    "TIMEZONE_BACKEND": "sqlite",
+    "TIMEZONE_DB": os.path.join(STATE, "timezones.db"),
+    "TIMEZONE_JOURNAL": os.path.join(STATE, "timezone_journal.jsonl"),
+    "CACHE_DB": os.path.join(STATE, "cache.db"),
+    "SESSION_DB": os.path.join(STATE, "sessions.db"),
+    "COMMAND_HASH_FILE": os.path.join(STATE, "command_tree.hash"),
+    "WORD_POOL_SIZE": "0",
+    "TRACE_SAMPLE_RATE": "0",
+})
+
+sys.path.insert(0, ROOT)
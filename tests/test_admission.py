@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+import bot
+
+
+def controller(limit=1, queue_size=4, queue_timeout=2.0):
+    return bot.AdmissionController(
+        {"playlist": (limit, queue_size)}, {"playlist": 5}, (10, 10), (100, 100), queue_timeout
+    )
+
+
+def test_tokens_are_taken_before_queueing():
+    async def scenario():
+        admission = controller()
+        assert await admission.acquire("playlist", 1, 1) is None
+
+        # The second request queues behind the first and has paid already,
+        # so a third from the same user is refused without queueing
+        waiter = asyncio.ensure_future(admission.acquire("playlist", 1, 1))
+        await asyncio.sleep(0)
+        assert admission.users.available(1) < 5
+        assert (await admission.acquire("playlist", 1, 1)).startswith("Slow down")
+
+        admission.release("playlist")
+        assert await waiter is None
+
+    asyncio.run(scenario())
+
+
+def test_callers_timeout_bounds_the_queue_wait():
+    async def scenario():
+        admission = controller(queue_timeout=2.0)
+        assert await admission.acquire("playlist", 1, 1) is None
+
+        started = time.perf_counter()
+        rejection = await admission.acquire("playlist", 2, 1, timeout=0.05)
+        assert rejection.startswith("I'm busy")
+        assert time.perf_counter() - started < 1
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_passes_on_a_handed_over_slot():
+    async def scenario():
+        gate = bot.AdmissionGate(limit=1, queue_size=4, timeout=2.0)
+        assert await gate.acquire()
+
+        first = asyncio.ensure_future(gate.acquire())
+        second = asyncio.ensure_future(gate.acquire())
+        await asyncio.sleep(0)
+
+        # The slot goes to the first waiter, which is cancelled before it
+        # wakes up. Depending on the Python version it either keeps the
+        # slot or raises; if it raises, the second waiter gets the slot
+        gate.release()
+        first.cancel()
+        (result,) = await asyncio.gather(first, return_exceptions=True)
+        if result is True:
+            gate.release()
+        assert await second is True
+        assert gate.active == 1
+
+        gate.release()
+        assert gate.active == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,22 @@
+from types import SimpleNamespace
+
+import bot
+
+
+def request(authorization=None):
+    headers = {"Authorization": authorization} if authorization is not None else {}
+    return SimpleNamespace(headers=headers)
+
+
+def test_debug_token_must_match(monkeypatch):
+    monkeypatch.setattr(bot, "DEBUG_TOKEN", "s3cret")
+    assert bot.debug_authorized(request("Bearer s3cret"))
+    assert not bot.debug_authorized(request("Bearer s3cre"))
+    assert not bot.debug_authorized(request())
+
+
+def test_nothing_is_authorized_without_a_debug_token(monkeypatch):
+    for token in (None, ""):
+        monkeypatch.setattr(bot, "DEBUG_TOKEN", token)
+        assert not bot.debug_authorized(request("Bearer "))
+        assert not bot.debug_authorized(request("Bearer None"))
@@ -0,0 +1,40 @@
+import bot
+
+# Trimmed from action=parse&page=bank&prop=sections|text: "Etymology 1" is a
+# level-3 heading whose Pronunciation and Noun subsections come back with it
+SECTIONS = [
+    {"index": "1", "level": "2", "line": "English"},
+    {"index": "2", "level": "3", "line": "Etymology 1"},
+    {"index": "3", "level": "4", "line": "Pronunciation"},
+    {"index": "4", "level": "4", "line": "Noun"},
+    {"index": "5", "level": "3", "line": "Etymology 2"},
+    {"index": "6", "level": "4", "line": "Verb"},
+    {"index": "7", "level": "2", "line": "Dutch"},
+    {"index": "8", "level": "3", "line": "Etymology"},
+]
+
+ETYMOLOGY_1 = """
+<div class="mw-heading mw-heading3"><h3 id="Etymology_1">Etymology 1</h3></div>
+<p>From Middle English <i>banke</i>, from Old Norse <i>bakki</i>.<sup>[1]</sup></p>
+<p>Cognate with Danish <i>bakke</i>.</p>
+<div class="mw-heading mw-heading4"><h4 id="Pronunciation">Pronunciation</h4></div>
+<ul><li>IPA: /bæŋk/</li></ul>
+<div class="mw-heading mw-heading4"><h4 id="Noun">Noun</h4></div>
+<ol><li>An edge of a river or lake.</li></ol>
+"""
+
+
+def test_etymology_sections_are_english_only():
+    assert bot.english_etymology_sections(SECTIONS) == ["2", "5"]
+
+
+def test_section_text_stops_at_first_subsection():
+    assert bot.extract_section_text(ETYMOLOGY_1) == [
+        "From Middle English banke, from Old Norse bakki.",
+        "Cognate with Danish bakke.",
+    ]
+
+
+def test_section_text_without_subsections():
+    html = '<h3 id="Etymology">Etymology</h3><p>From Latin <i>bancus</i>.</p>'
+    assert bot.extract_section_text(html) == ["From Latin bancus."]
@@ -0,0 +1,64 @@
+import asyncio
+
+import bot
+
+
+class FakeResponse:
+
+    def __init__(self, status, headers=None):
+        self.status = status
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def json(self):
+        return {"content": {"sha": "new"}}
+
+
+class FakeSession:
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.puts = 0
+
+    def put(self, url, **kwargs):
+        self.puts += 1
+        return self.responses.pop(0)
+
+
+def push(monkeypatch, tmp_path, session):
+    monkeypatch.setattr(bot, "TIMEZONE_JOURNAL", str(tmp_path / "journal.jsonl"))
+    monkeypatch.setattr(bot, "timezones", {"1": {"10": "UTC"}})
+    for name in ("dirty_guilds", "rejected_guilds"):
+        monkeypatch.setattr(bot, name, set())
+
+    async def get_http_session():
+        return session
+
+    monkeypatch.setattr(bot, "get_http_session", get_http_session)
+    bot.mark_guild_dirty("1")
+    return asyncio.run(bot.push_timezones_to_github())
+
+
+def test_auth_failure_is_not_retried(monkeypatch, tmp_path):
+    session = FakeSession(FakeResponse(401))
+    assert push(monkeypatch, tmp_path, session) is True
+    assert bot.rejected_guilds == {"1"}
+    assert bot.dirty_guilds == {"1"}
+
+    # Until the guild changes again, flushing doesn't touch GitHub
+    assert asyncio.run(bot.push_timezones_to_github()) is True
+    assert session.puts == 1
+
+    bot.mark_guild_dirty("1")
+    assert not bot.rejected_guilds
+
+
+def test_rate_limit_is_retried(monkeypatch, tmp_path):
+    session = FakeSession(FakeResponse(403, {"X-RateLimit-Remaining": "0"}))
+    assert push(monkeypatch, tmp_path, session) is False
+    assert not bot.rejected_guilds
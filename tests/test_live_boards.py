@@ -0,0 +1,110 @@
+import asyncio
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import discord
+
+import bot
+
+
+def test_concurrent_renders_share_one_build(monkeypatch):
+    monkeypatch.setattr(bot, "board_renders", {})
+    monkeypatch.setattr(bot, "board_last_renders", {})
+    builds = []
+
+    async def build_timezone_embed(interaction, guild, page=0):
+        builds.append((guild.id, page))
+        await asyncio.sleep(0.01)
+        return discord.Embed(description=f"page {page}")
+
+    monkeypatch.setattr(bot, "build_timezone_embed", build_timezone_embed)
+    guild = SimpleNamespace(id=1)
+
+    async def scenario():
+        first, second, other = await asyncio.gather(
+            bot.render_timezone_board(guild),
+            bot.render_timezone_board(guild),
+            bot.render_timezone_board(guild, page=1),
+        )
+        assert first is second
+        assert other.description == "page 1"
+
+        # A timezone change forces a fresh render
+        bot.invalidate_board_renders(1)
+        await bot.render_timezone_board(guild)
+
+    asyncio.run(scenario())
+
+    assert builds == [(1, 0), (1, 1), (1, 0)]
+
+
+class Message:
+
+    def __init__(self, edits, channel_id):
+        self.edits = edits
+        self.channel_id = channel_id
+
+    async def edit(self, **kwargs):
+        self.edits.append(self.channel_id)
+
+
+def test_edits_are_capped_and_rotate_stalest_first(monkeypatch):
+    monkeypatch.setattr(bot, "LIVE_BOARD_MAX_EDITS_PER_MINUTE", 2)
+    monkeypatch.setattr(bot, "live_boards", OrderedDict(
+        (channel_id, {"guild_id": 1, "message_id": channel_id, "page": 0})
+        for channel_id in (10, 11, 12)
+    ))
+    edits = []
+
+    async def render_timezone_board(guild, page=0):
+        return discord.Embed(description="board")
+
+    def get_partial_messageable(channel_id):
+        return SimpleNamespace(get_partial_message=lambda message_id: Message(edits, channel_id))
+
+    monkeypatch.setattr(bot, "render_timezone_board", render_timezone_board)
+    monkeypatch.setattr(bot.bot, "get_guild", lambda guild_id: SimpleNamespace(id=guild_id))
+    monkeypatch.setattr(bot.bot, "get_partial_messageable", get_partial_messageable)
+
+    async def scenario():
+        await bot.update_live_boards()
+        assert edits == [10, 11]
+        await bot.update_live_boards()
+        assert edits == [10, 11, 12, 10]
+
+    asyncio.run(scenario())
+
+    assert list(bot.live_boards) == [11, 12, 10]
+
+
+def test_boards_survive_a_restart(tmp_path, monkeypatch):
+    store = bot.LiveBoardStore(str(tmp_path / "sessions.db"))
+    monkeypatch.setattr(bot, "live_board_store", store)
+    monkeypatch.setattr(bot, "live_boards", OrderedDict())
+    monkeypatch.setattr(bot, "ensure_live_board_task", lambda: None)
+
+    async def scenario():
+        await store.save(10, {"guild_id": 1, "message_id": 100, "page": 0})
+        await store.save(11, {"guild_id": 1, "message_id": 101, "page": 0})
+        await store.save(10, {"guild_id": 1, "message_id": 100, "page": 2})
+        await bot.stop_live_board(11)
+
+    asyncio.run(scenario())
+    bot.restore_live_boards()
+
+    assert bot.live_boards == {10: {"guild_id": 1, "message_id": 100, "page": 2}}
+
+
+def test_workers_restore_only_their_shards_boards(tmp_path, monkeypatch):
+    store = bot.LiveBoardStore(str(tmp_path / "sessions.db"))
+    monkeypatch.setattr(bot, "SHARD_COUNT", 2)
+    monkeypatch.setattr(bot, "SHARD_IDS", [1])
+
+    async def scenario():
+        # Shard = (guild_id >> 22) % SHARD_COUNT
+        await store.save(10, {"guild_id": 0 << 22, "message_id": 100, "page": 0})
+        await store.save(11, {"guild_id": 1 << 22, "message_id": 101, "page": 0})
+
+    asyncio.run(scenario())
+
+    assert list(store.load()) == [11]
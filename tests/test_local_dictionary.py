@@ -0,0 +1,50 @@
+import struct
+import zlib
+
+import bot
+
+
+def write_dictionary(tmp_path, data, index):
+    path = tmp_path / "dictionary"
+    (tmp_path / "dictionary.dat").write_bytes(data)
+    (tmp_path / "dictionary.idx").write_bytes(index)
+    return str(path)
+
+
+def test_empty_or_broken_dictionary_falls_back_to_online(tmp_path, monkeypatch):
+    monkeypatch.setattr(bot, "WORD_SOURCE", "local")
+    builds = [
+        (b"", struct.pack("<4sII", b"WDX1", 0, 0)),
+        (b"\n", struct.pack("<4sII", b"WDX1", 0, 1) + b"\0" * 8),
+        (b"bank\tA slope\n", b"WDX1"),
+        # full hash table: a lookup for a missing word would never hit an empty slot
+        (b"bank\tA slope\n", struct.pack("<4sIIQQ", b"WDX1", 1, 1, 0, 1)),
+    ]
+    for data, index in builds:
+        monkeypatch.setattr(bot, "LOCAL_DICTIONARY", write_dictionary(tmp_path, data, index))
+        assert bot.open_local_dictionary() is None
+
+    monkeypatch.setattr(bot, "LOCAL_DICTIONARY", str(tmp_path / "missing"))
+    assert bot.open_local_dictionary() is None
+
+
+def test_single_word_dictionary(tmp_path, monkeypatch):
+    monkeypatch.setattr(bot, "WORD_SOURCE", "local")
+    index = struct.pack("<4sIIQQQ", b"WDX1", 1, 2, 0, 1, 0)
+    if zlib.crc32(b"bank") % 2:
+        index = struct.pack("<4sIIQQQ", b"WDX1", 1, 2, 0, 0, 1)
+    monkeypatch.setattr(bot, "LOCAL_DICTIONARY", write_dictionary(tmp_path, b"bank\tA slope\n", index))
+
+    dictionary = bot.open_local_dictionary()
+    assert dictionary.random_word() == "bank"
+    assert dictionary.lookup("Bank") == ["A slope"]
+    assert dictionary.lookup("other") is None
+
+
+def test_lookup_gives_up_after_probing_every_slot(tmp_path, monkeypatch):
+    monkeypatch.setattr(bot, "WORD_SOURCE", "local")
+    # Passes the header checks, but a corrupt table has no empty slot left
+    index = struct.pack("<4sIIQQQ", b"WDX1", 1, 2, 0, 1, 1)
+    monkeypatch.setattr(bot, "LOCAL_DICTIONARY", write_dictionary(tmp_path, b"bank\tA slope\n", index))
+
+    assert bot.open_local_dictionary().lookup("other") is None
@@ -0,0 +1,31 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+
+import bot
+
+
+class Guild:
+
+    def __init__(self, error=None):
+        self.id = 1
+        self.error = error
+
+    async def query_members(self, user_ids, **kwargs):
+        if self.error:
+            raise self.error
+        return [SimpleNamespace(id=user_id, display_name=f"Member {user_id}") for user_id in user_ids]
+
+
+def test_failed_query_is_retried_on_next_render():
+    names = bot.MemberNames(ttl=600, size=100)
+
+    async def scenario():
+        guild = Guild(discord.ClientException("not connected"))
+        assert await names.resolve(guild, [10, 11]) == {}
+
+        guild.error = None
+        assert await names.resolve(guild, [10, 11]) == {10: "Member 10", 11: "Member 11"}
+
+    asyncio.run(scenario())
@@ -0,0 +1,18 @@
+from types import SimpleNamespace
+
+import bot
+
+
+def test_view_store_is_sized_from_discord_internals():
+    report = bot.memory_report()["subsystems"]
+
+    assert report["view_store"]["items"] == 0
+
+
+def test_missing_discord_internals_are_reported_unavailable(monkeypatch):
+    monkeypatch.setattr(bot.bot, "_connection", SimpleNamespace(_view_store=SimpleNamespace(_views={})))
+
+    report = bot.memory_report()["subsystems"]
+
+    assert report["view_store"] == "unavailable"
+    assert "items" in report["timezones"]
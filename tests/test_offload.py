@@ -0,0 +1,59 @@
+import asyncio
+import json
+import threading
+
+import bot
+
+
+def thread_name():
+    return threading.current_thread().name
+
+
+def run(**kwargs):
+    return asyncio.run(bot.offload(thread_name, **kwargs))
+
+
+def test_small_payloads_stay_on_the_loop(monkeypatch):
+    monkeypatch.setattr(bot, "OFFLOAD_POOL", "thread")
+
+    assert run(size=10, threshold=100) == threading.current_thread().name
+
+
+def test_payloads_at_threshold_go_to_the_pool(monkeypatch):
+    monkeypatch.setattr(bot, "OFFLOAD_POOL", "thread")
+
+    assert run(size=100, threshold=100).startswith("offload")
+    assert run(size=1, threshold=1, kind="thread").startswith("offload")
+
+
+def test_inline_pool_never_offloads(monkeypatch):
+    monkeypatch.setattr(bot, "OFFLOAD_POOL", "inline")
+
+    assert run(size=10 ** 9) == threading.current_thread().name
+
+
+def test_large_response_bodies_are_parsed_off_the_loop(monkeypatch):
+    monkeypatch.setattr(bot, "OFFLOAD_POOL", "thread")
+    threads = []
+
+    def parse(body):
+        threads.append(thread_name())
+        return bot.parse_json(body)
+
+    class Response:
+
+        def __init__(self, body):
+            self.body = body
+
+        async def read(self):
+            return self.body
+
+    async def scenario():
+        assert await bot.read_json(Response(b"[]"), parse) == []
+        body = json.dumps(["lantern"] * bot.OFFLOAD_MIN_BYTES).encode()
+        assert len(await bot.read_json(Response(body), parse)) == bot.OFFLOAD_MIN_BYTES
+
+    asyncio.run(scenario())
+
+    assert threads[0] == threading.current_thread().name
+    assert threads[1].startswith("offload")
@@ -0,0 +1,94 @@
+import asyncio
+
+import bot
+
+
+class FakeResponse:
+
+    def __init__(self, data):
+        self.data = data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    async def json(self, content_type=None):
+        return self.data
+
+
+class FakeSession:
+
+    def __init__(self, *batches):
+        self.batches = list(batches)
+
+    def get(self, url, **kwargs):
+        return FakeResponse(self.batches.pop(0))
+
+
+def batch(*quotes):
+    return [{"q": q, "a": "Author"} for q in quotes]
+
+
+def use_session(monkeypatch, session):
+    monkeypatch.setattr(bot, "QUOTE_REFILL_COOLDOWN", 0)
+
+    async def get_http_session():
+        return session
+
+    monkeypatch.setattr(bot, "get_http_session", get_http_session)
+
+
+def test_refill_drops_duplicates_and_rate_limit_notices(monkeypatch):
+    notice = {"q": "Too many requests.", "a": "zenquotes.io"}
+    use_session(monkeypatch, FakeSession(batch("a", "b", "a") + [notice], batch("b", "c")))
+    provider = bot.QuoteProvider(size=10, refill_at=0, recent_window=10)
+
+    async def scenario():
+        await provider.refill()
+        assert [q for q, _ in provider.buffer] == ["a", "b"]
+        # Quotes still waiting in the buffer aren't added twice
+        await provider.refill()
+        assert [q for q, _ in provider.buffer] == ["a", "b", "c"]
+
+    asyncio.run(scenario())
+
+
+def test_recent_quotes_are_not_repeated(monkeypatch):
+    use_session(monkeypatch, FakeSession(batch("a", "b"), batch("a", "b", "c")))
+    provider = bot.QuoteProvider(size=10, refill_at=0, recent_window=10)
+
+    async def scenario():
+        assert [(await provider.get())[0] for _ in range(2)] == ["a", "b"]
+        assert await provider.get() == ("c", "Author")
+
+    asyncio.run(scenario())
+
+
+def test_repeats_fill_an_otherwise_empty_buffer(monkeypatch):
+    use_session(monkeypatch, FakeSession(batch("a"), batch("a")))
+    provider = bot.QuoteProvider(size=10, refill_at=0, recent_window=10)
+
+    async def scenario():
+        assert await provider.get() == ("a", "Author")
+        assert await provider.get() == ("a", "Author")
+
+    asyncio.run(scenario())
+
+
+def test_recent_window_expires(monkeypatch):
+    use_session(monkeypatch, FakeSession(batch("a", "b"), batch("a")))
+    provider = bot.QuoteProvider(size=10, refill_at=0, recent_window=1)
+
+    async def scenario():
+        await provider.get()
+        await provider.get()
+        # "a" has aged out of the one-quote window
+        await provider.refill()
+        assert [q for q, _ in provider.buffer] == ["a"]
+
+    asyncio.run(scenario())
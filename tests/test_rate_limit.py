@@ -0,0 +1,29 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import bot
+
+
+def test_every_request_to_a_word_provider_is_charged(monkeypatch):
+    limiter = bot.RateLimiter(60)
+    monkeypatch.setitem(bot.provider_limiters, "datamuse", limiter)
+
+    async def handler(request):
+        return "response"
+
+    async def scenario():
+        request = SimpleNamespace(url=f"{bot.DATAMUSE_API}/words?ml=bank")
+        for _ in range(3):
+            assert await bot.rate_limit_middleware(request, handler) == "response"
+
+    asyncio.run(scenario())
+    # Three calls at one a second: the next free slot is ~3 s away
+    assert 2.5 < limiter.next_at - time.monotonic() <= 3
+
+
+def test_burst_pushes_waiters_back_at_most_a_minute():
+    limiter = bot.RateLimiter(1)
+    for _ in range(5):
+        limiter.take()
+    assert limiter.next_at - time.monotonic() <= 60
@@ -0,0 +1,133 @@
+import asyncio
+from types import SimpleNamespace
+
+import bot
+
+
+class Response:
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    async def defer(self):
+        self.calls.append("defer")
+
+    async def send_message(self, **kwargs):
+        self.calls.append(("send", kwargs.get("content")))
+
+
+class Interaction:
+
+    def __init__(self):
+        self.calls = []
+        self.response = Response(self.calls)
+
+    async def edit_original_response(self, **kwargs):
+        self.calls.append(("edit", kwargs.get("content")))
+
+
+def budget(monkeypatch, seconds, ack_after=10):
+    monkeypatch.setattr(bot, "COMMAND_BUDGETS", {"test": seconds})
+    monkeypatch.setattr(bot, "INTERACTION_ACK_AFTER", ack_after)
+
+
+def test_on_time_answer_skips_fallback(monkeypatch):
+    budget(monkeypatch, 0.5)
+    interaction = Interaction()
+    done = []
+
+    async def work():
+        return {"content": "real"}
+
+    async def scenario():
+        assert await bot.respond_within(
+            interaction, "test", work, lambda: {"content": "fallback"}, after=lambda: done.append(True)
+        ) is None
+
+    asyncio.run(scenario())
+
+    assert interaction.calls == [("send", "real")]
+    assert done == [True]
+
+
+def test_late_answer_replaces_fallback(monkeypatch):
+    budget(monkeypatch, 0.01)
+    interaction = Interaction()
+    done = []
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return {"content": "real"}
+
+    async def scenario():
+        replacement = await bot.respond_within(
+            interaction, "test", work, lambda: {"content": "fallback"}, after=lambda: done.append(True)
+        )
+        assert interaction.calls == [("send", "fallback")]
+        assert not done
+        await replacement
+
+    asyncio.run(scenario())
+
+    assert interaction.calls == [("send", "fallback"), ("edit", "real")]
+    assert done == [True]
+
+
+def test_failed_work_keeps_fallback(monkeypatch):
+    budget(monkeypatch, 0.5)
+    interaction = Interaction()
+
+    async def work():
+        raise RuntimeError("upstream down")
+
+    async def scenario():
+        await bot.respond_within(interaction, "test", work, lambda: {"content": "fallback"})
+        await asyncio.sleep(0.01)
+
+    asyncio.run(scenario())
+
+    assert interaction.calls == [("send", "fallback")]
+
+
+def test_long_budget_defers_first(monkeypatch):
+    budget(monkeypatch, 0.5, ack_after=0.1)
+    interaction = Interaction()
+
+    async def work():
+        return {"content": "real"}
+
+    asyncio.run(bot.respond_within(interaction, "test", work, lambda: {"content": "fallback"}))
+
+    assert interaction.calls == ["defer", ("edit", "real")]
+
+
+def test_word_holds_its_admission_slot_until_the_answer_lands(monkeypatch):
+    monkeypatch.setattr(bot, "COMMAND_BUDGETS", {"word": 0.01})
+    gate = bot.admission.gates["word"]
+    release = asyncio.Event()
+
+    async def generate(self):
+        await release.wait()
+        self.word = "lantern"
+        self.build_pages()
+
+    monkeypatch.setattr(bot.WordView, "generate", generate)
+    interaction = Interaction()
+    interaction.user = SimpleNamespace(id=1)
+    interaction.channel_id = 1
+    interaction.followup = None
+
+    async def scenario():
+        command = asyncio.ensure_future(bot.slash_word.callback(interaction))
+        await asyncio.sleep(0.05)
+
+        # The fallback is on screen but the lookups still hold the slot
+        assert interaction.calls == [("send", None)]
+        assert gate.active == 1
+
+        release.set()
+        await command
+        assert gate.active == 0
+        assert interaction.calls[-1] == ("edit", None)
+
+    asyncio.run(scenario())
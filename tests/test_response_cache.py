@@ -0,0 +1,102 @@
+import asyncio
+
+import bot
+
+
+def cache(tmp_path):
+    return bot.ResponseCache(str(tmp_path / "cache.db"), 100, 10 ** 6, {"wiktionary": (3600, 60)})
+
+
+def test_error_bodies_are_not_cached(tmp_path):
+    responses = cache(tmp_path)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        return {"error": {"code": "maxlag", "info": "Waiting for a database server"}}
+
+    async def scenario():
+        await responses.fetch("wiktionary", "bank", load)
+        await responses.fetch("wiktionary", "bank", load)
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
+    assert responses.get("wiktionary", "bank") is bot.ResponseCache.MISSING
+
+
+def test_concurrent_misses_share_one_load(tmp_path):
+    responses = cache(tmp_path)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"parse": {"sections": []}}
+
+    async def scenario():
+        return await asyncio.gather(*(responses.fetch("wiktionary", "bank", load) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert results == [{"parse": {"sections": []}}] * 5
+    assert not responses.loading
+
+
+def test_failed_load_reaches_every_waiter_and_is_retried(tmp_path):
+    responses = cache(tmp_path)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ConnectionError("reset")
+
+    async def scenario():
+        results = await asyncio.gather(
+            *(responses.fetch("wiktionary", "bank", load) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(result, ConnectionError) for result in results)
+        await asyncio.gather(responses.fetch("wiktionary", "bank", load), return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
+
+
+def test_touch_extends_expiry_without_rewriting(tmp_path, monkeypatch):
+    responses = cache(tmp_path)
+    asyncio.run(responses.set("wiktionary", "bank", {"etag": '"abc"', "page": [1, 2, 3]}))
+    blob, expires_at = responses.db.execute("SELECT value, expires_at FROM cache").fetchone()
+
+    def encode(value):
+        raise AssertionError("touch() re-encoded the value")
+
+    monkeypatch.setattr(responses, "encode", encode)
+    monkeypatch.setattr(bot.time, "time", lambda: expires_at)
+    asyncio.run(responses.touch("wiktionary", "bank"))
+
+    assert responses.db.execute("SELECT value, expires_at FROM cache").fetchone() == (blob, expires_at + 3600)
+    assert responses.memory["wiktionary:bank"] == (expires_at + 3600, {"etag": '"abc"', "page": [1, 2, 3]})
+
+
+def test_missing_page_is_cached_as_not_found(tmp_path):
+    responses = cache(tmp_path)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        return {"error": {"code": "missingtitle", "info": "The page you specified doesn't exist."}}
+
+    async def scenario():
+        return [await responses.fetch("wiktionary", "qwxz", load) for _ in range(2)]
+
+    assert asyncio.run(scenario()) == [None, None]
+    assert len(calls) == 1
+    expires_at = responses.db.execute("SELECT expires_at FROM cache").fetchone()[0]
+    assert expires_at - bot.time.time() <= 60
+
+
+def test_connections_share_wal_and_a_short_busy_timeout(tmp_path):
+    db = bot.open_sqlite(str(tmp_path / "state.db"))
+
+    assert db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert db.execute("PRAGMA busy_timeout").fetchone()[0] == int(bot.SQLITE_BUSY_TIMEOUT * 1000)
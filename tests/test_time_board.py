@@ -0,0 +1,40 @@
+from datetime import datetime, timezone
+
+import bot
+
+
+def test_groups_sorted_by_offset_with_invalid_last():
+    now = datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc)
+    entries = {
+        "1": "Not/AZone",
+        "2": "Asia/Tokyo",
+        "3": "America/New_York",
+        "4": "Europe/London",
+        "5": "UTC",
+        "6": "America/Detroit",
+    }
+
+    groups = bot.group_timezones(entries, now)
+
+    assert [group["label"] for group in groups] == [
+        "7:00 AM Mon", "12:00 PM Mon", "9:00 PM Mon", "Invalid TZ"
+    ]
+    assert sorted(groups[0]["user_ids"]) == ["3", "6"]
+    assert sorted(groups[1]["user_ids"]) == ["4", "5"]
+    assert groups[-1]["user_ids"] == ["1"]
+
+
+def test_pages_split_on_group_count(monkeypatch):
+    monkeypatch.setattr(bot, "TIMEZONE_GROUPS_PER_PAGE", 2)
+    lines = ["a", "b", "c", "d", "e"]
+
+    assert bot.paginate_timezone_lines(lines) == [["a", "b"], ["c", "d"], ["e"]]
+
+
+def test_pages_split_on_characters(monkeypatch):
+    monkeypatch.setattr(bot, "TIMEZONE_PAGE_CHARS", 10)
+    # Each line costs its length plus a newline
+    lines = ["x" * 4, "y" * 4, "z" * 9]
+
+    assert bot.paginate_timezone_lines(lines) == [["xxxx", "yyyy"], ["zzzzzzzzz"]]
+    assert bot.paginate_timezone_lines([]) == []
@@ -0,0 +1,75 @@
+import asyncio
+
+import bot
+
+
+def test_merge_keeps_our_edits_and_their_other_changes():
+    base = {"10": "UTC", "11": "UTC", "12": "UTC"}
+    ours = {"10": "Asia/Tokyo", "12": "UTC", "13": "Europe/London"}
+    theirs = {"10": "UTC", "11": "UTC", "12": "America/Chicago", "14": "UTC"}
+
+    assert bot.merge_timezones(base, ours, theirs) == {
+        "10": "Asia/Tokyo",
+        "12": "America/Chicago",
+        "13": "Europe/London",
+        "14": "UTC",
+    }
+
+
+def test_merge_with_no_local_edits_takes_theirs():
+    base = {"10": "UTC"}
+    theirs = {"11": "UTC"}
+
+    assert bot.merge_timezones(base, dict(base), theirs) == theirs
+
+
+def journal_state(tmp_path, monkeypatch):
+    monkeypatch.setattr(bot, "TIMEZONE_JOURNAL", str(tmp_path / "journal.jsonl"))
+    for name in ("timezones", "guild_versions"):
+        monkeypatch.setattr(bot, name, {})
+    monkeypatch.setattr(bot, "dirty_guilds", set())
+
+
+def test_replay_restores_sets_and_removals(tmp_path, monkeypatch):
+    journal_state(tmp_path, monkeypatch)
+    bot.append_timezone_journal([
+        {"guild": "1", "user": "10", "tz": "UTC"},
+        {"guild": "1", "user": "11", "tz": "Asia/Tokyo"},
+        {"guild": "1", "user": "10", "tz": None},
+    ])
+    # A crash mid-append leaves a torn final line
+    with open(bot.TIMEZONE_JOURNAL, "a", encoding="utf-8") as f:
+        f.write('{"guild": "1", "us')
+
+    bot.timezones["1"] = {"10": "Europe/London"}
+    replayed = bot.replay_timezone_journal()
+
+    assert len(replayed) == 3
+    assert bot.timezones == {"1": {"11": "Asia/Tokyo"}}
+    assert bot.dirty_guilds == {"1"}
+
+
+def test_compaction_drops_synced_guilds_and_keeps_removals(tmp_path, monkeypatch):
+    journal_state(tmp_path, monkeypatch)
+    bot.append_timezone_journal([
+        {"guild": "1", "user": "10", "tz": "UTC"},
+        {"guild": "2", "user": "20", "tz": "UTC"},
+        {"guild": "1", "user": "10", "tz": "Asia/Tokyo"},
+        {"guild": "1", "user": "11", "tz": None},
+    ])
+    bot.dirty_guilds.add("1")
+
+    asyncio.run(bot.compact_timezone_journal())
+
+    assert bot.read_timezone_journal() == [
+        {"guild": "1", "user": "10", "tz": "Asia/Tokyo"},
+        {"guild": "1", "user": "11", "tz": None},
+    ]
+
+    # After a restart the removal still overrides the stale entry
+    bot.dirty_guilds.clear()
+    bot.timezones.update({"1": {"10": "UTC", "11": "UTC"}})
+    bot.replay_timezone_journal()
+
+    assert bot.timezones == {"1": {"10": "Asia/Tokyo"}}
+    assert bot.dirty_guilds == {"1"}
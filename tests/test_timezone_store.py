@@ -0,0 +1,58 @@
+import asyncio
+
+import bot
+
+
+def test_sqlite_store_picks_up_other_workers_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(bot, "TIMEZONE_RESYNC_INTERVAL", 0.01)
+    monkeypatch.setattr(bot, "timezones", {})
+    monkeypatch.setattr(bot, "user_guilds", {})
+    path = str(tmp_path / "timezones.db")
+
+    async def scenario():
+        ours = bot.SQLiteTimezoneStore(path)
+        theirs = bot.SQLiteTimezoneStore(path)
+        await theirs.save([("1", "10", "Europe/London")])
+
+        bot.timezones.update(await ours.load())
+        ours.start()
+
+        await theirs.save([("1", "11", "Asia/Tokyo"), ("1", "10", None)])
+        await asyncio.sleep(0.1)
+
+        assert bot.timezones == {"1": {"11": "Asia/Tokyo"}}
+        assert bot.user_guilds["11"] == {"1"}
+
+        await ours.close()
+        await theirs.close()
+
+    asyncio.run(scenario())
+
+
+def test_github_load_keeps_local_edits(tmp_path, monkeypatch):
+    monkeypatch.setattr(bot, "TIMEZONE_JOURNAL", str(tmp_path / "journal.jsonl"))
+    for name in ("timezones", "user_guilds", "guild_versions"):
+        monkeypatch.setattr(bot, name, {})
+    monkeypatch.setattr(bot, "dirty_guilds", set())
+
+    async def load_timezones_from_github():
+        # Someone saved a timezone while we were fetching
+        await store.save([("1", "12", "Asia/Tokyo")])
+        return {"1": {"10": "UTC", "11": "UTC", "13": "UTC"}}
+
+    monkeypatch.setattr(bot, "load_timezones_from_github", load_timezones_from_github)
+    bot.append_timezone_journal([
+        {"guild": "1", "user": "10", "tz": "Europe/London"},
+        {"guild": "1", "user": "11", "tz": None},
+    ])
+    store = bot.GitHubTimezoneStore()
+
+    async def scenario():
+        bot.put_timezone("1", "12", "Asia/Tokyo")
+        await store.load_all()
+
+    asyncio.run(scenario())
+
+    assert bot.timezones == {"1": {"10": "Europe/London", "12": "Asia/Tokyo", "13": "UTC"}}
+    assert bot.user_guilds["13"] == {"1"}
+    assert bot.dirty_guilds == {"1"}
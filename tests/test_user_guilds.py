@@ -0,0 +1,54 @@
+import asyncio
+
+import bot
+
+
+def test_index_tracks_partition_membership(monkeypatch):
+    monkeypatch.setattr(bot, "timezones", {"1": {"10": "UTC", "11": "UTC"}, "2": {"10": "UTC"}})
+    monkeypatch.setattr(bot, "user_guilds", {})
+
+    bot.index_timezones()
+    assert bot.user_guilds == {"10": {"1", "2"}, "11": {"1"}}
+
+    bot.reindex_guild("1", bot.timezones["1"], {"11": "UTC", "12": "UTC"})
+    assert bot.user_guilds == {"10": {"2"}, "11": {"1"}, "12": {"1"}}
+
+
+def test_timezone_change_spreads_to_users_other_guilds(tmp_path, monkeypatch):
+    monkeypatch.setattr(bot, "timezones", {"1": {"10": "UTC"}, "2": {"10": "Asia/Tokyo"}, "3": {"11": "UTC"}})
+    monkeypatch.setattr(bot, "user_guilds", {})
+    bot.index_timezones()
+
+    async def scenario():
+        store = bot.SQLiteTimezoneStore(str(tmp_path / "timezones.db"))
+        monkeypatch.setattr(bot, "timezone_store", store)
+
+        changed = await bot.set_user_timezone(1, 10, "Asia/Tokyo")
+        saved = await store.load()
+        await store.close()
+        return changed, saved
+
+    changed, saved = asyncio.run(scenario())
+
+    # Guild 2 already had the zone, guild 3 doesn't have the user
+    assert changed == {"1"}
+    assert bot.timezones == {"1": {"10": "Asia/Tokyo"}, "2": {"10": "Asia/Tokyo"}, "3": {"11": "UTC"}}
+    assert saved == {"1": {"10": "Asia/Tokyo"}}
+
+
+def test_new_guild_joins_the_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(bot, "timezones", {"1": {"10": "UTC"}})
+    monkeypatch.setattr(bot, "user_guilds", {})
+    bot.index_timezones()
+
+    async def scenario():
+        store = bot.SQLiteTimezoneStore(str(tmp_path / "timezones.db"))
+        monkeypatch.setattr(bot, "timezone_store", store)
+
+        changed = await bot.set_user_timezone(2, 10, "Europe/London")
+        await store.close()
+        return changed
+
+    assert asyncio.run(scenario()) == {"1", "2"}
+    assert bot.user_guilds["10"] == {"1", "2"}
+    assert bot.timezones == {"1": {"10": "Europe/London"}, "2": {"10": "Europe/London"}}
@@ -0,0 +1,34 @@
+import asyncio
+import threading
+import time
+
+import bot
+
+
+def counted_stalls():
+    return sum(child.value for child in bot.loop_stalls.children.values())
+
+
+def test_stall_is_counted_on_the_loop(monkeypatch):
+    watchdog = bot.LoopWatchdog(interval=0.01, threshold=0.1)
+    updated_from = []
+    increment = bot.CounterChild.inc
+
+    def inc(self, *args):
+        updated_from.append(threading.get_ident())
+        return increment(self, *args)
+
+    async def scenario():
+        watchdog.start()
+        await asyncio.sleep(0.05)
+        before = counted_stalls()
+        time.sleep(0.4)  # block the loop
+        await asyncio.sleep(0.05)
+        watchdog.stop()
+        return before
+
+    monkeypatch.setattr(bot.CounterChild, "inc", inc)
+    before = asyncio.run(scenario())
+
+    assert counted_stalls() == before + 1
+    assert set(updated_from) == {threading.get_ident()}
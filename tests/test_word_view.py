@@ -0,0 +1,81 @@
+import asyncio
+
+import bot
+
+
+def test_definitions_render_before_slow_lookups(monkeypatch):
+    monkeypatch.setattr(bot, "local_dictionary", None)
+
+    async def scenario():
+        related_ready, ety_ready = asyncio.Event(), asyncio.Event()
+        edits = []
+
+        class View(bot.WordView):
+
+            async def fetch_random_word(self):
+                return "lantern"
+
+            async def dictionary(self, word):
+                return "/ˈlæntərn/", ["A case for a light."], []
+
+            async def related_words(self, word):
+                await related_ready.wait()
+                return ["lamp", "torch"]
+
+            async def etymology(self, word):
+                await ety_ready.wait()
+                return "From Latin lanterna."
+
+        async def edit(**kwargs):
+            edits.append(kwargs["embed"].footer.text)
+
+        view = View()
+        await asyncio.wait_for(view.generate_fresh(), timeout=1)
+
+        assert view.page_types == ["Definitions"]
+        assert view.pages[0].footer.text == "Page 1/1+ | Next: Loading…"
+
+        view.finish_in_background(edit)
+        related_ready.set()
+        await asyncio.sleep(0)
+        ety_ready.set()
+        await view.finish_task
+
+        assert view.page_types == ["Definitions", "Related Words", "Etymology"]
+        assert edits == ["Page 1/3 | Next: Related Words"]
+
+    asyncio.run(scenario())
+
+
+def test_lookups_run_concurrently(monkeypatch):
+    monkeypatch.setattr(bot, "local_dictionary", None)
+    started = []
+
+    async def scenario():
+        class View(bot.WordView):
+
+            async def fetch_random_word(self):
+                return "lantern"
+
+            async def dictionary(self, word):
+                started.append("dictionary")
+                await asyncio.sleep(0.01)
+                # The other lookups are already in flight
+                assert sorted(started) == ["dictionary", "etymology", "related"]
+                return "N/A", ["A case for a light."], []
+
+            async def related_words(self, word):
+                started.append("related")
+                return []
+
+            async def etymology(self, word):
+                started.append("etymology")
+                return None
+
+        view = View()
+        await view.generate_fresh()
+        await view.finish()
+        assert view.page_types == ["Definitions"]
+        assert not view.pending
+
+    asyncio.run(scenario())
@@ -0,0 +1,80 @@
+"""
+Print the span waterfall for one trace from the bot's JSON-lines log.
+
+Usage:
+    python trace_view.py TRACE_ID [LOG_FILE ...]
+
+Reads stdin when no log files are given, so it also works on piped output:
+
+    python bot.py | tee bot.log
+    python trace_view.py 3f9c0a1b2d4e5f60 bot.log
+"""
+
+import json
+import sys
+
+BAR_WIDTH = 40
+
+
+def read_entries(paths, trace_id):
+    files = [open(path, "r", encoding="utf-8") for path in paths] or [sys.stdin]
+    for f in files:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict) and entry.get("trace_id") == trace_id:
+                yield entry
+
+
+def depth_of(span, spans_by_id):
+    depth = 0
+    parent = span.get("parent_id")
+    while parent in spans_by_id and depth < 50:
+        depth += 1
+        parent = spans_by_id[parent].get("parent_id")
+    return depth
+
+
+def main():
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+
+    trace_id = sys.argv[1]
+    entries = list(read_entries(sys.argv[2:], trace_id))
+    if not entries:
+        sys.exit(f"No entries found for trace {trace_id}")
+
+    header = next((e for e in entries if e.get("type") == "trace"), None)
+    spans = sorted((e for e in entries if e.get("type") == "span"), key=lambda e: e["start"])
+    logs = [e for e in entries if e.get("type") not in ("trace", "span")]
+
+    start = min(e.get("start", e["ts"]) for e in entries)
+    end = max(s["start"] + s["duration_ms"] / 1000 for s in spans) if spans else start
+    total_ms = max((end - start) * 1000, 0.001)
+
+    if header:
+        details = {k: v for k, v in header.items() if k not in ("ts", "level", "logger", "msg", "type", "trace_id", "name")}
+        print(f"trace {trace_id}  {header.get('name')}  {json.dumps(details)}")
+    print(f"total {total_ms:.1f} ms, {len(spans)} spans\n")
+
+    spans_by_id = {s["span_id"]: s for s in spans}
+    skip = {"ts", "level", "logger", "msg", "type", "trace_id", "name", "span_id", "parent_id", "start", "duration_ms"}
+
+    for s in spans:
+        offset = (s["start"] - start) * 1000
+        left = int(offset / total_ms * BAR_WIDTH)
+        width = max(1, int(s["duration_ms"] / total_ms * BAR_WIDTH))
+        bar = " " * left + "#" * min(width, BAR_WIDTH - left)
+        label = "  " * depth_of(s, spans_by_id) + s["name"]
+        extra = " ".join(f"{k}={v}" for k, v in s.items() if k not in skip)
+        print(f"{offset:9.1f} {s['duration_ms']:9.1f} ms |{bar:<{BAR_WIDTH}}| {label} {extra}")
+
+    for entry in logs:
+        offset = (entry["ts"] - start) * 1000
+        print(f"{offset:9.1f}  {entry['level']:<7} {entry['msg']}")
+
+
+if __name__ == "__main__":
+    main()